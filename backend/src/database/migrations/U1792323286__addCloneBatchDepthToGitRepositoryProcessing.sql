@@ -0,0 +1 @@
+ALTER TABLE git."repositoryProcessing" DROP COLUMN IF EXISTS "cloneBatchDepth";
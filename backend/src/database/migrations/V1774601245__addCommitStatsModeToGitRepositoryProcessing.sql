@@ -0,0 +1,4 @@
+ALTER TABLE git."repositoryProcessing"
+ADD COLUMN "commitStatsMode" VARCHAR(50) NOT NULL DEFAULT 'numstat';
+
+COMMENT ON COLUMN git."repositoryProcessing"."commitStatsMode" IS 'How commit insertions/deletions are computed: numstat, no-renames, shortstat, first-parent, deferred or none';
@@ -0,0 +1,4 @@
+ALTER TABLE git."repositoryProcessing"
+ADD COLUMN "processingCheckpoint" JSONB;
+
+COMMENT ON COLUMN git."repositoryProcessing"."processingCheckpoint" IS 'Progress of an interrupted full clone commit processing: commit whose history is processed, number of commits already sent and excluded parent commit';
@@ -0,0 +1,4 @@
+ALTER TABLE git."repositoryProcessing"
+ADD COLUMN "cloneBatchDepth" INTEGER;
+
+COMMENT ON COLUMN git."repositoryProcessing"."cloneBatchDepth" IS 'Number of commits fetched per batch the last incremental clone of the repository settled on';
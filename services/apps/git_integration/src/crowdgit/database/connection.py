@@ -13,6 +13,7 @@ from crowdgit.settings import (
     CROWD_DB_PORT,
     CROWD_DB_USERNAME,
     CROWD_DB_WRITE_HOST,
+    DB_BINARY_JSON_CODEC,
 )
 
 # Global connection pool
@@ -31,9 +32,42 @@ def get_db_config() -> dict[str, Any]:
         "max_size": 20,
         "command_timeout": 120,
         "server_settings": {"application_name": "git_integration"},
+        "init": _init_connection if DB_BINARY_JSON_CODEC else None,
     }
 
 
+def _encode_json(value: str | bytes) -> bytes:
+    return value.encode("utf-8") if isinstance(value, str) else value
+
+
+def _encode_jsonb(value: str | bytes) -> bytes:
+    # jsonb binary format: version byte followed by the JSON text
+    return b"\x01" + _encode_json(value)
+
+
+async def _init_connection(connection: Connection) -> None:
+    """
+    Exchange json/jsonb values in binary format.
+
+    Values can be passed as already serialized bytes (e.g. orjson output), which are sent as they
+    are instead of being decoded into a str first. Values are still read back as str.
+    """
+    await connection.set_type_codec(
+        "json",
+        schema="pg_catalog",
+        encoder=_encode_json,
+        decoder=lambda data: data.decode("utf-8"),
+        format="binary",
+    )
+    await connection.set_type_codec(
+        "jsonb",
+        schema="pg_catalog",
+        encoder=_encode_jsonb,
+        decoder=lambda data: data[1:].decode("utf-8"),
+        format="binary",
+    )
+
+
 @retry(
     stop=stop_after_attempt(5),
     wait=wait_fixed(1),
@@ -3,18 +3,36 @@ from datetime import datetime, timezone
 from loguru import logger
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
 
-from crowdgit.enums import RepositoryPriority, RepositoryState
+from crowdgit.enums import (
+    ExecutionStatus,
+    IntegrationResultState,
+    OperationType,
+    RepositoryPriority,
+    RepositoryState,
+)
 from crowdgit.errors import RepoLockingError
+from crowdgit.models.activity_record import ActivityRecord
+from crowdgit.models.processing_checkpoint import ProcessingCheckpoint
 from crowdgit.models.repository import Repository
 from crowdgit.models.service_execution import ServiceExecution
 from crowdgit.settings import (
+    ACTIVITIES_COPY_BATCH_BYTES,
+    ACTIVITIES_COPY_INSERT,
     MAX_CONCURRENT_ONBOARDINGS,
     MAX_INTEGRATION_RESULTS,
     REPOSITORY_UPDATE_INTERVAL_HOURS,
 )
 
 from .connection import get_db_connection
-from .registry import execute, executemany, fetchrow, fetchval, query
+from .registry import (
+    copy_new_records_in_transaction,
+    copy_records_in_transaction,
+    execute,
+    executemany,
+    fetchrow,
+    fetchval,
+    query,
+)
 
 # Common SELECT columns joining public.repositories + git.repositoryProcessing with aliases for backwards compatibility
 REPO_SELECT_COLUMNS = """
@@ -32,7 +50,10 @@ REPO_SELECT_COLUMNS = """
     rp."maintainerFile",
     rp."lastMaintainerRunAt",
     rp."stuckRequiresReOnboard",
-    rp."reOnboardingCount"
+    rp."reOnboardingCount",
+    rp."commitStatsMode",
+    rp."cloneBatchDepth",
+    rp."processingCheckpoint"
 """
 
 
@@ -122,8 +143,13 @@ async def acquire_repository(query: str, params: tuple = None) -> Repository | N
             raise RepoLockingError() from e
 
 
-async def acquire_recurrent_repo() -> Repository | None:
-    """Acquire a regular (non-onboarding) repository, that were not processed in the last x hours (REPOSITORY_UPDATE_INTERVAL_HOURS)"""
+async def acquire_recurrent_repo(mirrored_repo_ids: list[str] | None = None) -> Repository | None:
+    """
+    Acquire a regular (non-onboarding) repository, that were not processed in the last x hours (REPOSITORY_UPDATE_INTERVAL_HOURS)
+
+    Among repositories of the same priority, the ones in mirrored_repo_ids (mirrored on this node)
+    are acquired first, as they are only fetched instead of cloned.
+    """
     recurrent_repo_sql_query = f"""
     WITH selected_repo AS (
         SELECT r.id
@@ -133,7 +159,7 @@ async def acquire_recurrent_repo() -> Repository | None:
             AND rp."lockedAt" IS NULL
             AND r."deletedAt" IS NULL
             AND rp."lastProcessedAt" < NOW() - INTERVAL '1 hour' * $3
-        ORDER BY rp.priority ASC, rp."lastProcessedAt" ASC
+        ORDER BY rp.priority ASC, r.id::text = ANY($4::text[]) DESC, rp."lastProcessedAt" ASC
         LIMIT 1
         FOR UPDATE OF rp SKIP LOCKED
     )
@@ -155,7 +181,12 @@ async def acquire_recurrent_repo() -> Repository | None:
     )
     return await acquire_repository(
         recurrent_repo_sql_query,
-        (RepositoryState.PROCESSING, states_to_exclude, REPOSITORY_UPDATE_INTERVAL_HOURS),
+        (
+            RepositoryState.PROCESSING,
+            states_to_exclude,
+            REPOSITORY_UPDATE_INTERVAL_HOURS,
+            mirrored_repo_ids or [],
+        ),
     )
 
 
@@ -193,6 +224,7 @@ async def acquire_pending_reonboard_repo() -> Repository | None:
         state = $2,
         "lastProcessedCommit" = NULL,
         branch = NULL,
+        "processingCheckpoint" = NULL,
         "reOnboardingCount" = rp."reOnboardingCount" + 1,
         "updatedAt" = NOW()
     FROM public.repositories r
@@ -207,7 +239,9 @@ async def acquire_pending_reonboard_repo() -> Repository | None:
     )
 
 
-async def acquire_repo_for_processing() -> Repository | None:
+async def acquire_repo_for_processing(
+    mirrored_repo_ids: list[str] | None = None,
+) -> Repository | None:
     """
     Acquire the next repository to process based on priority and system load.
 
@@ -219,6 +253,8 @@ async def acquire_repo_for_processing() -> Repository | None:
     3. Pending reonboard repos (PENDING_REONBOARD state) - weekend-only, lowest priority.
        These are repos needing re-onboarding that were deferred until the weekend.
 
+    Recurrent repos mirrored on this node (mirrored_repo_ids) are preferred.
+
     Onboarding is delayed when integration.results exceeds MAX_INTEGRATION_RESULTS
     to prevent overloading the system during high activity periods.
     """
@@ -234,7 +270,7 @@ async def acquire_repo_for_processing() -> Repository | None:
             repo_to_process = await acquire_pending_reonboard_repo()
 
     if not repo_to_process:
-        repo_to_process = await acquire_recurrent_repo()
+        repo_to_process = await acquire_recurrent_repo(mirrored_repo_ids)
 
     return repo_to_process
 
@@ -255,12 +291,14 @@ async def release_repo(repo_id: str):
 
 async def update_last_processed_commit(repo_id: str, commit_hash: str, branch: str | None = None):
     """
-    Update last processed commit and optionally the branch after processing
+    Update last processed commit and optionally the branch after processing.
+    The processing checkpoint is cleared, as the whole history was processed.
     """
     sql_query = """
     UPDATE git."repositoryProcessing"
         SET "lastProcessedCommit" = $1,
         "branch" = $2,
+        "processingCheckpoint" = NULL,
         "updatedAt" = NOW()
     WHERE "repositoryId" = $3
     """
@@ -268,6 +306,34 @@ async def update_last_processed_commit(repo_id: str, commit_hash: str, branch: s
     return str(result)
 
 
+async def save_processing_checkpoint(repo_id: str, checkpoint: ProcessingCheckpoint):
+    """
+    Save the progress of a full clone processing, resumed if the processing is interrupted
+    """
+    sql_query = """
+    UPDATE git."repositoryProcessing"
+        SET "processingCheckpoint" = $1::jsonb,
+        "updatedAt" = NOW()
+    WHERE "repositoryId" = $2
+    """
+    result = await execute(sql_query, (checkpoint.to_db_json(), repo_id))
+    return str(result)
+
+
+async def save_clone_batch_depth(repo_id: str, depth: int):
+    """
+    Save the number of commits fetched per batch the repository clone settled on
+    """
+    sql_query = """
+    UPDATE git."repositoryProcessing"
+        SET "cloneBatchDepth" = $1,
+        "updatedAt" = NOW()
+    WHERE "repositoryId" = $2
+    """
+    result = await execute(sql_query, (depth, repo_id))
+    return str(result)
+
+
 async def mark_repo_as_processed(repo_id: str, repo_state: RepositoryState):
     sql_query = """
     UPDATE git."repositoryProcessing"
@@ -281,16 +347,127 @@ async def mark_repo_as_processed(repo_id: str, repo_state: RepositoryState):
     return str(result)
 
 
-async def batch_insert_activities(records: list[tuple], batch_size=100):
-    sql_query = """
-    INSERT INTO integration.results(id, state, data, "tenantId", "integrationId")
-    values($1, $2, $3, $4, $5)
+def split_activities_by_size(
+    records: list[ActivityRecord], max_batch_bytes: int
+) -> list[list[tuple]]:
+    """
+    Split activities into batches of integration.results rows of at most max_batch_bytes data.
+
+    A single activity larger than max_batch_bytes gets a batch of its own.
+
+    >>> from types import SimpleNamespace
+    >>> records = [SimpleNamespace(data="x" * size, db_row=size) for size in (4, 4, 4, 9, 1)]
+    >>> split_activities_by_size(records, 8)
+    [[4, 4], [4], [9], [1]]
+    """
+    batches = []
+    batch = []
+    batch_bytes = 0
+    for record in records:
+        record_bytes = len(record.data)
+        if batch and batch_bytes + record_bytes > max_batch_bytes:
+            batches.append(batch)
+            batch = []
+            batch_bytes = 0
+        batch.append(record.db_row)
+        batch_bytes += record_bytes
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+async def batch_insert_activities(
+    records: list[ActivityRecord], batch_size=100, skip_existing: bool = False
+) -> list[ActivityRecord]:
+    """
+    Save activities into integration.results, returns the ones to send to Kafka.
+
+    With skip_existing, activities whose result id is already in integration.results are
+    skipped instead of failing the insert (see DETERMINISTIC_RESULT_IDS), and only returned
+    while their result is still pending.
     """
     logger.info(f"Saving {len(records)} activity into integration.results")
-    for i in range(0, len(records), batch_size):
-        batch = records[i : i + batch_size]
-        await executemany(sql_query, batch)
+    if skip_existing:
+        return await _insert_new_activities(records, batch_size)
+    if ACTIVITIES_COPY_INSERT:
+        # Binary COPY of the whole chunk in one transaction: one round trip per batch, one commit
+        await copy_records_in_transaction(
+            "results",
+            "integration",
+            ["id", "state", "data", "tenantId", "integrationId"],
+            split_activities_by_size(records, ACTIVITIES_COPY_BATCH_BYTES),
+        )
+    else:
+        sql_query = """
+        INSERT INTO integration.results(id, state, data, "tenantId", "integrationId")
+        values($1, $2, $3, $4, $5)
+        """
+        for i in range(0, len(records), batch_size):
+            batch = [record.db_row for record in records[i : i + batch_size]]
+            await executemany(sql_query, batch)
     logger.info("activities saved into integration.results")
+    return records
+
+
+async def _insert_new_activities(
+    records: list[ActivityRecord], batch_size: int
+) -> list[ActivityRecord]:
+    """
+    Save the activities not in integration.results yet, returns the ones to send to the data
+    sink worker: the saved ones, and the already saved ones whose result is still pending.
+
+    A result is saved before its message is sent, so a run stopped in between (e.g. a crash or
+    a redeploy) leaves pending results that would never be processed if not sent again.
+    """
+    columns = ["id", "state", "data", "tenantId", "integrationId"]
+    if ACTIVITIES_COPY_INSERT:
+        inserted_ids = await copy_new_records_in_transaction(
+            "results",
+            "integration",
+            columns,
+            ["uuid", "varchar(255)", "json", "uuid", "uuid"],
+            split_activities_by_size(records, ACTIVITIES_COPY_BATCH_BYTES),
+        )
+    else:
+        sql_query = """
+        INSERT INTO integration.results(id, state, data, "tenantId", "integrationId")
+        SELECT * FROM unnest($1::uuid[], $2::varchar[], $3::json[], $4::uuid[], $5::uuid[])
+        ON CONFLICT DO NOTHING
+        RETURNING id
+        """
+        inserted_ids = []
+        for i in range(0, len(records), batch_size):
+            # Rows are passed as one array per column
+            batch = [record.db_row for record in records[i : i + batch_size]]
+            column_arrays = tuple(list(column) for column in zip(*batch, strict=True))
+            rows = await query(sql_query, column_arrays)
+            inserted_ids.extend(row["id"] for row in rows)
+
+    inserted_ids = {str(inserted_id) for inserted_id in inserted_ids}
+    existing_ids = {record.result_id for record in records} - inserted_ids
+    pending_ids = await _get_pending_result_ids(existing_ids) if existing_ids else set()
+    unsent_ids = inserted_ids | pending_ids
+    unsent_records = []
+    for record in records:
+        # Activities repeated in the chunk share their result id, only one of them is saved
+        if record.result_id in unsent_ids:
+            unsent_ids.remove(record.result_id)
+            unsent_records.append(record)
+    logger.info(
+        f"{len(inserted_ids)} activities saved into integration.results, "
+        f"{len(existing_ids)} already saved ({len(pending_ids)} of them still pending)"
+    )
+    return unsent_records
+
+
+async def _get_pending_result_ids(result_ids: set[str]) -> set[str]:
+    """Ids of the given integration.results rows still pending"""
+    sql_query = """
+    SELECT id FROM integration.results
+    WHERE id = ANY($1::uuid[]) AND state = $2
+    """
+    rows = await query(sql_query, (list(result_ids), IntegrationResultState.PENDING))
+    return {str(row["id"]) for row in rows}
 
 
 async def find_github_identity(github_username: str):
@@ -418,37 +595,52 @@ async def batch_check_parent_activities(
     if not activity_keys:
         return set()
 
-    # Use dedup index with ALL fields for optimal performance
-    # Index: (timestamp, platform, type, sourceId, channel, segmentId)
-    # Build OR conditions for each (timestamp, type, sourceId) combination
-    conditions = []
-    params = ["git", parent_channel, parent_segment_id]
-    param_idx = 4
-
+    # Keys are passed as three parallel arrays and joined as a set against the dedup index
+    # (timestamp, platform, type, sourceId, channel, segmentId), so the query text and its
+    # parameter count stay the same whatever the number of keys, and its plan can be reused
+    timestamps = []
+    activity_types = []
+    source_ids = []
     for timestamp_str, activity_type, source_id in activity_keys:
-        conditions.append(
-            f'("timestamp" = ${param_idx} AND "type" = ${param_idx + 1} AND "sourceId" = ${param_idx + 2})'
-        )
-        timestamp = datetime.fromisoformat(timestamp_str)
-        params.append(timestamp)
-        params.append(activity_type)
-        params.append(source_id)
-        param_idx += 3
+        timestamps.append(datetime.fromisoformat(timestamp_str))
+        activity_types.append(activity_type)
+        source_ids.append(source_id)
 
-    sql_query = f"""
-    SELECT DISTINCT "sourceId"
-    FROM "activityRelations"
-    WHERE "platform" = $1
-        AND "channel" = $2
-        AND "segmentId" = $3
-        AND ({" OR ".join(conditions)})
+    sql_query = """
+    SELECT DISTINCT ar."sourceId"
+    FROM unnest($4::timestamptz[], $5::varchar[], $6::varchar[])
+        AS keys("timestamp", "type", "sourceId")
+    JOIN "activityRelations" ar
+        ON ar."timestamp" = keys."timestamp"
+        AND ar."type" = keys."type"
+        AND ar."sourceId" = keys."sourceId"
+    WHERE ar."platform" = $1
+        AND ar."channel" = $2
+        AND ar."segmentId" = $3
     """
 
-    result = await query(sql_query, tuple(params))
+    result = await query(
+        sql_query,
+        ("git", parent_channel, parent_segment_id, timestamps, activity_types, source_ids),
+    )
 
     return {row["sourceId"] for row in result}
 
 
+async def get_last_successful_execution_at(
+    repo_id: str, operation_type: OperationType
+) -> datetime | None:
+    """Time of the last successful execution of a service on the repository, None if never"""
+    sql_query = """
+    SELECT MAX("createdAt")
+        FROM git."serviceExecutions"
+    WHERE "repoId" = $1
+        AND "operationType" = $2
+        AND "status" = $3
+    """
+    return await fetchval(sql_query, (repo_id, operation_type.value, ExecutionStatus.SUCCESS))
+
+
 async def save_service_execution(service_execution: ServiceExecution) -> None:
     """
     Save service execution record to database.
@@ -71,3 +71,72 @@ async def fetchrow(sql: str, params: tuple = None) -> dict[str, Any] | None:
             "Database fetchrow failed - SQL: {}, Params: {}, Error: {}", sql, params, error
         )
         raise InternalError("Database fetchrow failed") from error
+
+
+async def copy_records_in_transaction(
+    table_name: str, schema_name: str, columns: list[str], batches: list[list[tuple]]
+) -> None:
+    """Load batches of records with binary COPY, all of them in a single transaction"""
+    try:
+        async with get_db_connection() as conn:
+            async with conn.transaction():
+                for records in batches:
+                    await conn.copy_records_to_table(
+                        table_name, schema_name=schema_name, columns=columns, records=records
+                    )
+    except Exception as error:
+        logger.error(
+            "Database copy operation failed - Table: {}.{}, Batches: {}, Error: {}",
+            schema_name,
+            table_name,
+            len(batches),
+            error,
+        )
+        raise InternalError("Database copy operation failed") from error
+
+
+async def copy_new_records_in_transaction(
+    table_name: str,
+    schema_name: str,
+    columns: list[str],
+    column_types: list[str],
+    batches: list[list[tuple]],
+) -> list[Any]:
+    """
+    Load batches of records with binary COPY in a single transaction, skipping the records that
+    conflict with existing rows. Returns the first column of the inserted records.
+
+    COPY can't skip conflicts, so records are copied into a temporary table dropped on commit,
+    and inserted from there with ON CONFLICT DO NOTHING.
+    """
+    staging_table = f"{table_name}_staging"
+    column_names = ", ".join(f'"{column}"' for column in columns)
+    column_definitions = ", ".join(
+        f'"{column}" {column_type}'
+        for column, column_type in zip(columns, column_types, strict=True)
+    )
+    try:
+        async with get_db_connection() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    f"CREATE TEMPORARY TABLE {staging_table} ({column_definitions}) ON COMMIT DROP"
+                )
+                for records in batches:
+                    await conn.copy_records_to_table(
+                        staging_table, columns=columns, records=records
+                    )
+                rows = await conn.fetch(
+                    f"INSERT INTO {schema_name}.{table_name} ({column_names}) "
+                    f"SELECT {column_names} FROM {staging_table} "
+                    f'ON CONFLICT DO NOTHING RETURNING "{columns[0]}"'
+                )
+                return [row[0] for row in rows]
+    except Exception as error:
+        logger.error(
+            "Database copy operation failed - Table: {}.{}, Batches: {}, Error: {}",
+            schema_name,
+            table_name,
+            len(batches),
+            error,
+        )
+        raise InternalError("Database copy operation failed") from error
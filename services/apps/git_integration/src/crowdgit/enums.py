@@ -36,6 +36,32 @@ class RepositoryState(str, Enum):
     PENDING_REONBOARD = "pending_reonboard"  # re-onboarding deferred until weekend
 
 
+class CommitStatsMode(str, Enum):
+    """How commit insertions/deletions are computed while processing commits"""
+
+    NUMSTAT = "numstat"  # per-file line counts, default
+    NO_RENAMES = "no-renames"  # per-file line counts without rename detection
+    SHORTSTAT = "shortstat"  # commit totals only, much smaller git log output
+    FIRST_PARENT = "first-parent"  # per-file line counts, merges diffed against first parent
+    DEFERRED = "deferred"  # git log without diffs, totals computed per chunk in a second pass
+    NONE = "none"  # no diffs at all, insertions/deletions are always 0
+
+
+class BloblessCloneMode(str, Enum):
+    """Which repositories are cloned without blobs (--filter=blob:none)"""
+
+    OFF = "off"  # every blob is cloned, default
+    NO_STATS = "no-stats"  # repositories whose commit stats mode reads no blobs
+    ALWAYS = "always"  # every repository, blobs needed by diff stats are fetched lazily
+
+
+class TrailerExtractionMode(str, Enum):
+    """Which commit message lines are matched against ActivityMap trailers"""
+
+    MESSAGE = "message"  # every line of the message, default
+    TRAILERS = "trailers"  # only the trailer block parsed by git (%(trailers))
+
+
 class RepositoryPriority(int):
     """Repository processing priorities"""
 
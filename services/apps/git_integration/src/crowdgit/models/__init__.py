@@ -1,13 +1,19 @@
 # Models package
 
+from .activity_record import ActivityRecord
 from .clone_batch import CloneBatchInfo
+from .processing_checkpoint import ProcessingCheckpoint
+from .remote_probe import RemoteProbe
 from .repository import Repository, RepositoryCreate, RepositoryResponse
 from .service_execution import ServiceExecution
 
 __all__ = [
+    "ActivityRecord",
     "Repository",
     "RepositoryCreate",
     "RepositoryResponse",
     "CloneBatchInfo",
+    "ProcessingCheckpoint",
+    "RemoteProbe",
     "ServiceExecution",
 ]
@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+
+from crowdgit.enums import IntegrationResultState
+from crowdgit.settings import DB_BINARY_JSON_CODEC, DEFAULT_TENANT_ID
+
+
+@dataclass(slots=True)
+class ActivityRecord:
+    """
+    Activity prepared for integration.results and the data sink worker queue.
+
+    Activities are serialized once when they are built, this record carries the serialized
+    payloads together with the activity dedup key, so later stages never parse them back.
+    A plain slotted dataclass rather than a pydantic model, as one is created per activity.
+    """
+
+    result_id: str
+    integration_id: str
+    # Serialized integration result ({"type": "activity", "data": activity}), UTF-8 JSON
+    data: bytes
+    kafka_key: bytes
+    kafka_value: bytes
+    # Activity dedup key fields, as in the activityRelations dedup index
+    timestamp: str
+    type: str
+    source_id: str
+
+    @property
+    def db_row(self) -> tuple:
+        """
+        integration.results row: (id, state, data, tenantId, integrationId)
+
+        The serialized data is passed as is to the binary json codec (DB_BINARY_JSON_CODEC),
+        the default text codec only takes str.
+        """
+        return (
+            self.result_id,
+            IntegrationResultState.PENDING,
+            self.data if DB_BINARY_JSON_CODEC else self.data.decode(),
+            DEFAULT_TENANT_ID,
+            self.integration_id,
+        )
+
+    @property
+    def dedup_key(self) -> tuple[str, str, str]:
+        """(timestamp, type, sourceId)"""
+        return self.timestamp, self.type, self.source_id
@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field
 
+from crowdgit.models.processing_checkpoint import ProcessingCheckpoint
+
 
 class CloneBatchInfo(BaseModel):
     """Model for clone batch information during repository cloning operations"""
@@ -22,6 +24,10 @@ class CloneBatchInfo(BaseModel):
     clone_with_batches: bool = Field(
         default=True, description="Whether repo is cloned with batches"
     )
+    checkpoint: ProcessingCheckpoint | None = Field(
+        default=None,
+        description="Checkpoint of an interrupted full clone processing, to resume from",
+    )
 
     class Config:
         """Pydantic configuration"""
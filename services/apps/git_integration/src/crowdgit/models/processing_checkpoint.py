@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from pydantic import BaseModel, Field
+
+
+class ProcessingCheckpoint(BaseModel):
+    """
+    Progress of a full clone commit processing, saved after each chunk sent to Kafka.
+
+    git log always lists the history of head_commit in the same order, so an interrupted
+    processing resumes by skipping the emitted_commits first commits of the same git log.
+    """
+
+    head_commit: str = Field(..., description="Commit whose history is being processed")
+    emitted_commits: int = Field(
+        default=0, description="Number of git log commits whose activities were sent to Kafka"
+    )
+    excluded_commit: str | None = Field(
+        None, description="Parent repo commit whose history is excluded from git log (forks)"
+    )
+
+    def to_db_json(self) -> str:
+        """Serialize to the git.repositoryProcessing processingCheckpoint column"""
+        return orjson.dumps(
+            {
+                "headCommit": self.head_commit,
+                "emittedCommits": self.emitted_commits,
+                "excludedCommit": self.excluded_commit,
+            }
+        ).decode()
+
+    @classmethod
+    def from_db(cls, db_data: str | dict[str, Any]) -> ProcessingCheckpoint:
+        """Create ProcessingCheckpoint instance from the processingCheckpoint column"""
+        if isinstance(db_data, str):
+            db_data = orjson.loads(db_data)
+        return cls(
+            head_commit=db_data["headCommit"],
+            emitted_commits=db_data.get("emittedCommits", 0),
+            excluded_commit=db_data.get("excludedCommit"),
+        )
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+HEADS_PREFIX = "refs/heads/"
+# Branches checked when the remote doesn't advertise where HEAD points
+FALLBACK_DEFAULT_BRANCHES = ["main", "master"]
+
+
+class RemoteProbe(BaseModel):
+    """What a single `git ls-remote --symref` of a remote repository tells about it"""
+
+    default_branch: str | None = Field(None, description="Branch the remote HEAD points to")
+    head_commit: str | None = Field(None, description="Commit at the tip of the default branch")
+
+    @staticmethod
+    def ls_remote_patterns(branch: str | None = None) -> list[str]:
+        """Refs listed by the probe: HEAD, the saved branch and the fallback default branches"""
+        branches = dict.fromkeys([*([branch] if branch else []), *FALLBACK_DEFAULT_BRANCHES])
+        return ["HEAD", *(f"{HEADS_PREFIX}{name}" for name in branches)]
+
+    @classmethod
+    def from_ls_remote(cls, output: str) -> RemoteProbe:
+        """
+        Parse `git ls-remote --symref` output:
+        "ref: refs/heads/main\\tHEAD" then "<commit_hash>\\t<ref>" lines
+        """
+        default_branch = None
+        head_commit = None
+        branch_commits = {}
+        for line in output.strip().splitlines():
+            target, _, ref = line.partition("\t")
+            if target.startswith(f"ref: {HEADS_PREFIX}") and ref == "HEAD":
+                default_branch = target.removeprefix(f"ref: {HEADS_PREFIX}")
+            elif ref == "HEAD":
+                head_commit = target
+            elif ref.startswith(HEADS_PREFIX):
+                branch_commits[ref.removeprefix(HEADS_PREFIX)] = target
+
+        if default_branch is None:
+            # Symbolic ref not advertised, fall back to the common default branches
+            default_branch = next(
+                (branch for branch in FALLBACK_DEFAULT_BRANCHES if branch in branch_commits), None
+            )
+        if default_branch in branch_commits:
+            head_commit = branch_commits[default_branch]
+        return cls(default_branch=default_branch, head_commit=head_commit)
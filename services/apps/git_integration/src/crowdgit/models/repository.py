@@ -6,7 +6,8 @@ from typing import Any
 
 from pydantic import BaseModel, Field
 
-from crowdgit.enums import RepositoryPriority, RepositoryState
+from crowdgit.enums import CommitStatsMode, RepositoryPriority, RepositoryState
+from crowdgit.models.processing_checkpoint import ProcessingCheckpoint
 
 
 class Repository(BaseModel):
@@ -49,6 +50,18 @@ class Repository(BaseModel):
         default=0,
         description="Tracks the number of times this repository has been re-onboarded. Used to identify unreachable commits via activity.attributes.cycle matching pattern onboarding-{reOnboardingCount}",
     )
+    commit_stats_mode: CommitStatsMode = Field(
+        default=CommitStatsMode.NUMSTAT,
+        description="How commit insertions/deletions are computed (git log diff options)",
+    )
+    clone_batch_depth: int | None = Field(
+        None,
+        description="Commits fetched per batch the last incremental clone settled on",
+    )
+    processing_checkpoint: ProcessingCheckpoint | None = Field(
+        None,
+        description="Progress of an interrupted full clone processing, resumed by the next run",
+    )
 
     @classmethod
     def from_db(cls, db_data: dict[str, Any]) -> Repository:
@@ -73,11 +86,17 @@ class Repository(BaseModel):
             "forkedFrom": "forked_from",
             "stuckRequiresReOnboard": "stuck_requires_re_onboard",
             "reOnboardingCount": "re_onboarding_count",
+            "commitStatsMode": "commit_stats_mode",
+            "cloneBatchDepth": "clone_batch_depth",
         }
         for db_field, model_field in field_mapping.items():
             if db_field in repo_data:
                 repo_data[model_field] = repo_data.pop(db_field)
 
+        checkpoint = repo_data.pop("processingCheckpoint", None)
+        if checkpoint:
+            repo_data["processing_checkpoint"] = ProcessingCheckpoint.from_db(checkpoint)
+
         return cls(**repo_data)
 
     class Config:
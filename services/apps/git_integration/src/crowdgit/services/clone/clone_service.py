@@ -3,31 +3,86 @@ import shutil
 import tempfile
 import time
 from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
 from decimal import Decimal
 
 import aiofiles
 from tenacity import retry, stop_after_attempt, wait_fixed
 
-from crowdgit.database.crud import save_service_execution
-from crowdgit.enums import ErrorCode, ExecutionStatus, OperationType
+from crowdgit.database.crud import save_clone_batch_depth, save_service_execution
+from crowdgit.enums import (
+    BloblessCloneMode,
+    CommitStatsMode,
+    ErrorCode,
+    ExecutionStatus,
+    OperationType,
+)
 from crowdgit.errors import CommandExecutionError, CrowdGitError
-from crowdgit.models import CloneBatchInfo, Repository, ServiceExecution
+from crowdgit.models import (
+    CloneBatchInfo,
+    ProcessingCheckpoint,
+    RemoteProbe,
+    Repository,
+    ServiceExecution,
+)
 from crowdgit.services.base.base_service import BaseService
+from crowdgit.services.clone.depth_controller import DepthController
+from crowdgit.services.clone.mirror_cache import MirrorCache, MirrorLock
+from crowdgit.services.clone.pack_maintenance import PackMaintenance
 from crowdgit.services.utils import (
     get_default_branch,
     get_remote_default_branch,
     get_repo_name,
+    probe_remote,
     run_shell_command,
 )
-
-DEFAULT_STORAGE_OPTIMIZATION_THRESHOLD_MB = 10000
+from crowdgit.settings import (
+    CLONE_BATCH_FETCH_BUDGET_MB,
+    CLONE_BATCH_FETCH_TARGET_SEC,
+    CLONE_BATCH_INITIAL_DEPTH,
+    CLONE_BATCH_MAX_DEPTH,
+    CLONE_BATCH_MIN_DEPTH,
+    CLONE_BLOBLESS_MODE,
+    CLONE_MIRROR_CACHE_BUDGET_MB,
+    CLONE_MIRROR_CACHE_DIR,
+    CLONE_PACK_MAINTENANCE_GEOMETRIC_PACKS,
+    CLONE_PACK_MAINTENANCE_LOOSE_OBJECTS,
+    CLONE_PACK_MAINTENANCE_MIDX_PACKS,
+    CLONE_READ_ACCELERATION,
+    CLONE_READ_ACCELERATION_MIN_SIZE_MB,
+    CLONE_SHALLOW_SINCE_FETCH,
+    CLONE_SHALLOW_SINCE_MARGIN_HOURS,
+)
 
 
 class CloneService(BaseService):
     """Service for cloning repositories"""
 
+    # Per-repository git config applied by the read acceleration step
+    _READ_CONFIG = {
+        # Diffs of large repositories resolve long delta chains, cache more delta bases
+        "core.deltaBaseCacheLimit": "512m",
+        # Use every CPU to resolve deltas
+        "pack.threads": "0",
+        "core.commitGraph": "true",
+        "core.multiPackIndex": "true",
+    }
+
+    # Blobless clones: blobs are fetched when git reads them, HEAD files once checked out
+    _BLOBLESS_CLONE_OPTIONS = ["--filter=blob:none", "--no-checkout"]
+
     def __init__(self):
         super().__init__()
+        self.read_acceleration = CLONE_READ_ACCELERATION
+        self.read_acceleration_min_size_mb = CLONE_READ_ACCELERATION_MIN_SIZE_MB
+        self.blobless_clone_mode = BloblessCloneMode(CLONE_BLOBLESS_MODE)
+        self.shallow_since_fetch = CLONE_SHALLOW_SINCE_FETCH
+        self.shallow_since_margin_hours = CLONE_SHALLOW_SINCE_MARGIN_HOURS
+        self.mirror_cache = (
+            MirrorCache(CLONE_MIRROR_CACHE_DIR, CLONE_MIRROR_CACHE_BUDGET_MB)
+            if CLONE_MIRROR_CACHE_DIR
+            else None
+        )
 
     async def _check_if_final_batch(self, path: str, target_commit_hash: str | None) -> bool:
         """
@@ -51,7 +106,7 @@ class CloneService(BaseService):
         except CommandExecutionError:
             return False
 
-    async def _perform_minimal_clone(self, path: str, remote: str) -> None:
+    async def _perform_minimal_clone(self, path: str, remote: str, blobless: bool = False) -> None:
         """
         Perform minimal clone of depth=1
         """
@@ -59,9 +114,22 @@ class CloneService(BaseService):
         await run_shell_command(
             ["git", "config", "--global", "http.postBuffer", "524288000"], cwd=path
         )
+        if os.path.isabs(remote):
+            # Local mirrors are only cloned shallow over the file:// protocol
+            remote = f"file://{remote}"
         self.logger.info("Initializing minimal clone")
         await run_shell_command(
-            ["git", "clone", "--depth=1", "--no-tags", "--single-branch", remote, "."], cwd=path
+            [
+                "git",
+                "clone",
+                "--depth=1",
+                "--no-tags",
+                "--single-branch",
+                *(self._BLOBLESS_CLONE_OPTIONS if blobless else []),
+                remote,
+                ".",
+            ],
+            cwd=path,
         )
         self.logger.info("Minimal clone initialized successfully")
 
@@ -74,62 +142,164 @@ class CloneService(BaseService):
             self.logger.warning(f"Failed to get repo size: {e}")
             return 0.0
 
-    async def _optimize_repository_storage(
-        self, repo_path: str, threshold_mb: float = DEFAULT_STORAGE_OPTIMIZATION_THRESHOLD_MB
-    ) -> None:
+    async def _time_history_walk(self, repo_path: str) -> float:
+        """Time a walk of the whole cloned history, as done by git log"""
+        start_time = time.time()
+        await run_shell_command(["git", "rev-list", "--count", "HEAD"], cwd=repo_path)
+        return time.time() - start_time
+
+    async def _accelerate_reads(self, repo_path: str, time_walks: bool = False) -> dict | None:
         """
-        Optimize repository storage if size exceeds threshold.
-        This is infrequently performed because 'git gc' is costly (CPU/IO intensive and time-consuming)
-        only runs for repositories (>2GB) that grow due to incremental fetching creating
-        inefficient pack files.
-        Uses git gc to compact repository and logs timing, size before and after operation.
+        Speed up the git reads following a clone or fetch, for repositories above
+        read_acceleration_min_size_mb of objects (from `git count-objects`, without walking
+        the repository directory like du).
+
+        Applies the _READ_CONFIG profile and writes a multi-pack-index over the packs left by
+        --deepen fetches. Once the history is complete, also writes a commit-graph with
+        changed-path Bloom filters, git doesn't use commit-graphs in shallow repositories.
+
+        Returns the step duration, with time_walks a history walk timed before and after it,
+        None when skipped. The walks cover the whole cloned history, so they are only timed
+        once per clone (final batch). Failures are logged, reads just stay slower.
         """
+        if not self.read_acceleration:
+            return None
         try:
-            size_before = await self._get_repo_size_mb(repo_path)
-
-            if size_before > threshold_mb:
-                self.logger.info(
-                    f"Repository size {size_before:.1f}MB > {threshold_mb:.0f}MB threshold, running git gc"
+            size_mb = round(await self._get_objects_kb(repo_path) / 1024, 1)
+            if size_mb < self.read_acceleration_min_size_mb:
+                self.logger.debug(
+                    f"Repository size {size_mb:.1f}MB is below threshold {self.read_acceleration_min_size_mb}MB, skipping read acceleration"
                 )
-
-                start_time = time.time()
+                return None
+
+            walk_before = await self._time_history_walk(repo_path) if time_walks else None
+            start_time = time.time()
+            for key, value in self._READ_CONFIG.items():
+                await run_shell_command(["git", "config", key, value], cwd=repo_path)
+            await run_shell_command(["git", "multi-pack-index", "write"], cwd=repo_path)
+            is_shallow_clone = await run_shell_command(
+                ["git", "rev-parse", "--is-shallow-repository"], cwd=repo_path
+            )
+            if "false" in is_shallow_clone:
                 await run_shell_command(
-                    ["git", "gc", "--keep-largest-pack", "--quiet"], cwd=repo_path
+                    ["git", "commit-graph", "write", "--reachable", "--changed-paths"],
+                    cwd=repo_path,
                 )
-                gc_duration = time.time() - start_time
-
-                size_after = await self._get_repo_size_mb(repo_path)
-                reduction_pct = (
-                    ((size_before - size_after) / size_before) * 100 if size_before > 0 else 0
-                )
-
+            duration = time.time() - start_time
+            read_acceleration = {"repo_size_mb": size_mb, "duration_sec": duration}
+            if not time_walks:
                 self.logger.info(
-                    f"Git gc completed in {gc_duration:.1f}s: {size_before:.1f}MB → {size_after:.1f}MB ({reduction_pct:.1f}% reduction)"
-                )
-            else:
-                self.logger.debug(
-                    f"Repository size {size_before:.1f}MB is below threshold {threshold_mb:.0f}MB, skipping storage optimization (normal - most repositories stay small)"
+                    f"Read acceleration completed in {duration:.1f}s for {size_mb:.1f}MB repository"
                 )
+                return read_acceleration
 
+            walk_after = await self._time_history_walk(repo_path)
+            self.logger.info(
+                f"Read acceleration completed in {duration:.1f}s for {size_mb:.1f}MB repository: history walk {walk_before:.2f}s → {walk_after:.2f}s"
+            )
+            return read_acceleration | {
+                "history_walk_sec_before": walk_before,
+                "history_walk_sec_after": walk_after,
+            }
         except Exception as e:
-            self.logger.error(f"Failed to perform git gc: {repr(e)}")
-            # Don't raise - gc failure shouldn't stop processing
+            self.logger.error(f"Failed to accelerate repository reads: {repr(e)}")
+            return None
+
+    def _get_read_acceleration_metrics(self, read_accelerations: list[dict]) -> dict:
+        """
+        Clone metrics of the read acceleration steps, the history walks timed on the final
+        batch (complete history) tell how much reads sped up for the repository size.
+        """
+        if not read_accelerations:
+            return {}
+        last = read_accelerations[-1]
+        metrics = {
+            "runs": len(read_accelerations),
+            "total_sec": round(sum(run["duration_sec"] for run in read_accelerations), 2),
+            "repo_size_mb": last["repo_size_mb"],
+        }
+        if "history_walk_sec_before" in last:
+            metrics |= {
+                "history_walk_sec_before": round(last["history_walk_sec_before"], 3),
+                "history_walk_sec_after": round(last["history_walk_sec_after"], 3),
+                "history_walk_speedup": round(
+                    last["history_walk_sec_before"] / max(last["history_walk_sec_after"], 0.001),
+                    2,
+                ),
+            }
+        return {"read_acceleration": metrics}
 
     @retry(
         stop=stop_after_attempt(5),
         wait=wait_fixed(1),
         reraise=True,
     )
-    async def _clone_next_batch(self, repo_path: str, batch_depth: int):
+    async def _clone_next_batch(
+        self, repo_path: str, batch_depth: int, clone_source: str | None = None
+    ):
         default_branch = await get_default_branch(repo_path)
         self.logger.info(
             f"Fetching an additional {batch_depth} commits from {default_branch} branch"
         )
         await run_shell_command(
-            ["git", "fetch", "origin", default_branch, f"--deepen={batch_depth}"], cwd=repo_path
+            [
+                "git",
+                "fetch",
+                *self._get_fetch_source(default_branch, clone_source),
+                f"--deepen={batch_depth}",
+            ],
+            cwd=repo_path,
         )
-        # Optimize repository storage using git garbage collection
-        await self._optimize_repository_storage(repo_path)
+
+    def _get_fetch_source(self, default_branch: str, clone_source: str | None) -> list[str]:
+        if clone_source:
+            # Deepen from the repository mirror, origin points to the remote
+            return [
+                f"file://{clone_source}",
+                f"+refs/heads/{default_branch}:refs/remotes/origin/{default_branch}",
+            ]
+        return ["origin", default_branch]
+
+    def _get_shallow_since(self, repository: Repository) -> datetime | None:
+        """
+        Date after which the commits new since the last processing are fetched in one go, None
+        to only deepen in batches.
+
+        git can't exclude the history of a bare commit hash (--shallow-exclude takes remote
+        refs), so the fetch is anchored on the last processing date. The margin covers the
+        commits pushed after the last processing but committed before it.
+        """
+        if not self.shallow_since_fetch or not repository.last_processed_at:
+            return None
+        return repository.last_processed_at - timedelta(hours=self.shallow_since_margin_hours)
+
+    async def _fetch_since(
+        self, repo_path: str, since: datetime, clone_source: str | None = None
+    ) -> bool:
+        """
+        Deepen the clone with all the commits after `since` in a single fetch.
+
+        Returns False when the fetch failed, e.g. when no commit is that recent or the remote
+        doesn't support --shallow-since, the caller falls back to batches.
+        """
+        default_branch = await get_default_branch(repo_path)
+        self.logger.info(f"Fetching commits of {default_branch} branch since {since.isoformat()}")
+        try:
+            await run_shell_command(
+                [
+                    "git",
+                    "fetch",
+                    *self._get_fetch_source(default_branch, clone_source),
+                    f"--shallow-since={since.isoformat()}",
+                ],
+                cwd=repo_path,
+            )
+        except CommandExecutionError as e:
+            self.logger.warning(
+                f"Fetch since {since.isoformat()} failed, deepening in batches: {e}"
+            )
+            return False
+        return True
 
     async def _update_batch_info(
         self,
@@ -177,6 +347,32 @@ class CloneService(BaseService):
         except FileNotFoundError:
             return None
 
+    async def _get_resumable_checkpoint(
+        self, repo_path: str, checkpoint: ProcessingCheckpoint
+    ) -> ProcessingCheckpoint | None:
+        """
+        Return the checkpoint of an interrupted processing if it can be resumed in the clone.
+
+        Its head commit must still be part of the cloned branch history, which isn't the case
+        anymore after a force push or a default branch change.
+        """
+        try:
+            await run_shell_command(
+                ["git", "merge-base", "--is-ancestor", checkpoint.head_commit, "HEAD"],
+                cwd=repo_path,
+            )
+        except CommandExecutionError:
+            self.logger.warning(
+                f"Checkpoint commit {checkpoint.head_commit} is not in the cloned history, "
+                "processing it from the start"
+            )
+            return None
+        self.logger.info(
+            f"Resuming processing of {checkpoint.head_commit} history after "
+            f"{checkpoint.emitted_commits} commits"
+        )
+        return checkpoint
+
     async def _cleanup_temp_directory(self, temp_repo_path: str, repo_id: str) -> None:
         """
         Clean up temporary directory with retries and error handling.
@@ -253,44 +449,105 @@ class CloneService(BaseService):
 
         self.logger.info("Working directory cleanup completed")
 
-    async def _calculate_batch_depth(self, repo_path: str, remote: str) -> int:
-        calculated_depth = None
-        total_branches_tags = await run_shell_command(
-            ["git", "ls-remote", "--heads", "--tags", remote], cwd=repo_path
+    def _create_depth_controller(self, repository: Repository) -> DepthController:
+        """Depth controller starting from the depth the repository last fetches settled on"""
+        return DepthController(
+            initial_depth=repository.clone_batch_depth or CLONE_BATCH_INITIAL_DEPTH,
+            min_depth=CLONE_BATCH_MIN_DEPTH,
+            max_depth=CLONE_BATCH_MAX_DEPTH,
+            fetch_target_sec=CLONE_BATCH_FETCH_TARGET_SEC,
+            fetch_budget_bytes=CLONE_BATCH_FETCH_BUDGET_MB * 1024 * 1024,
         )
-        total_branches_tags = len(total_branches_tags.splitlines())
-        if total_branches_tags <= 200:
-            # Small repo, get a decent amount of history
-            calculated_depth = 100
-        elif total_branches_tags <= 1000:
-            # Medium repo, get a moderate amount of history
-            calculated_depth = 50
-        else:
-            # Large repo, get less history
-            calculated_depth = 5
-        self.logger.info(
-            f"total_branches_tags={total_branches_tags}, calculated_depth={calculated_depth}"
+
+    def _create_pack_maintenance(self, partial_clone: bool) -> PackMaintenance:
+        return PackMaintenance(
+            geometric_min_packs=CLONE_PACK_MAINTENANCE_GEOMETRIC_PACKS,
+            geometric_min_loose_objects=CLONE_PACK_MAINTENANCE_LOOSE_OBJECTS,
+            midx_min_packs=CLONE_PACK_MAINTENANCE_MIDX_PACKS,
+            partial_clone=partial_clone,
+        )
+
+    async def _get_shallow_commits(self, repo_path: str) -> list[str]:
+        """The boundary commits of a shallow clone (.git/shallow), empty for a full history"""
+        shallow_file = os.path.join(repo_path, ".git", "shallow")
+        try:
+            async with aiofiles.open(shallow_file, "r", encoding="utf-8") as f:
+                return (await f.read()).split()
+        except FileNotFoundError:
+            return []
+
+    async def _count_new_commits(self, repo_path: str, previous_edges: list[str]) -> int:
+        """
+        Commits fetched behind the previous shallow boundary. Only the new part of the history
+        is walked, not the whole clone as counting HEAD would before and after each fetch.
+        """
+        if not previous_edges:
+            return 0
+        output = await run_shell_command(
+            ["git", "rev-list", "--count", *previous_edges], cwd=repo_path
+        )
+        # The edge commits themselves were fetched before
+        return max(int(output.strip()) - len(previous_edges), 0)
+
+    async def _get_objects_kb(self, repo_path: str) -> int:
+        """Size of the repository packs and loose objects in KB"""
+        output = await run_shell_command(["git", "count-objects", "-v"], cwd=repo_path)
+        counts = dict(line.split(": ", 1) for line in output.strip().splitlines())
+        return int(counts.get("size-pack", 0)) + int(counts.get("size", 0))
+
+    async def _deepen_next_batch(
+        self, repo_path: str, depth_controller: DepthController, clone_source: str | None = None
+    ) -> None:
+        """Fetch the next batch with the controller depth, and record what the fetch cost"""
+        previous_edges = await self._get_shallow_commits(repo_path)
+        objects_kb_before = await self._get_objects_kb(repo_path)
+        fetch_start = time.time()
+        await self._clone_next_batch(repo_path, depth_controller.depth, clone_source)
+        depth_controller.record_fetch(
+            time.time() - fetch_start,
+            await self._count_new_commits(repo_path, previous_edges),
+            (await self._get_objects_kb(repo_path) - objects_kb_before) * 1024,
         )
-        return calculated_depth
+        self.logger.info(f"Next batch depth: {depth_controller.depth}")
+
+    async def _save_batch_depth(self, repo_id: str, depth_controller: DepthController) -> None:
+        """Persist the depth the fetches settled on, so the next run starts from it"""
+        try:
+            await save_clone_batch_depth(repo_id, depth_controller.depth)
+        except Exception as e:
+            self.logger.warning(f"Failed to save batch depth of repository {repo_id}: {e!r}")
 
-    async def _perform_full_clone(self, repo_path: str, remote: str):
+    async def _perform_full_clone(self, repo_path: str, remote: str, blobless: bool = False):
         """Perform full repository clone"""
         self.logger.info(f"Performing full clone for repo {remote}...")
         await run_shell_command(
-            ["git", "clone", "--no-tags", "--single-branch", remote, "."], cwd=repo_path
+            [
+                "git",
+                "clone",
+                "--no-tags",
+                "--single-branch",
+                *(self._BLOBLESS_CLONE_OPTIONS if blobless else []),
+                remote,
+                ".",
+            ],
+            cwd=repo_path,
         )
         self.logger.info(f"Successfully completed full clone of repository: {remote}")
 
-    async def has_default_branch_changed(self, remote: str, saved_branch: str | None) -> bool:
+    async def has_default_branch_changed(
+        self, remote: str, saved_branch: str | None, remote_default_branch: str | None = None
+    ) -> bool:
         """Check if the default branch has changed compared to the saved branch
         Args:
             remote: The remote repository URL
             saved_branch: The branch currently saved in the database (can be None)
+            remote_default_branch: The remote default branch if already probed, else fetched
         Returns:
             True if default branch has changed and requires re-cloning, False otherwise
         """
         try:
-            remote_default_branch = await get_remote_default_branch(remote)
+            if remote_default_branch is None:
+                remote_default_branch = await get_remote_default_branch(remote)
 
             if remote_default_branch is None:
                 self.logger.warning(f"Could not determine default branch for {remote}")
@@ -315,7 +572,14 @@ class CloneService(BaseService):
             return False
 
     async def determine_clone_strategy(
-        self, repo_path: str, remote: str, branch: str | None, last_processed_commit: str | None
+        self,
+        repo_path: str,
+        remote: str,
+        branch: str | None,
+        last_processed_commit: str | None,
+        clone_source: str | None = None,
+        blobless: bool = False,
+        remote_default_branch: str | None = None,
     ) -> bool:
         """Determine whether to use full clone or minimal clone strategy based on repository state.
 
@@ -324,6 +588,9 @@ class CloneService(BaseService):
             remote: Remote repository URL (e.g., 'https://github.com/user/repo')
             branch: Current saved branch name or None for new repositories
             last_processed_commit: Last processed commit hash or None for new repositories
+            clone_source: Path of the repository mirror to clone instead of the remote, if any
+            blobless: Clone without blobs and without checking out HEAD files
+            remote_default_branch: The remote default branch if already probed
 
         Returns: (clone_with_batches)
             bool: False for full clone (clone_with_batches=False), True for minimal clone (clone_with_batches=True)
@@ -337,24 +604,125 @@ class CloneService(BaseService):
             f"Starting clone decision for {remote} (branch: {branch}, last_commit: {last_processed_commit})"
         )
 
-        default_branch_changed = await self.has_default_branch_changed(remote, branch)
+        default_branch_changed = await self.has_default_branch_changed(
+            remote, branch, remote_default_branch
+        )
 
         if not last_processed_commit or default_branch_changed:
             reason = "new repository" if not last_processed_commit else "branch changed"
             self.logger.info(f"Performing full clone for {remote} - reason: {reason}")
-            await self._perform_full_clone(repo_path, remote)
+            await self._perform_full_clone(repo_path, clone_source or remote, blobless)
+            clone_with_batches = False
+        else:
+            self.logger.info(
+                f"Performing minimal clone for {remote} - existing repository with unchanged branch"
+            )
+            await self._perform_minimal_clone(repo_path, clone_source or remote, blobless)
+            clone_with_batches = True
+
+        if clone_source:
+            # Clones look the same as remote clones to the services reading the origin url
+            await run_shell_command(["git", "remote", "set-url", "origin", remote], cwd=repo_path)
+        return clone_with_batches
+
+    def is_remote_unchanged(
+        self, repository: Repository, remote_probe: RemoteProbe | None
+    ) -> bool:
+        """
+        Whether the remote default branch is still at the last processed commit, in which case
+        there are no new commits to clone history for or process. Never the case without a
+        saved branch and last processed commit to compare with.
+        """
+        if (
+            not remote_probe
+            or not remote_probe.head_commit
+            or not repository.last_processed_commit
+            or not repository.branch
+        ):
+            return False
+        if remote_probe.default_branch != repository.branch:
+            return False
+        return remote_probe.head_commit == repository.last_processed_commit
+
+    def _use_blobless_clone(self, repository: Repository, clone_source: str | None) -> bool:
+        """
+        Whether to clone the repository without blobs.
+
+        Commit processing only reads blobs to compute diff stats, so repositories whose stats
+        mode reads none (CommitStatsMode.NONE) never need more than HEAD files. In "always"
+        mode, the blobs needed by diff stats are fetched lazily by git log. Mirror clones are
+        never blobless, as they hardlink the mirror objects without transferring any.
+        """
+        if clone_source or self.blobless_clone_mode == BloblessCloneMode.OFF:
             return False
+        if self.blobless_clone_mode == BloblessCloneMode.ALWAYS:
+            return True
+        return repository.commit_stats_mode == CommitStatsMode.NONE
+
+    async def _get_storage_mb(self, repo_path: str) -> tuple[float, float]:
+        """
+        Size of the repository packs and loose objects, which is roughly what was transferred
+        by its clone and fetches, and disk usage -> (objects MB, disk MB)
+        """
+        objects_kb = await self._get_objects_kb(repo_path)
+        return round(objects_kb / 1024, 1), await self._get_repo_size_mb(repo_path)
+
+    async def _sync_mirror(
+        self, repo_id: str, remote: str, default_branch: str | None, seed: bool
+    ) -> tuple[str | None, MirrorLock | None, dict]:
+        """
+        Fetch the repository mirror to clone from, and evict mirrors over the cache budget.
+
+        Mirrors hold the whole branch history, so a missing mirror is only created (seeded)
+        when the repository needs a full clone anyway. Incremental runs of repositories
+        without a mirror keep their shallow clone from the remote.
+
+        Returns (mirror path, mirror lock, mirror cache metrics). The mirror stays locked until
+        the lock is released, the path is None when the remote has to be cloned instead.
+        """
+        if not seed and not self.mirror_cache.has_mirror(repo_id):
+            self.logger.info("Repository has no mirror, cloning shallow from remote")
+            return None, None, {"mirror_cache": {"hits": 0, "misses": 1, "seeded": 0}}
+        lock = self.mirror_cache.lock(repo_id)
+        if not lock:
+            self.logger.info("Repository mirror is being evicted, cloning from remote")
+            return None, None, {}
+        try:
+            start_time = time.time()
+            if not default_branch:
+                raise ValueError(f"Could not determine default branch for {remote}")
+            hit = await self.mirror_cache.sync(repo_id, remote, default_branch)
+            sync_duration = time.time() - start_time
+            evicted, evicted_mb, cache_size_mb = await self.mirror_cache.evict(repo_id)
+        except Exception as e:
+            lock.release()
+            self.logger.warning(f"Failed to sync repository mirror, cloning from remote: {e!r}")
+            return None, None, {"mirror_cache": {"hits": 0, "misses": 1, "errors": 1}}
 
         self.logger.info(
-            f"Performing minimal clone for {remote} - existing repository with unchanged branch"
+            f"Repository mirror {'fetched' if hit else 'created'} in {sync_duration:.1f}s"
+        )
+        return (
+            self.mirror_cache.mirror_path(repo_id),
+            lock,
+            {
+                "mirror_cache": {
+                    "hits": int(hit),
+                    "misses": int(not hit),
+                    "seeded": int(not hit),
+                    "sync_sec": round(sync_duration, 2),
+                    "evictions": evicted,
+                    "evicted_mb": round(evicted_mb, 1),
+                    "cache_size_mb": round(cache_size_mb, 1),
+                }
+            },
         )
-        await self._perform_minimal_clone(repo_path, remote)
-        return True
 
     async def clone_batches_generator(
         self,
         repository: Repository,
         working_dir_cleanup: bool | None = False,
+        remote_probe: RemoteProbe | None = None,
     ) -> AsyncIterator[CloneBatchInfo]:
         """
         Async generator that yields CloneBatchInfo for repository cloning.
@@ -362,13 +730,34 @@ class CloneService(BaseService):
         For new repositories (clone_with_batches=False): Performs full clone to avoid inefficient batching (stacked git objects).
 
         For existing repositories (clone_with_batches=True): Uses incremental batched
-        processing to fetch only new commits since last processing.
+        processing to fetch only new commits since last processing. With shallow-since
+        fetches, the first fetch gets all the commits since the last processing at once, and
+        the following ones deepen in batches until the last processed commit is reached.
+
+        With a mirror cache, the repository mirror on the node disk is fetched first and
+        cloned instead of the remote.
+
+        The remote is listed once per run (see `probe_remote`), the probe made by the caller is
+        reused when given.
+
+        When a full clone processing was interrupted, the batch resumes from its checkpoint:
+        the history of the checkpoint head commit is processed, commits pushed since then are
+        left to the next incremental processing.
         """
         temp_repo_path = None
         execution_status = ExecutionStatus.SUCCESS
         error_code = None
         error_message = None
         total_execution_time = 0.0
+        # Read acceleration measures of each clone and fetch
+        read_accelerations = []
+        mirror_lock = None
+        mirror_metrics = {}
+        # Transferred objects and disk usage, to compare blobless and full clones
+        storage_metrics = {}
+        # Incremental fetches of batched clones, by strategy
+        fetch_metrics = {}
+        pack_maintenance = None
         remote = repository.url.removesuffix(".git")
 
         batch_info = CloneBatchInfo(
@@ -380,15 +769,58 @@ class CloneService(BaseService):
         try:
             temp_repo_path = tempfile.mkdtemp(prefix=f"{get_repo_name(remote)}_")
             batch_start_time = time.time()
-
+            if remote_probe is None:
+                remote_probe = await probe_remote(remote, repository.branch)
+
+            mirror_path = None
+            if self.mirror_cache:
+                default_branch = remote_probe.default_branch if remote_probe else None
+                # Same decision as determine_clone_strategy, without listing the remote again
+                full_clone = not repository.last_processed_commit or (
+                    repository.branch is not None
+                    and default_branch is not None
+                    and default_branch != repository.branch
+                )
+                mirror_path, mirror_lock, mirror_metrics = await self._sync_mirror(
+                    repository.id, remote, default_branch, seed=full_clone
+                )
+            blobless = self._use_blobless_clone(repository, mirror_path)
             clone_with_batches = await self.determine_clone_strategy(
-                temp_repo_path, remote, repository.branch, repository.last_processed_commit
+                temp_repo_path,
+                remote,
+                repository.branch,
+                repository.last_processed_commit,
+                mirror_path,
+                blobless,
+                remote_probe.default_branch if remote_probe else None,
             )
+            clone_objects_mb, clone_disk_mb = await self._get_storage_mb(temp_repo_path)
+            storage_metrics = {
+                "blobless": blobless,
+                "clone_objects_mb": clone_objects_mb,
+                "clone_disk_mb": clone_disk_mb,
+            }
             if clone_with_batches:
-                batch_depth = await self._calculate_batch_depth(temp_repo_path, remote)
+                depth_controller = self._create_depth_controller(repository)
+                shallow_since = self._get_shallow_since(repository)
+                fetch_metrics = {"shallow_since_fetches": 0, "deepen_fetches": 0}
+                pack_maintenance = self._create_pack_maintenance(blobless)
             await self._update_batch_info(
                 batch_info, temp_repo_path, repository.last_processed_commit, clone_with_batches
             )
+            if read_acceleration := await self._accelerate_reads(
+                temp_repo_path, time_walks=batch_info.is_final_batch
+            ):
+                read_accelerations.append(read_acceleration)
+            if not clone_with_batches and repository.processing_checkpoint:
+                batch_info.checkpoint = await self._get_resumable_checkpoint(
+                    temp_repo_path, repository.processing_checkpoint
+                )
+                if batch_info.checkpoint:
+                    batch_info.latest_commit_in_repo = batch_info.checkpoint.head_commit
+            if blobless:
+                # HEAD files are read by the first batch services, their blobs are fetched at once
+                await run_shell_command(["git", "checkout", "--quiet"], cwd=temp_repo_path)
             batch_end_time = time.time()
             total_execution_time += round(batch_end_time - batch_start_time, 2)
 
@@ -399,19 +831,40 @@ class CloneService(BaseService):
             batch_info.is_first_batch = False
             while not batch_info.is_final_batch:
                 batch_start_time = time.time()
+                # Fetching while packs are rewritten would race for the same pack files
+                await pack_maintenance.wait()
                 batch_info.prev_batch_edge_commit = await self._get_edge_commit(temp_repo_path)
-                await self._clone_next_batch(temp_repo_path, batch_depth)
+                if shallow_since and await self._fetch_since(
+                    temp_repo_path, shallow_since, mirror_path
+                ):
+                    fetch_metrics["shallow_since_fetches"] += 1
+                else:
+                    await self._deepen_next_batch(temp_repo_path, depth_controller, mirror_path)
+                    fetch_metrics["deepen_fetches"] += 1
+                # Only the first fetch covers the new history at once, the rest deepens it
+                shallow_since = None
                 await self._update_batch_info(
                     batch_info,
                     temp_repo_path,
                     repository.last_processed_commit,
                     clone_with_batches,
                 )
+                if read_acceleration := await self._accelerate_reads(
+                    temp_repo_path, time_walks=batch_info.is_final_batch
+                ):
+                    read_accelerations.append(read_acceleration)
+                if not batch_info.is_final_batch:
+                    # Runs while the consumer processes the batch commits
+                    pack_maintenance.start(temp_repo_path)
                 batch_end_time = time.time()
                 total_execution_time += round(batch_end_time - batch_start_time, 2)
 
                 yield batch_info
 
+            if clone_with_batches and depth_controller.fetches:
+                fetch_metrics["batch_depth"] = depth_controller.get_metrics()
+                await self._save_batch_depth(repository.id, depth_controller)
+
         except Exception as e:
             # Handle both CrowdGitError and generic Exception
             execution_status = ExecutionStatus.FAILURE
@@ -422,6 +875,19 @@ class CloneService(BaseService):
             self.logger.error(f"Cloning failed: {error_message}")
             raise
         finally:
+            if mirror_lock:
+                mirror_lock.release()
+            if pack_maintenance:
+                await pack_maintenance.wait()
+            if storage_metrics:
+                try:
+                    # Including the later fetches, and the blobs fetched lazily by commit processing
+                    (
+                        storage_metrics["final_objects_mb"],
+                        storage_metrics["final_disk_mb"],
+                    ) = await self._get_storage_mb(temp_repo_path)
+                except Exception as e:
+                    self.logger.warning(f"Failed to measure repository storage: {e!r}")
             if temp_repo_path and os.path.exists(temp_repo_path):
                 await self._cleanup_temp_directory(temp_repo_path, repository.id)
 
@@ -433,5 +899,10 @@ class CloneService(BaseService):
                 error_code=error_code,
                 error_message=error_message,
                 execution_time_sec=Decimal(str(round(total_execution_time, 2))),
+                metrics=self._get_read_acceleration_metrics(read_accelerations)
+                | mirror_metrics
+                | ({"storage": storage_metrics} if storage_metrics else {})
+                | ({"incremental_fetch": fetch_metrics} if fetch_metrics else {})
+                | (pack_maintenance.get_metrics() if pack_maintenance else {}),
             )
             await save_service_execution(service_execution)
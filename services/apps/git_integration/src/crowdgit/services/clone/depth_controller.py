@@ -0,0 +1,64 @@
+class DepthController:
+    """
+    Adapt the number of commits fetched by each --deepen of a batched clone to the fetch cost.
+
+    After each fetch, the average seconds and bytes per fetched commit give the depth that
+    fetches within the time target and the size budget (which bounds the pack git receives,
+    indexes and keeps on disk). The depth moves toward it, at most doubling or halving per
+    fetch so a single unusual batch (e.g. one large vendoring commit) doesn't swing it.
+    """
+
+    # Weight of the last fetch in the average cost per commit
+    _SMOOTHING = 0.3
+
+    def __init__(
+        self,
+        initial_depth: int,
+        min_depth: int,
+        max_depth: int,
+        fetch_target_sec: float,
+        fetch_budget_bytes: int,
+    ):
+        self.min_depth = min_depth
+        self.max_depth = max(max_depth, min_depth)
+        self.depth = self._clamp_depth(initial_depth)
+        self.fetch_target_sec = fetch_target_sec
+        self.fetch_budget_bytes = fetch_budget_bytes
+        self.fetches = 0
+
+        self._commit_sec = 0.0
+        self._commit_bytes = 0.0
+        self._fetched_commits = 0
+
+    def _clamp_depth(self, depth: int) -> int:
+        return min(max(depth, self.min_depth), self.max_depth)
+
+    def _average(self, average: float, value: float) -> float:
+        if not average:
+            return value
+        return average + self._SMOOTHING * (value - average)
+
+    def record_fetch(self, seconds: float, commits: int, fetched_bytes: int):
+        """Record the duration and size of a fetch, and adapt the depth of the next one"""
+        self.fetches += 1
+        if commits <= 0:
+            # Nothing new was fetched (e.g. the root commit was reached), nothing to learn
+            return
+        self._fetched_commits += commits
+        self._commit_sec = self._average(self._commit_sec, seconds / commits)
+        self._commit_bytes = self._average(self._commit_bytes, max(fetched_bytes, 0) / commits)
+
+        ideal_depth = self.fetch_target_sec / max(self._commit_sec, 1e-6)
+        if self._commit_bytes:
+            ideal_depth = min(ideal_depth, self.fetch_budget_bytes / self._commit_bytes)
+        self.depth = self._clamp_depth(int(min(max(ideal_depth, self.depth / 2), self.depth * 2)))
+
+    def get_metrics(self) -> dict:
+        """Chosen depth and average fetch cost per commit"""
+        return {
+            "depth": self.depth,
+            "fetches": self.fetches,
+            "fetched_commits": self._fetched_commits,
+            "avg_commit_ms": round(self._commit_sec * 1000, 3),
+            "avg_commit_bytes": round(self._commit_bytes),
+        }
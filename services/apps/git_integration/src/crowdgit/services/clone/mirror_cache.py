@@ -0,0 +1,166 @@
+import asyncio
+import contextlib
+import fcntl
+import os
+import shutil
+
+import aiofiles
+
+from crowdgit.logger import logger
+from crowdgit.services.utils import run_shell_command
+
+MIRROR_SUFFIX = ".git"
+# Sidecar file of each mirror holding its size in MB, recorded after each sync
+SIZE_SUFFIX = ".size"
+
+
+class MirrorLock:
+    """Lock on a mirror, shared while it is used, exclusive while it is evicted"""
+
+    def __init__(self, lock_path: str, exclusive: bool = False):
+        self._file = open(lock_path, "a")
+        try:
+            fcntl.flock(
+                self._file, (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB
+            )
+        except BlockingIOError:
+            self._file.close()
+            raise
+
+    def release(self) -> None:
+        if not self._file.closed:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+
+
+class MirrorCache:
+    """
+    Bare mirrors of repositories default branch, kept on the node disk across runs.
+
+    Repositories are cloned from their mirror, so a repository seen before only costs an
+    incremental fetch of its new commits. Mirrors are created by full clones (onboardings),
+    which transfer the whole history anyway. Mirrors are evicted least recently used first once
+    the cache exceeds its disk budget, the mirror directory modification time tracks its last
+    use. Mirror sizes are recorded after each sync, so checking the budget reads them instead
+    of measuring every mirror. Worker processes of the node share the cache: a mirror is locked while it is used,
+    and locked mirrors are never evicted.
+    """
+
+    def __init__(self, cache_dir: str, budget_mb: int):
+        self.cache_dir = cache_dir
+        self.budget_mb = budget_mb
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def mirror_path(self, repo_id: str) -> str:
+        return os.path.join(self.cache_dir, f"{repo_id}{MIRROR_SUFFIX}")
+
+    def has_mirror(self, repo_id: str) -> bool:
+        return os.path.isdir(self.mirror_path(repo_id))
+
+    def repo_ids(self) -> list[str]:
+        """Ids of the repositories mirrored on this node"""
+        return [
+            entry.name.removesuffix(MIRROR_SUFFIX)
+            for entry in os.scandir(self.cache_dir)
+            if entry.is_dir() and entry.name.endswith(MIRROR_SUFFIX)
+        ]
+
+    def lock(self, repo_id: str) -> MirrorLock | None:
+        """Lock the repository mirror for use, None if it is being evicted"""
+        try:
+            return MirrorLock(self.mirror_path(repo_id) + ".lock")
+        except BlockingIOError:
+            return None
+
+    async def sync(self, repo_id: str, remote: str, branch: str) -> bool:
+        """
+        Create or update the repository mirror with the remote branch, the mirror must be
+        locked. Returns whether the mirror already existed (cache hit).
+        """
+        path = self.mirror_path(repo_id)
+        hit = self.has_mirror(repo_id)
+        if not hit:
+            logger.info(f"Creating mirror of {remote} in {path}")
+            await run_shell_command(["git", "init", "--quiet", "--bare", path])
+        try:
+            await run_shell_command(
+                [
+                    "git",
+                    "-C",
+                    path,
+                    "fetch",
+                    "--quiet",
+                    "--no-tags",
+                    "--prune",
+                    remote,
+                    f"+refs/heads/{branch}:refs/heads/{branch}",
+                ]
+            )
+            # Clones of the mirror check out (and track as origin/HEAD) the remote default branch
+            await run_shell_command(
+                ["git", "-C", path, "symbolic-ref", "HEAD", f"refs/heads/{branch}"]
+            )
+        except Exception:
+            if not hit:
+                await asyncio.to_thread(shutil.rmtree, path, True)
+            raise
+        os.utime(path)
+        await self._record_size_mb(repo_id)
+        return hit
+
+    async def evict(self, keep_repo_id: str) -> tuple[int, float, float]:
+        """
+        Evict least recently used mirrors until the cache fits in its disk budget.
+
+        Returns (evicted mirrors, evicted size in MB, cache size in MB).
+        """
+        mirrors = []
+        for repo_id in self.repo_ids():
+            path = self.mirror_path(repo_id)
+            mirrors.append((os.stat(path).st_mtime, repo_id, await self._get_size_mb(repo_id)))
+        cache_size_mb = sum(size_mb for _, _, size_mb in mirrors)
+
+        evicted = 0
+        evicted_mb = 0.0
+        if cache_size_mb <= self.budget_mb:
+            return evicted, evicted_mb, cache_size_mb
+        for _, repo_id, size_mb in sorted(mirrors):
+            if cache_size_mb <= self.budget_mb:
+                break
+            if repo_id == keep_repo_id:
+                continue
+            try:
+                lock = MirrorLock(self.mirror_path(repo_id) + ".lock", exclusive=True)
+            except BlockingIOError:
+                # In use by another worker
+                continue
+            try:
+                logger.info(f"Evicting mirror of repository {repo_id} ({size_mb:.1f}MB)")
+                await asyncio.to_thread(shutil.rmtree, self.mirror_path(repo_id), True)
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(self.mirror_path(repo_id) + SIZE_SUFFIX)
+            finally:
+                lock.release()
+            evicted += 1
+            evicted_mb += size_mb
+            cache_size_mb -= size_mb
+        return evicted, evicted_mb, cache_size_mb
+
+    async def _record_size_mb(self, repo_id: str) -> float:
+        """Measure the mirror objects size with count-objects, and save it in its sidecar"""
+        output = await run_shell_command(
+            ["git", "-C", self.mirror_path(repo_id), "count-objects", "-v"]
+        )
+        counts = dict(line.split(": ", 1) for line in output.strip().splitlines())
+        size_mb = (int(counts.get("size-pack", 0)) + int(counts.get("size", 0))) / 1024
+        async with aiofiles.open(self.mirror_path(repo_id) + SIZE_SUFFIX, "w") as f:
+            await f.write(f"{size_mb:.1f}")
+        return size_mb
+
+    async def _get_size_mb(self, repo_id: str) -> float:
+        """Recorded mirror size, measured once for mirrors without one"""
+        try:
+            async with aiofiles.open(self.mirror_path(repo_id) + SIZE_SUFFIX) as f:
+                return float(await f.read())
+        except (FileNotFoundError, ValueError):
+            return await self._record_size_mb(repo_id)
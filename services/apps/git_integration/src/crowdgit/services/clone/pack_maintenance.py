@@ -0,0 +1,126 @@
+import asyncio
+import time
+
+from crowdgit.logger import logger
+from crowdgit.services.utils import run_shell_command
+
+GEOMETRIC_REPACK = "geometric_repack"
+MULTI_PACK_INDEX = "multi_pack_index"
+
+
+class PackMaintenance:
+    """
+    Keep the packs of a clone deepened batch after batch cheap to read, without git gc.
+
+    Each fetch adds a pack, or loose objects for small fetches. Pack counts and sizes are read
+    from `git count-objects -v`, which doesn't walk the repository like du, and pick:
+    - a geometric repack (`git repack -d --geometric=2`) once there are many packs or loose
+      objects. It packs the loose objects and merges the small packs until pack sizes form a
+      geometric progression, leaving the largest packs untouched.
+    - a multi-pack-index over the packs once there are a few, so object lookups search a
+      single index. Partial (blobless) clones only get this one, git can't repack their
+      promisor packs geometrically.
+
+    Maintenance runs in the background: it is started after a fetch, runs while the fetched
+    batch is processed, and is waited for before the next fetch.
+    """
+
+    def __init__(
+        self,
+        geometric_min_packs: int,
+        geometric_min_loose_objects: int,
+        midx_min_packs: int,
+        partial_clone: bool = False,
+    ):
+        self.geometric_min_packs = geometric_min_packs
+        self.geometric_min_loose_objects = geometric_min_loose_objects
+        self.midx_min_packs = midx_min_packs
+        self.partial_clone = partial_clone
+        self._task: asyncio.Task | None = None
+        self._runs = {GEOMETRIC_REPACK: 0, MULTI_PACK_INDEX: 0}
+        self._total_sec = 0.0
+        # Time the fetches waited for maintenance, the rest overlapped commit processing
+        self._wait_sec = 0.0
+        self._saved_kb = 0
+        self._packs_before = 0
+        self._packs_after = 0
+
+    async def get_pack_stats(self, repo_path: str) -> dict[str, int]:
+        """`git count-objects -v` counts: packs, size-pack (KB), count (loose objects), size (KB)"""
+        output = await run_shell_command(["git", "count-objects", "-v"], cwd=repo_path)
+        return {
+            key: int(value)
+            for key, value in (line.split(": ", 1) for line in output.strip().splitlines())
+        }
+
+    def choose_maintenance(self, stats: dict[str, int]) -> str | None:
+        """Maintenance needed by a repository with the given pack stats, if any"""
+        if not self.partial_clone and (
+            stats.get("packs", 0) >= self.geometric_min_packs
+            or stats.get("count", 0) >= self.geometric_min_loose_objects
+        ):
+            return GEOMETRIC_REPACK
+        if stats.get("packs", 0) >= self.midx_min_packs:
+            return MULTI_PACK_INDEX
+        return None
+
+    def start(self, repo_path: str) -> None:
+        """Start the maintenance of the repository in the background"""
+        self._task = asyncio.create_task(self._maintain(repo_path))
+
+    async def wait(self) -> None:
+        """Wait for the background maintenance, if any. Failures are only logged."""
+        if self._task:
+            task, self._task = self._task, None
+            start_time = time.time()
+            await task
+            self._wait_sec += time.time() - start_time
+
+    async def _maintain(self, repo_path: str) -> None:
+        try:
+            stats_before = await self.get_pack_stats(repo_path)
+            maintenance = self.choose_maintenance(stats_before)
+            if not maintenance:
+                return
+            start_time = time.time()
+            if maintenance == GEOMETRIC_REPACK:
+                await run_shell_command(
+                    ["git", "repack", "-d", "--geometric=2", "--write-midx", "--quiet"],
+                    cwd=repo_path,
+                )
+            else:
+                await run_shell_command(["git", "multi-pack-index", "write"], cwd=repo_path)
+            duration = time.time() - start_time
+            stats_after = await self.get_pack_stats(repo_path)
+        except Exception as e:
+            logger.warning(f"Pack maintenance of {repo_path} failed: {e!r}")
+            return
+
+        objects_kb_before = stats_before.get("size-pack", 0) + stats_before.get("size", 0)
+        objects_kb_after = stats_after.get("size-pack", 0) + stats_after.get("size", 0)
+        self._runs[maintenance] += 1
+        self._total_sec += duration
+        self._saved_kb += objects_kb_before - objects_kb_after
+        self._packs_before = stats_before.get("packs", 0)
+        self._packs_after = stats_after.get("packs", 0)
+        logger.info(
+            f"Pack maintenance ({maintenance}) completed in {duration:.1f}s: "
+            f"{self._packs_before} -> {self._packs_after} packs, "
+            f"{objects_kb_before / 1024:.1f}MB -> {objects_kb_after / 1024:.1f}MB"
+        )
+
+    def get_metrics(self) -> dict:
+        """Maintenance runs, time spent and space saved, empty if nothing ran"""
+        if not any(self._runs.values()):
+            return {}
+        return {
+            "pack_maintenance": {
+                "geometric_repacks": self._runs[GEOMETRIC_REPACK],
+                "multi_pack_index_writes": self._runs[MULTI_PACK_INDEX],
+                "total_sec": round(self._total_sec, 2),
+                "overlapped_sec": round(max(self._total_sec - self._wait_sec, 0), 2),
+                "saved_mb": round(self._saved_kb / 1024, 1),
+                "last_packs_before": self._packs_before,
+                "last_packs_after": self._packs_after,
+            }
+        }
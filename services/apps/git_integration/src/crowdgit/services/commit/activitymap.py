@@ -348,3 +348,10 @@ ActivityMap = {
     "workflow-found-ok-by": ["Reviewed-by"],
     "written-by": ["Reported-by"],
 }
+
+# Activity types created for each ActivityMap trailer, as used in activity types and source ids
+# ("Signed-off-by" -> "signed-off-commit"), computed once instead of for every matched trailer
+ActivityTypes = {
+    trailer: tuple(activity.lower().replace("-by", "") + "-commit" for activity in activities)
+    for trailer, activities in ActivityMap.items()
+}
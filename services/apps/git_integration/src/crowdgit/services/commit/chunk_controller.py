@@ -0,0 +1,121 @@
+import asyncio
+
+
+class ChunkController:
+    """
+    Adapt the commit chunk size and the number of chunks being written to the processing speed.
+
+    Chunk sizes follow AIMD (additive increase, multiplicative decrease), like TCP congestion
+    windows: while writing a chunk to the database and Kafka takes less than half of the
+    latency target, chunks grow by the initial chunk size, and once a stage takes longer than
+    the target they are halved. The number of chunks written at once grows the same way while
+    writes are slower than building activities, and is halved when writes are over the target.
+
+    Chunks are also kept small enough for every buffered chunk to fit in the memory limit,
+    based on the measured serialized activities size per commit.
+    """
+
+    # Weight of the last measure in the average stage latencies and commit size
+    _SMOOTHING = 0.3
+
+    def __init__(
+        self,
+        initial_chunk_size: int,
+        min_chunk_size: int,
+        max_chunk_size: int,
+        initial_in_flight: int,
+        max_in_flight: int,
+        latency_target_sec: float,
+        memory_limit_bytes: int,
+    ):
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max(max_chunk_size, min_chunk_size)
+        self.chunk_size = self._clamp_chunk_size(initial_chunk_size)
+        self._chunk_size_step = self.chunk_size
+        self.max_in_flight = max(max_in_flight, 1)
+        self.in_flight_limit = min(max(initial_in_flight, 1), self.max_in_flight)
+        self.latency_target_sec = latency_target_sec
+        self.memory_limit_bytes = memory_limit_bytes
+        # Chunks waiting in pipeline queues or being built, on top of the ones being written
+        self.buffered_chunks = 0
+
+        self._in_flight = 0
+        self._slot_released = asyncio.Condition()
+        self._last_latency = {"build": 0.0, "db": 0.0, "kafka": 0.0}
+        self._avg_latency = dict(self._last_latency)
+        self._commit_bytes = 0.0
+        self._largest_chunk_size = self.chunk_size
+        self._largest_in_flight = self.in_flight_limit
+
+    def _clamp_chunk_size(self, chunk_size: int) -> int:
+        return min(max(chunk_size, self.min_chunk_size), self.max_chunk_size)
+
+    def _average(self, average: float, value: float) -> float:
+        if not average:
+            return value
+        return average + self._SMOOTHING * (value - average)
+
+    async def acquire_write_slot(self):
+        """Wait until one more chunk can be written"""
+        async with self._slot_released:
+            await self._slot_released.wait_for(lambda: self._in_flight < self.in_flight_limit)
+            self._in_flight += 1
+
+    async def release_write_slot(self):
+        """Mark a chunk as written, and adapt to its measured latencies"""
+        async with self._slot_released:
+            self._in_flight -= 1
+            self._adjust()
+            self._slot_released.notify_all()
+
+    def record_build(self, seconds: float, commits: int, activity_bytes: int):
+        """Record the time spent building the activities of a chunk, and their size"""
+        self._record_latency("build", seconds)
+        if commits:
+            self._commit_bytes = self._average(self._commit_bytes, activity_bytes / commits)
+
+    def record_write(self, stage: str, seconds: float):
+        """Record the time spent writing a chunk to the database ("db") or Kafka ("kafka")"""
+        self._record_latency(stage, seconds)
+
+    def _record_latency(self, stage: str, seconds: float):
+        self._last_latency[stage] = seconds
+        self._avg_latency[stage] = self._average(self._avg_latency[stage], seconds)
+
+    def _adjust(self):
+        write_latency = self._last_latency["db"] + self._last_latency["kafka"]
+        build_latency = self._last_latency["build"]
+        if write_latency > self.latency_target_sec or build_latency > self.latency_target_sec:
+            self.chunk_size //= 2
+            if write_latency > self.latency_target_sec:
+                self.in_flight_limit = max(self.in_flight_limit // 2, 1)
+        elif write_latency < self.latency_target_sec / 2:
+            self.chunk_size += self._chunk_size_step
+            # Building activities is faster than writing them, write more chunks at once
+            if write_latency > build_latency and self.in_flight_limit < self.max_in_flight:
+                self.in_flight_limit += 1
+
+        self.chunk_size = self._clamp_chunk_size(min(self.chunk_size, self._memory_chunk_size()))
+        self._largest_chunk_size = max(self._largest_chunk_size, self.chunk_size)
+        self._largest_in_flight = max(self._largest_in_flight, self.in_flight_limit)
+
+    def _memory_chunk_size(self) -> int:
+        """Largest chunk size keeping every buffered chunk within the memory limit"""
+        if not self._commit_bytes:
+            return self.max_chunk_size
+        chunks = self.in_flight_limit + self.buffered_chunks
+        return int(self.memory_limit_bytes / (chunks * self._commit_bytes))
+
+    def get_metrics(self) -> dict:
+        """Chosen chunking values and average stage latencies"""
+        return {
+            "chunk_size": self.chunk_size,
+            "max_chunk_size": self._largest_chunk_size,
+            "in_flight_chunks": self.in_flight_limit,
+            "max_in_flight_chunks": self._largest_in_flight,
+            "avg_commit_bytes": round(self._commit_bytes),
+            **{
+                f"avg_{stage}_latency_sec": round(latency, 3)
+                for stage, latency in self._avg_latency.items()
+            },
+        }
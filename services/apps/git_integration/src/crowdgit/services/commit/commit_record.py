@@ -0,0 +1,73 @@
+class CommitRecord:
+    """
+    Commit data used to build activities, parsed once per commit.
+
+    A slotted object instead of a dict: commits are created by the million during large
+    onboardings, and every activity of a commit reads the same pre-parsed values (timestamps,
+    timezone names, joined message) instead of recomputing them.
+    """
+
+    __slots__ = (
+        "hash",
+        "author_name",
+        "author_email",
+        "author_datetime",
+        "author_timezone",
+        "committer_name",
+        "committer_email",
+        "committer_datetime",
+        "committer_timezone",
+        "is_merge_commit",
+        "body",
+        "trailers",
+        "insertions",
+        "deletions",
+    )
+
+    def __init__(
+        self,
+        hash: str,
+        author_name: str,
+        author_email: str,
+        author_datetime: str,
+        author_timezone: str | None,
+        committer_name: str,
+        committer_email: str,
+        committer_datetime: str,
+        committer_timezone: str | None,
+        is_merge_commit: bool,
+        body: str,
+        insertions: int,
+        deletions: int,
+        trailers: list[str] | None = None,
+    ):
+        self.hash = hash
+        self.author_name = author_name
+        self.author_email = author_email
+        # ISO 8601 timestamps as printed by git, and their timezone names (e.g. "UTC+01:00")
+        self.author_datetime = author_datetime
+        self.author_timezone = author_timezone
+        self.committer_name = committer_name
+        self.committer_email = committer_email
+        self.committer_datetime = committer_datetime
+        # None when neither the committer nor the author datetime is valid
+        self.committer_timezone = committer_timezone
+        self.is_merge_commit = is_merge_commit
+        self.body = body
+        # Trailer lines parsed by git, None when trailers are read from the whole message
+        self.trailers = trailers
+        self.insertions = insertions
+        self.deletions = deletions
+
+    @property
+    def message(self) -> list[str]:
+        """Commit message lines"""
+        return self.body.splitlines()
+
+    @property
+    def trailer_lines(self) -> list[str]:
+        """Lines that may contain activity trailers"""
+        return self.message if self.trailers is None else self.trailers
+
+    def __repr__(self) -> str:
+        return f"CommitRecord(hash={self.hash!r}, author_email={self.author_email!r})"
@@ -1,70 +1,197 @@
 import asyncio
 import datetime
-import gc
+import functools
 import hashlib
+import multiprocessing
+import os
 import re
 import time
 import uuid
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import aclosing
 from decimal import Decimal
-from typing import Any
 
 import orjson
-from loguru import logger
 from pydantic import validate_email
 from tenacity import retry, stop_after_attempt, wait_fixed
 
 from crowdgit.database.crud import (
     batch_check_parent_activities,
     batch_insert_activities,
+    save_processing_checkpoint,
     save_service_execution,
 )
 from crowdgit.enums import (
+    CommitStatsMode,
     DataSinkWorkerQueueMessageType,
     ErrorCode,
     ExecutionStatus,
-    IntegrationResultState,
     IntegrationResultType,
     OperationType,
+    TrailerExtractionMode,
 )
 from crowdgit.errors import CrowdGitError
-from crowdgit.models import CloneBatchInfo, Repository, ServiceExecution
+from crowdgit.models import (
+    ActivityRecord,
+    CloneBatchInfo,
+    ProcessingCheckpoint,
+    Repository,
+    ServiceExecution,
+)
 from crowdgit.services.base.base_service import BaseService
-from crowdgit.services.commit.activitymap import ActivityMap
+from crowdgit.services.commit import git_log_parser
+from crowdgit.services.commit.activitymap import ActivityTypes
+from crowdgit.services.commit.chunk_controller import ChunkController
+from crowdgit.services.commit.commit_record import CommitRecord
+from crowdgit.services.commit.git_log_parser import (
+    GIT_LOG_FORMAT,
+    GIT_LOG_TRAILERS_FORMAT,
+    TRAILER_SEPARATOR,
+    GitLogParser,
+    GitLogRecord,
+    decode_ascii_field,
+    decode_field,
+    is_merge_commit,
+    parse_numstats,
+    parse_shortstat,
+    parse_shortstat_log,
+)
+from crowdgit.services.commit.git_log_shards import SpooledOutput, split_shards
 from crowdgit.services.queue.queue_service import QueueService
-from crowdgit.services.utils import get_default_branch, run_shell_command
-from crowdgit.settings import DEFAULT_TENANT_ID
+from crowdgit.services.utils import (
+    get_default_branch,
+    run_shell_command,
+    stream_shell_command,
+)
+from crowdgit.settings import (
+    COMMIT_BUILD_CONCURRENCY,
+    COMMIT_CHUNK_LATENCY_TARGET_SEC,
+    COMMIT_DB_SINK_CONCURRENCY,
+    COMMIT_FILTER_CONCURRENCY,
+    COMMIT_GIT_LOG_SHARDS,
+    COMMIT_KAFKA_SINK_CONCURRENCY,
+    COMMIT_MAX_CHUNK_SIZE,
+    COMMIT_MAX_IN_FLIGHT_CHUNKS,
+    COMMIT_MEMBER_CACHE_SIZE,
+    COMMIT_MIN_CHUNK_SIZE,
+    COMMIT_PIPELINE_MEMORY_LIMIT_MB,
+    COMMIT_PIPELINE_QUEUE_SIZE,
+    COMMIT_PROCESSING_CHECKPOINTS,
+    COMMIT_PROCESSING_WORKERS,
+    COMMIT_TRAILER_EXTRACTION_MODE,
+    DEFAULT_TENANT_ID,
+    DETERMINISTIC_RESULT_IDS,
+)
 
 
 class CommitService(BaseService):
     """Service for processing repository commits"""
 
-    COMMIT_START_SPLITTER = "---CROWD_COMMIT_START---"
-    NUMSTAT_SPLITTER = "---CROWD_NUMSTAT_START---"
-    MIN_COMMIT_FIELDS = 8
     DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
     FUTURE_DATE_THRESHOLD_DAYS = 1
 
     # Pre-compiled regex patterns for better performance
     _COMMIT_HASH_PATTERN = re.compile(r"^[0-9a-f]{40}$")
-    _ACTIVITY_PATTERN = re.compile(r"([^:]*):\s*(.*?)\s+<{1,2}([^>]+)>+$")
+    # Trailer value after the "<key>:" prefix, a name followed by an email in angle brackets
+    _TRAILER_VALUE_PATTERN = re.compile(r"\s*(.*?)\s+<{1,2}([^>]+)>+$")
+    _REVIEWED_BY_PATTERN = re.compile(r"(?i)Reviewed[- ]by:")
+    _FROM_PATTERN = re.compile(r"(?i)from:")
+    _CC_PATTERN = re.compile(r"(?i)cc:.*")
 
     # Common strings to avoid repeated string operations
     _GIT_PLATFORM = "git"
     _USERNAME_TYPE = "username"
     _EMAIL_TYPE = "email"
-
-    MAX_CHUNK_SIZE = 250
-
-    def __init__(self, queue_service: QueueService):
+    # Namespace of the deterministic integration result ids (uuid5)
+    _RESULT_ID_NAMESPACE = uuid.UUID("5d1e3a8c-2f4b-4c6a-9b7e-0a1c3e5f7d92")
+
+    # Chunk size and chunks written at once when processing starts, adapted to the repository
+    # and database speed by ChunkController within the configured bounds
+    INITIAL_CHUNK_SIZE = 250
+    MIN_CHUNK_SIZE = COMMIT_MIN_CHUNK_SIZE
+    MAX_CHUNK_SIZE = COMMIT_MAX_CHUNK_SIZE
+    INITIAL_IN_FLIGHT_CHUNKS = 2
+    # Max chunks waiting in each pipeline stage queue
+    PIPELINE_QUEUE_SIZE = COMMIT_PIPELINE_QUEUE_SIZE
+    # Smaller histories are read by a single git log
+    MIN_SHARD_COMMITS = 5000
+
+    # git log diff options of each commit stats mode
+    _STATS_MODE_OPTIONS = {
+        CommitStatsMode.NUMSTAT: ["--cc", "--numstat"],
+        CommitStatsMode.NO_RENAMES: ["--cc", "--numstat", "--no-renames"],
+        CommitStatsMode.SHORTSTAT: ["--cc", "--shortstat"],
+        CommitStatsMode.FIRST_PARENT: ["--numstat", "--diff-merges=first-parent"],
+        CommitStatsMode.DEFERRED: [],
+        CommitStatsMode.NONE: [],
+    }
+
+    def __init__(
+        self, queue_service: QueueService, processing_workers: int = COMMIT_PROCESSING_WORKERS
+    ):
         super().__init__()
         self.queue_service = queue_service
         # Metrics tracking for current repository
         self._metrics_context = None
+        # Chunking adapted over all the batches of the current repository
+        self._chunk_controller: ChunkController | None = None
+        # Worker processes building activities from commits, 0 builds them in the event loop
+        self.processing_workers = processing_workers
+        self._process_pool: ProcessPoolExecutor | None = None
+        # Workers of each commit processing pipeline stage
+        self.stage_concurrency = {
+            "build": COMMIT_BUILD_CONCURRENCY,
+            "filter": COMMIT_FILTER_CONCURRENCY,
+            "db": COMMIT_DB_SINK_CONCURRENCY,
+            "kafka": COMMIT_KAFKA_SINK_CONCURRENCY,
+        }
+        # Commit message lines matched against ActivityMap trailers
+        self.trailer_extraction_mode = TrailerExtractionMode(COMMIT_TRAILER_EXTRACTION_MODE)
+        # Result ids derived from the activities, replayed activities are not saved again
+        self.deterministic_result_ids = DETERMINISTIC_RESULT_IDS
+        # Save full clone processing progress, so interrupted processing resumes from it
+        self.processing_checkpoints = COMMIT_PROCESSING_CHECKPOINTS
+        # Concurrent git log processes, one per available CPU at most
+        available_cpus = (
+            len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+        )
+        self.git_log_shards = max(min(COMMIT_GIT_LOG_SHARDS, available_cpus or 1), 1)
+        # A few thousand people author most commits and trailers of a repository, their
+        # members and email validity are computed once per (name, email)
+        self._get_member = functools.lru_cache(maxsize=COMMIT_MEMBER_CACHE_SIZE)(
+            self._build_member
+        )
+        self._is_valid_email = functools.lru_cache(maxsize=COMMIT_MEMBER_CACHE_SIZE)(
+            self._is_valid_email
+        )
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Lazily create the process pool used to build activities from commit chunks"""
+        if self._process_pool is None:
+            self.logger.info(
+                f"Starting commit processing pool with {self.processing_workers} workers"
+            )
+            # spawn avoids forking the running event loop and its open connections
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.processing_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._process_pool
+
+    def shutdown(self) -> None:
+        """Stop the commit processing pool, if it was started"""
+        if self._process_pool is not None:
+            self.logger.info("Shutting down commit processing pool...")
+            self._process_pool.shutdown(wait=True, cancel_futures=True)
+            self._process_pool = None
 
     @property
     def git_log_format(self) -> str:
-        """Git log format string with commit splitter"""
-        return f"{self.COMMIT_START_SPLITTER}%n%H%n%aI%n%an%n%ae%n%cI%n%cn%n%ce%n%P%n%d%n%B%n{self.NUMSTAT_SPLITTER}"
+        """Git log format string with NUL-terminated fields (see git_log_parser)"""
+        if self.trailer_extraction_mode == TrailerExtractionMode.TRAILERS:
+            return GIT_LOG_TRAILERS_FORMAT
+        return GIT_LOG_FORMAT
 
     def is_valid_commit_hash(self, commit_hash: str) -> bool:
         """Check if the given commit hash is valid.
@@ -90,11 +217,24 @@ class CommitService(BaseService):
         >>> is_valid_datetime("2021-09-01 10:20:30+00:00")
         False
         """
+        return self._parse_datetime(commit_datetime) is not None
+
+    def _parse_datetime(self, value: str) -> datetime.datetime | None:
+        """
+        Parse a DATETIME_FORMAT datetime string, None if it is invalid.
+
+        git prints strict ISO 8601 dates (e.g. 2021-09-01T10:20:30+02:00), which are parsed with
+        the much faster fromisoformat. Anything else goes through strptime.
+        """
+        if len(value) == 25 and value[10] == "T" and value[19] in "+-":
+            try:
+                return datetime.datetime.fromisoformat(value)
+            except ValueError:
+                return None
         try:
-            time.strptime(commit_datetime, self.DATETIME_FORMAT)
-            return True
+            return datetime.datetime.strptime(value, self.DATETIME_FORMAT)
         except ValueError:
-            return False
+            return None
 
     async def process_single_batch_commits(
         self,
@@ -121,23 +261,50 @@ class CommitService(BaseService):
                 "bad_commits": 0,
                 "skipped_activities": 0,
                 "total_activities": 0,
+                # Activities already in integration.results, with deterministic result ids
+                "replayed_activities": 0,
+                # Max number of chunks waiting in each pipeline stage queue
+                "max_queue_depth": {},
+                "member_cache_hits": 0,
+                "member_cache_lookups": 0,
             }
+            self._get_member.cache_clear()
+            self._is_valid_email.cache_clear()
+            self._chunk_controller = ChunkController(
+                initial_chunk_size=self.INITIAL_CHUNK_SIZE,
+                min_chunk_size=self.MIN_CHUNK_SIZE,
+                max_chunk_size=self.MAX_CHUNK_SIZE,
+                initial_in_flight=self.INITIAL_IN_FLIGHT_CHUNKS,
+                max_in_flight=COMMIT_MAX_IN_FLIGHT_CHUNKS,
+                latency_target_sec=COMMIT_CHUNK_LATENCY_TARGET_SEC,
+                memory_limit_bytes=COMMIT_PIPELINE_MEMORY_LIMIT_MB * 1024 * 1024,
+            )
 
         batch_start_time = time.time()
 
         try:
             self.logger.info(
-                f"Starting commits processing for new batch having commits older than {batch_info.prev_batch_edge_commit}"
+                f"Starting commits processing for new batch having commits older than {batch_info.prev_batch_edge_commit} (stats mode: {repository.commit_stats_mode.value})"
             )
-            raw_commits = await self._execute_git_log(
+            checkpoint = None
+            if not batch_info.clone_with_batches:
+                checkpoint = await self._get_processing_checkpoint(
+                    batch_info.repo_path, batch_info.checkpoint, repository.parent_repo
+                )
+            commit_records = self._execute_git_log(
                 batch_info.repo_path,
                 batch_info.clone_with_batches,
                 batch_info.prev_batch_edge_commit,
                 batch_info.edge_commit,
                 repository.last_processed_commit,
+                repository.commit_stats_mode,
+                repository.parent_repo,
+                checkpoint,
             )
 
-            await self._process_activities_from_commits(raw_commits, batch_info, repository)
+            await self._process_activities_from_commits(
+                commit_records, batch_info, repository, checkpoint
+            )
 
             batch_end_time = time.time()
             batch_time = round(batch_end_time - batch_start_time, 2)
@@ -158,17 +325,12 @@ class CommitService(BaseService):
                     execution_time_sec=Decimal(
                         str(round(self._metrics_context["total_execution_time"], 2))
                     ),
-                    metrics={
-                        "total_commits": self._metrics_context["total_commits"],
-                        "processed_commits": self._metrics_context["processed_commits"],
-                        "bad_commits": self._metrics_context["bad_commits"],
-                        "skipped_activities": self._metrics_context["skipped_activities"],
-                        "total_activities": self._metrics_context["total_activities"],
-                    },
+                    metrics=self._get_execution_metrics(),
                 )
                 await save_service_execution(service_execution)
                 # Reset metrics context after saving
                 self._metrics_context = None
+                self._chunk_controller = None
 
         except Exception as e:
             # Update metrics context with error info
@@ -195,19 +357,32 @@ class CommitService(BaseService):
                 execution_time_sec=Decimal(
                     str(round(self._metrics_context["total_execution_time"], 2))
                 ),
-                metrics={
-                    "total_commits": self._metrics_context["total_commits"],
-                    "processed_commits": self._metrics_context["processed_commits"],
-                    "bad_commits": self._metrics_context["bad_commits"],
-                    "skipped_activities": self._metrics_context["skipped_activities"],
-                    "total_activities": self._metrics_context["total_activities"],
-                },
+                metrics=self._get_execution_metrics(),
             )
             await save_service_execution(service_execution)
             # Reset metrics context after saving
             self._metrics_context = None
+            self._chunk_controller = None
             raise
 
+    def _get_execution_metrics(self) -> dict:
+        """Commit processing metrics saved with the service execution"""
+        return {
+            "total_commits": self._metrics_context["total_commits"],
+            "processed_commits": self._metrics_context["processed_commits"],
+            "bad_commits": self._metrics_context["bad_commits"],
+            "skipped_activities": self._metrics_context["skipped_activities"],
+            "total_activities": self._metrics_context["total_activities"],
+            "replayed_activities": self._metrics_context["replayed_activities"],
+            "max_queue_depth": self._metrics_context["max_queue_depth"],
+            "chunking": self._chunk_controller.get_metrics(),
+            "member_cache_hit_rate": round(
+                self._metrics_context["member_cache_hits"]
+                / max(self._metrics_context["member_cache_lookups"], 1),
+                3,
+            ),
+        }
+
     async def _get_commit_reference(self, repo_path: str) -> str:
         """Get the commit reference for git log command."""
         default_branch = await get_default_branch(repo_path)
@@ -215,40 +390,125 @@ class CommitService(BaseService):
             return "HEAD"
         return f"origin/{default_branch}"
 
-    def _build_git_log_command(self, repo_path: str, commit_range: str) -> list[str]:
-        """Build git log commands for commits and numstats."""
+    def _build_git_log_revisions(
+        self, commit_range: str, excluded_commit: str | None = None, skip: int = 0
+    ) -> list[str]:
+        """Build the git log / git rev-list arguments selecting the commits to process."""
+        return [
+            commit_range,
+            *([f"^{excluded_commit}"] if excluded_commit else []),
+            *([f"--skip={skip}"] if skip else []),
+        ]
+
+    def _build_git_log_command(
+        self,
+        repo_path: str,
+        revisions: list[str],
+        stats_mode: CommitStatsMode = CommitStatsMode.NUMSTAT,
+    ) -> list[str]:
+        """Build git log commands for commits and their stats."""
         return [
             "git",
             "-C",
             repo_path,
             "log",
-            commit_range,
-            "--cc",
-            "--numstat",
+            *revisions,
+            *self._STATS_MODE_OPTIONS[stats_mode],
             f"--pretty=format:{self.git_log_format}",
         ]
 
-    def _parse_numstats(self, raw_numstats: str) -> tuple[int, int]:
+    async def _get_parent_snapshot_commit(
+        self, repo_path: str, commit_reference: str, parent_repo: Repository | None
+    ) -> str | None:
         """
-        Parse raw numstats into -> (insertions, deletions).
+        Get the parent repo last processed commit, to skip fork commits already processed there.
 
-        Args:
-            raw_numstats: Raw output from git log --numstat --pretty=format:%H
-
-        Returns:
-            (insertions, deletions) tuple
+        The commit is fetched from the parent repository when the fork clone doesn't have it, and
+        is only used if it shares history with the fork (has a merge-base with it). Commits
+        reachable from it were processed as parent activities, so git log can exclude them
+        instead of building their activities and filtering them out in the database. Returns
+        None when the commit can't be used, every activity is then filtered in the database.
         """
-        insertions_deletions = raw_numstats.strip().splitlines()
-        insertions = 0
-        deletions = 0
+        if not parent_repo or not parent_repo.last_processed_commit:
+            return None
+        parent_commit = parent_repo.last_processed_commit
+        if not self.is_valid_commit_hash(parent_commit):
+            return None
 
-        for line in insertions_deletions:
-            match = re.match(r"^(\d+)\s+(\d+)", line)
-            if match:
-                insertions += int(match.group(1))
-                deletions += int(match.group(2))
+        try:
+            try:
+                await run_shell_command(
+                    ["git", "cat-file", "-e", f"{parent_commit}^{{commit}}"], cwd=repo_path
+                )
+            except Exception:
+                self.logger.info(f"Fetching parent repo last processed commit {parent_commit}")
+                await run_shell_command(
+                    [
+                        "git",
+                        "fetch",
+                        "--no-tags",
+                        parent_repo.url.removesuffix(".git"),
+                        parent_commit,
+                    ],
+                    cwd=repo_path,
+                )
+            merge_base = await run_shell_command(
+                ["git", "merge-base", commit_reference, parent_commit], cwd=repo_path
+            )
+        except Exception as e:
+            self.logger.warning(
+                f"Can't use parent repo last processed commit {parent_commit}, "
+                f"filtering parent activities in database only: {repr(e)}"
+            )
+            return None
 
-        return (insertions, deletions)
+        self.logger.info(
+            f"Skipping commits reachable from parent repo commit {parent_commit} "
+            f"(merge-base {merge_base.strip()})"
+        )
+        return parent_commit
+
+    async def _get_processing_checkpoint(
+        self,
+        repo_path: str,
+        resumed_checkpoint: ProcessingCheckpoint | None,
+        parent_repo: Repository | None = None,
+    ) -> ProcessingCheckpoint:
+        """
+        Get the checkpoint a full clone processing starts from, and saves its progress into.
+
+        A resumed checkpoint is used as it is when its excluded parent repo commit can still be
+        excluded, otherwise its head commit history is processed from the start. A new one
+        starts at the cloned branch head.
+        """
+        if resumed_checkpoint:
+            excluded_commit = None
+            if resumed_checkpoint.excluded_commit and parent_repo:
+                excluded_commit = await self._get_parent_snapshot_commit(
+                    repo_path,
+                    resumed_checkpoint.head_commit,
+                    parent_repo.model_copy(
+                        update={"last_processed_commit": resumed_checkpoint.excluded_commit}
+                    ),
+                )
+            if excluded_commit == resumed_checkpoint.excluded_commit:
+                return resumed_checkpoint.model_copy()
+            # A different git log lists commits in a different order, its progress is unknown
+            self.logger.warning(
+                f"Can't exclude checkpoint parent repo commit {resumed_checkpoint.excluded_commit}, "
+                f"processing {resumed_checkpoint.head_commit} history from the start"
+            )
+            return ProcessingCheckpoint(head_commit=resumed_checkpoint.head_commit)
+
+        commit_reference = await self._get_commit_reference(repo_path)
+        head_commit = (
+            await run_shell_command(["git", "rev-parse", commit_reference], cwd=repo_path)
+        ).strip()
+        # Fork onboarding: skip the history shared with the parent repo
+        excluded_commit = await self._get_parent_snapshot_commit(
+            repo_path, commit_reference, parent_repo
+        )
+        return ProcessingCheckpoint(head_commit=head_commit, excluded_commit=excluded_commit)
 
     async def _get_optimized_commit_range(
         self,
@@ -293,32 +553,36 @@ class CommitService(BaseService):
         wait=wait_fixed(1),
         reraise=True,
     )
-    async def _execute_git_log(
+    async def _get_git_log_revisions(
         self,
         repo_path: str,
         clone_with_batches: bool,
         prev_batch_edge_commit: str | None = None,
         edge_commit: str | None = None,
         last_processed_commit: str | None = None,
-    ) -> str:
-        """Execute git log command and return raw output."""
+        stats_mode: CommitStatsMode = CommitStatsMode.NUMSTAT,
+        parent_repo: Repository | None = None,
+        checkpoint: ProcessingCheckpoint | None = None,
+    ) -> list[str] | None:
+        """Build the git log revisions of the batch, or None if there is nothing to process."""
         # Ensure abbreviated commits are disabled
         await run_shell_command(
             ["git", "-C", repo_path, "config", "core.abbrevCommit", "false"], cwd=repo_path
         )
 
-        self.logger.info("Running git log commands...")
-
         if not clone_with_batches:
-            commit_reference = await self._get_commit_reference(repo_path)
+            if checkpoint is None:
+                checkpoint = await self._get_processing_checkpoint(repo_path, None, parent_repo)
             self.logger.info(
-                f"Full repo cloned in single batch, getting all commits in {commit_reference}"
+                f"Full repo cloned in single batch, getting all commits in "
+                f"{checkpoint.head_commit} after the first {checkpoint.emitted_commits}"
+            )
+            return self._build_git_log_revisions(
+                checkpoint.head_commit, checkpoint.excluded_commit, checkpoint.emitted_commits
             )
-            raw_commits_cmd = self._build_git_log_command(repo_path, commit_reference)
-            return await run_shell_command(raw_commits_cmd)
 
         if not prev_batch_edge_commit:
-            return ""
+            return None
 
         if edge_commit:
             commit_range = await self._get_optimized_commit_range(
@@ -330,28 +594,158 @@ class CommitService(BaseService):
             commit_range = prev_batch_edge_commit
             self.logger.info(f"Processing final batch from: {prev_batch_edge_commit} to root")
 
-        raw_commits_cmd = self._build_git_log_command(repo_path, commit_range)
-
         self.logger.info(f"Executing git log for range: {commit_range}")
-        return await run_shell_command(raw_commits_cmd)
+        return self._build_git_log_revisions(commit_range)
+
+    async def _execute_git_log(
+        self,
+        repo_path: str,
+        clone_with_batches: bool,
+        prev_batch_edge_commit: str | None = None,
+        edge_commit: str | None = None,
+        last_processed_commit: str | None = None,
+        stats_mode: CommitStatsMode = CommitStatsMode.NUMSTAT,
+        parent_repo: Repository | None = None,
+        checkpoint: ProcessingCheckpoint | None = None,
+    ) -> AsyncIterator[GitLogRecord]:
+        """
+        Execute git log command and yield commit records as git produces them.
+
+        The output is streamed instead of buffered, so memory usage doesn't grow with the
+        repository history size. Records are memoryviews over the raw output (see
+        git_log_parser), only the fields used in activities are decoded later on.
 
-    def should_skip_commit(self, raw_commit: str | None, edge_commit: str | None) -> bool:
+        Large histories are read by git_log_shards concurrent git logs when configured.
+        """
+        revisions = await self._get_git_log_revisions(
+            repo_path,
+            clone_with_batches,
+            prev_batch_edge_commit,
+            edge_commit,
+            last_processed_commit,
+            stats_mode,
+            parent_repo,
+            checkpoint,
+        )
+        if revisions is None:
+            return
+
+        if self.git_log_shards > 1:
+            commit_hashes = (
+                await run_shell_command(
+                    ["git", "-C", repo_path, "rev-list", *revisions], cwd=repo_path
+                )
+            ).split()
+            if len(commit_hashes) >= 2 * self.MIN_SHARD_COMMITS:
+                shards = split_shards(
+                    commit_hashes,
+                    min(self.git_log_shards, len(commit_hashes) // self.MIN_SHARD_COMMITS),
+                )
+                del commit_hashes
+                async with aclosing(
+                    self._execute_sharded_git_log(repo_path, shards, stats_mode)
+                ) as records:
+                    async for record in records:
+                        yield record
+                return
+
+        self.logger.info("Running git log commands...")
+        raw_commits_cmd = self._build_git_log_command(repo_path, revisions, stats_mode)
+        parser = GitLogParser()
+        async with aclosing(stream_shell_command(raw_commits_cmd)) as raw_output:
+            async for block in raw_output:
+                for record in parser.feed(block):
+                    yield record
+        for record in parser.close():
+            yield record
+
+    async def _execute_sharded_git_log(
+        self, repo_path: str, shards: list[list[str]], stats_mode: CommitStatsMode
+    ) -> AsyncIterator[GitLogRecord]:
+        """
+        Run one git log per shard of commits concurrently, and yield their records in order.
+
+        Every git log starts at once, the output of the shards not consumed yet is spooled to
+        temporary files next to the repository (see git_log_shards).
+        """
+        self.logger.info(
+            f"Running {len(shards)} git log commands over {sum(map(len, shards))} commits..."
+        )
+        shard_cmd = self._build_git_log_command(
+            repo_path, ["--no-walk=unsorted", "--stdin"], stats_mode
+        )
+        spool_dir = os.path.dirname(os.path.abspath(repo_path))
+        outputs = [
+            SpooledOutput(
+                stream_shell_command(
+                    shard_cmd, input_data="\n".join(shard).encode("ascii") + b"\n"
+                ),
+                spool_dir,
+            )
+            for shard in shards
+        ]
+        try:
+            for output in outputs:
+                parser = GitLogParser()
+                async with aclosing(output.read()) as raw_output:
+                    async for block in raw_output:
+                        for record in parser.feed(block):
+                            yield record
+                for record in parser.close():
+                    yield record
+                await output.close()
+        finally:
+            for output in outputs:
+                await output.close()
+
+    async def _get_deferred_commit_stats(
+        self, repo_path: str, commit_hashes: list[str]
+    ) -> dict[str, tuple[int, int]]:
+        """
+        Compute insertions/deletions of the given commits (CommitStatsMode.DEFERRED).
+
+        Runs a single git log over just these commits with --shortstat, so the diffs of a chunk
+        are computed while the main git log keeps listing commits.
+        """
+        if not commit_hashes:
+            return {}
+        output = await run_shell_command(
+            [
+                "git",
+                "-C",
+                repo_path,
+                "log",
+                "--no-walk=unsorted",
+                "--stdin",
+                *self._STATS_MODE_OPTIONS[CommitStatsMode.SHORTSTAT],
+                "--format=%H%x00",
+            ],
+            cwd=repo_path,
+            input_text="\n".join(commit_hashes),
+        )
+        return parse_shortstat_log(output.encode())
+
+    def should_skip_commit(self, commit_hash: str | None, edge_commit: str | None) -> bool:
         """Check if commit should be skipped based on edge commit comparison."""
         # Only skip the boundary commit of the current shallow clone.
-        return not raw_commit or (edge_commit and raw_commit.startswith(edge_commit))
+        return not commit_hash or (edge_commit and commit_hash.startswith(edge_commit))
 
     def clean_up_username(self, name: str):
-        name = re.sub(r"(?i)Reviewed[- ]by:", "", name)
-        name = re.sub(r"(?i)from:", "", name)
-        name = re.sub(r"(?i)cc:.*", "", name).strip()
+        # Every pattern contains a colon, most names don't
+        if ":" not in name:
+            return name.strip()
+        name = self._REVIEWED_BY_PATTERN.sub("", name)
+        name = self._FROM_PATTERN.sub("", name)
+        name = self._CC_PATTERN.sub("", name).strip()
         return name.strip()
 
     def create_activity(
         self,
         remote: str,
-        commit: dict,
+        commit: CommitRecord,
         activity_type: str,
-        member: dict,
+        display_name: str,
+        email: str,
         source_id: str,
         segment_id: str,
         re_onboarding_count: int,
@@ -362,9 +756,10 @@ class CommitService(BaseService):
 
         Args:
             remote: The remote repository URL
-            commit: The commit dictionary
+            commit: The parsed commit record
             activity_type: Type of activity
-            member: Member information dictionary
+            display_name: Member display name, falls back to the email local part when empty
+            email: Member email, also used as its git username
             source_id: Source ID for the activity
             segment_id: Segment identifier
             re_onboarding_count: Number of times the repository has been re-onboarded.
@@ -374,51 +769,16 @@ class CommitService(BaseService):
         Returns:
             Activity dictionary
         """
-        # Pre-calculate timestamp to avoid repeated lookups
-        timestamp = (
-            commit["author_datetime"] if source_parent_id == "" else commit["committer_datetime"]
-        )
-        dt = datetime.datetime.fromisoformat(timestamp)
-
-        # Pre-calculate common values
-        emails = member["emails"]
-        primary_email = emails[0]
-
-        # Optimize member processing by creating a new dict instead of modifying the input
-        processed_member = {}
-
-        # Handle username and displayName with fallbacks
-        display_name = member.get("displayName") or primary_email.split("@")[0]
-
-        # Clean up names once
-        processed_member["displayName"] = self.clean_up_username(display_name)
-
-        # Build identities list more efficiently
-        identities = [
-            {
-                "platform": self._GIT_PLATFORM,
-                "value": primary_email,
-                "type": self._USERNAME_TYPE,
-                "verified": True,
-            }
-        ]
-
-        # Add email identities
-        for email in emails:
-            identities.append(
-                {
-                    "platform": self._GIT_PLATFORM,
-                    "value": email,
-                    "type": self._EMAIL_TYPE,
-                    "verified": False,
-                }
-            )
-
-        processed_member["identities"] = identities
+        # Authored activities use the author datetime, every other one the committer datetime
+        if source_parent_id == "":
+            timestamp = commit.author_datetime
+            timezone = commit.author_timezone
+        else:
+            timestamp = commit.committer_datetime
+            timezone = commit.committer_timezone
 
-        # Pre-calculate commit attributes to avoid repeated lookups
-        insertions = commit.get("insertions", 0)
-        deletions = commit.get("deletions", 0)
+        insertions = commit.insertions
+        deletions = commit.deletions
         activity = {
             "type": activity_type,
             "timestamp": timestamp,
@@ -426,137 +786,197 @@ class CommitService(BaseService):
             "sourceParentId": source_parent_id,
             "platform": self._GIT_PLATFORM,
             "channel": remote,
-            "body": "\n".join(commit["message"]),
+            "body": commit.body,
             "attributes": {
                 "insertions": insertions,
-                "timezone": dt.tzname(),
+                "timezone": timezone,
                 "deletions": deletions,
                 "lines": insertions - deletions,
-                "isMerge": commit["is_merge_commit"],
+                "isMerge": commit.is_merge_commit,
                 "isMainBranch": True,
             },
             "url": remote,
-            "member": processed_member,
+            "member": self._get_member(display_name, email),
             "segmentId": segment_id,
         }
         if re_onboarding_count > 0:
             activity["attributes"]["cycle"] = f"onboarding-{re_onboarding_count}"
         return activity
 
-    def extract_activities(self, commit_message: list[str]) -> list[dict[str, dict[str, str]]]:
+    def _build_member(self, display_name: str, email: str) -> orjson.Fragment:
+        """
+        Build the activity member of a (name, email), serialized as it's embedded as is in every
+        activity of this person.
         """
-        Extract activities from the commit message and return a list of activities.
-        Each activity in the list includes the activity and the person who made it,
-        which in turn includes the name and the email.
+        member = {
+            "displayName": self.clean_up_username(display_name or email.split("@")[0]),
+            "identities": [
+                {
+                    "platform": self._GIT_PLATFORM,
+                    "value": email,
+                    "type": self._USERNAME_TYPE,
+                    "verified": True,
+                },
+                {
+                    "platform": self._GIT_PLATFORM,
+                    "value": email,
+                    "type": self._EMAIL_TYPE,
+                    "verified": False,
+                },
+            ],
+        }
+        # Cached, so keep an exact-size copy of the over-allocated orjson output buffer
+        return orjson.Fragment(memoryview(orjson.dumps(member)).tobytes())
+
+    def get_member_cache_stats(self) -> tuple[int, int]:
+        """Member and email validity caches -> (hits, lookups)"""
+        member_info = self._get_member.cache_info()
+        email_info = self._is_valid_email.cache_info()
+        hits = member_info.hits + email_info.hits
+        return hits, hits + member_info.misses + email_info.misses
+
+    def extract_activities(self, commit_message: list[str]) -> list[tuple[str, str, str]]:
+        """
+        Extract the activities of the trailers in the commit message lines.
+
+        Lines are only matched against the trailer pattern once their key (the text before the
+        first colon) is known to be an ActivityMap trailer, which rules out most message lines
+        without running the regex.
 
         :param commit_message: A list of strings, where each string is a line of the commit message.
-        :return: A list of dictionaries containing activities and the person who made them.
+        :return: A list of (activity type, name, email) tuples.
 
         >>> extract_activities([
         ...     "Signed-off-by: Arnd Bergmann <arnd@arndb.de>",
-        ...     "reported-by: Guenter Roeck <linux@roeck-us.net>"
-        ... ]) == [{'Signed-off-by': {'email': 'arnd@arndb.de', 'name': 'Arnd Bergmann'}},
-        ...        {'Reported-by': {'email': 'linux@roeck-us.net', 'name': 'Guenter Roeck'}}]
+        ...     "reported-by: Guenter Roeck <linux@roeck-us.net>",
+        ...     "Link: https://lore.kernel.org/r/1@example.com",
+        ... ]) == [("signed-off-commit", "Arnd Bergmann", "arnd@arndb.de"),
+        ...        ("reported-commit", "Guenter Roeck", "linux@roeck-us.net")]
         True
         """
         activities = []
 
         for line in commit_message:
-            match = self._ACTIVITY_PATTERN.match(line)
+            # Trailers end with the email closing bracket
+            if not line.endswith(">"):
+                continue
+            separator = line.find(":")
+            if separator == -1:
+                continue
+            activity_types = ActivityTypes.get(line[:separator].strip().lower())
+            if activity_types is None:
+                continue
+            match = self._TRAILER_VALUE_PATTERN.match(line, separator + 1)
             if match:
-                activity_name, name, email = match.groups()
-                activity_name = activity_name.strip().lower()
-                if activity_name in ActivityMap:
-                    name = name.strip()
-                    email = email.strip()
-                    for activity in ActivityMap[activity_name]:
-                        activities.append({activity: {"name": name, "email": email}})
+                name = match.group(1).strip()
+                email = match.group(2).strip()
+                for activity_type in activity_types:
+                    activities.append((activity_type, name, email))
         return activities
 
     def prepare_activity_for_db_and_queue(
-        self, activity: dict, segment_id: str, integration_id: str
-    ) -> tuple[tuple, dict]:
+        self,
+        activity: dict,
+        segment_id: str,
+        integration_id: str,
+        re_onboarding_count: int = 0,
+        deterministic_id: bool = False,
+    ) -> ActivityRecord:
+        """
+        Serialize an activity once into its integration result and queue message.
+
+        With deterministic_id, the result id is derived from the activity (integration, sourceId,
+        type and onboarding cycle) instead of being random, so the same activity gets the same
+        integration result when a chunk or repository is processed again.
+        """
         activity["segmentId"] = segment_id
-        result_id = str(uuid.uuid1())
+        if deterministic_id:
+            result_id = str(
+                uuid.uuid5(
+                    self._RESULT_ID_NAMESPACE,
+                    f"{integration_id}:{activity['sourceId']}:{activity['type']}:"
+                    f"{re_onboarding_count}",
+                )
+            )
+        else:
+            result_id = str(uuid.uuid1())
 
         data_dict = {
             "type": IntegrationResultType.ACTIVITY,
             "data": activity,
         }
-        activity_db = (
-            result_id,
-            IntegrationResultState.PENDING,
-            orjson.dumps(data_dict).decode(),
-            DEFAULT_TENANT_ID,
-            integration_id,
-        )
         operation = "upsert_activities_with_members"
-        activity_kafka = {
-            "message_id": f"{DEFAULT_TENANT_ID}-{operation}-{self._GIT_PLATFORM}-{result_id}",
-            "payload": orjson.dumps(
-                {
-                    "type": DataSinkWorkerQueueMessageType.PROCESS_INTEGRATION_RESULT,
-                    "tenantId": DEFAULT_TENANT_ID,
-                    "segmentId": segment_id,
-                    "integrationId": integration_id,
-                    "resultId": result_id,
-                }
-            ).decode(),
-        }
-        return activity_db, activity_kafka
+        message_id = f"{DEFAULT_TENANT_ID}-{operation}-{self._GIT_PLATFORM}-{result_id}"
+        return ActivityRecord(
+            result_id=result_id,
+            integration_id=integration_id,
+            # orjson output buffers are over-allocated (~4KiB), keep exact-size copies instead
+            data=memoryview(orjson.dumps(data_dict)).tobytes(),
+            kafka_key=message_id.encode("utf-8", errors="replace"),
+            kafka_value=memoryview(
+                orjson.dumps(
+                    {
+                        "type": DataSinkWorkerQueueMessageType.PROCESS_INTEGRATION_RESULT,
+                        "tenantId": DEFAULT_TENANT_ID,
+                        "segmentId": segment_id,
+                        "integrationId": integration_id,
+                        "resultId": result_id,
+                    }
+                )
+            ).tobytes(),
+            timestamp=activity["timestamp"],
+            type=activity["type"],
+            source_id=activity["sourceId"],
+        )
 
     def create_activities_from_commit(
         self,
         remote: str,
-        commit: dict[str, Any],
+        commit: CommitRecord,
         segment_id: str,
         integration_id: str,
         re_onboarding_count: int,
-    ) -> tuple[list[tuple], list[dict[str, Any]]]:
+        deterministic_ids: bool = False,
+    ) -> list[ActivityRecord]:
         """
         Create activities from a commit with improved efficiency.
 
         Args:
             remote: The remote repository URL
-            commit: The commit dictionary containing commit data
+            commit: The parsed commit record
             segment_id: Segment identifier
             integration_id: Integration identifier
             re_onboarding_count: Number of times the repository has been re-onboarded.
                 Used to set activity.attributes.cycle when > 0.
+            deterministic_ids: Derive result ids from the activities (see
+                prepare_activity_for_db_and_queue)
 
         Returns:
-            Tuple of (activities_db, activities_queue) lists
+            List of activity records
         """
-        activities_db = []
-        activities_queue = []
-        commit_hash = commit["hash"]
-
-        # Pre-calculate common values to avoid repeated lookups
-        author_name = commit["author_name"]
-        author_email = commit["author_email"]
-        committer_name = commit["committer_name"]
-        committer_email = commit["committer_email"]
+        activities = []
+        commit_hash = commit.hash
+        author_name = commit.author_name
+        author_email = commit.author_email
+        committer_name = commit.committer_name
+        committer_email = commit.committer_email
 
         # Create author activity
-        author = {
-            "username": author_name,
-            "displayName": author_name,
-            "emails": [author_email],
-        }
         activity = self.create_activity(
             remote=remote,
             commit=commit,
             activity_type="authored-commit",
-            member=author,
+            display_name=author_name,
+            email=author_email,
             source_id=commit_hash,
             segment_id=segment_id,
             re_onboarding_count=re_onboarding_count,
         )
-        activity_db, activity_kafka = self.prepare_activity_for_db_and_queue(
-            activity, segment_id, integration_id
+        activities.append(
+            self.prepare_activity_for_db_and_queue(
+                activity, segment_id, integration_id, re_onboarding_count, deterministic_ids
+            )
         )
-        activities_db.append(activity_db)
-        activities_queue.append(activity_kafka)
 
         # Only create committer activity if author and committer are different
         if author_name != committer_name or author_email != committer_email:
@@ -566,303 +986,465 @@ class CommitService(BaseService):
             hash_input = f"{commit_hash}commited-commit{committer_email}"
             committer_source_id = hashlib.sha1(hash_input.encode("utf-8")).hexdigest()
 
-            committer = {
-                "username": committer_name,
-                "displayName": committer_name,
-                "emails": [committer_email],
-            }
             activity = self.create_activity(
                 remote=remote,
                 commit=commit,
                 activity_type="committed-commit",
-                member=committer,
+                display_name=committer_name,
+                email=committer_email,
                 source_id=committer_source_id,
                 source_parent_id=commit_hash,
                 segment_id=segment_id,
                 re_onboarding_count=re_onboarding_count,
             )
-            activity_db, activity_kafka = self.prepare_activity_for_db_and_queue(
-                activity, segment_id, integration_id
+            activities.append(
+                self.prepare_activity_for_db_and_queue(
+                    activity, segment_id, integration_id, re_onboarding_count, deterministic_ids
+                )
             )
-            activities_db.append(activity_db)
-            activities_queue.append(activity_kafka)
 
         # Process extracted activities from commit message
-        extracted_activities = self.extract_activities(commit["message"])
-        for extracted_activity in extracted_activities:
-            activity_type, member_data = list(extracted_activity.items())[0]
-
-            # Convert activity type to lowercase and add "-commit" suffix
-            # This matches the legacy behavior: "signed-off-by" -> "signed-off-commit"
-            activity_type = activity_type.lower().replace("-by", "") + "-commit"
-
-            member = {
-                "username": member_data["email"],
-                "displayName": member_data["name"],
-                "emails": [member_data["email"]],
-            }
-
+        for activity_type, name, email in self.extract_activities(commit.trailer_lines):
             # Generate unique source ID for extracted activity
             source_id = hashlib.sha1(
-                (commit_hash + activity_type + member_data["email"]).encode("utf-8")
+                (commit_hash + activity_type + email).encode("utf-8")
             ).hexdigest()
             activity = self.create_activity(
                 remote=remote,
                 commit=commit,
                 activity_type=activity_type,
-                member=member,
+                display_name=name,
+                email=email,
                 source_id=source_id,
                 source_parent_id=commit_hash,
                 segment_id=segment_id,
                 re_onboarding_count=re_onboarding_count,
             )
-            activity_db, activity_kafka = self.prepare_activity_for_db_and_queue(
-                activity, segment_id, integration_id
+            activities.append(
+                self.prepare_activity_for_db_and_queue(
+                    activity, segment_id, integration_id, re_onboarding_count, deterministic_ids
+                )
             )
-            activities_db.append(activity_db)
-            activities_queue.append(activity_kafka)
 
-        return activities_db, activities_queue
+        return activities
 
     async def _filter_existing_activities(
         self,
-        activities_db: list[tuple],
-        activities_queue: list[dict],
+        activities: list[ActivityRecord],
         source_repo: Repository,
-    ) -> tuple[list[tuple], list[dict], int]:
+    ) -> tuple[list[ActivityRecord], int]:
         """
         Filter out activities that exist in specific repo, used for both forked and frequently reonboarded repos.
         Done in post-processing phase using batch lookup to avoid N+1 queries.
 
-        Returns: (filtered_activities_db, filtered_activities_queue, skipped_activities_count)
+        Returns: (filtered_activities, skipped_activities_count)
         """
-        if not activities_db:
-            return activities_db, activities_queue, 0
-
-        activity_keys = []
-        for act in activities_db:
-            data = orjson.loads(act[2])["data"]
-            activity_keys.append((data["timestamp"], data["type"], data["sourceId"]))
+        if not activities:
+            return activities, 0
 
         # Batch check which activities exist in parent repo
         parent_source_ids = await batch_check_parent_activities(
-            activity_keys,
+            [activity.dedup_key for activity in activities],
             source_repo.url,
             source_repo.segment_id,
         )
 
         if not parent_source_ids:
-            return activities_db, activities_queue, 0
+            return activities, 0
 
-        filtered_activities_db = []
-        filtered_activities_queue = []
-        skipped_activities_count = 0
-
-        for i, activity_tuple in enumerate(activities_db):
-            activity_data = orjson.loads(activity_tuple[2])
-            source_id = activity_data["data"]["sourceId"]
-
-            if source_id not in parent_source_ids:
-                # Activity doesn't exist in parent repo, keep it
-                filtered_activities_db.append(activity_tuple)
-                filtered_activities_queue.append(activities_queue[i])
-            else:
-                # Activity exists in parent repo, skip it
-                skipped_activities_count += 1
+        # Keep activities that don't exist in parent repo
+        filtered_activities = [
+            activity for activity in activities if activity.source_id not in parent_source_ids
+        ]
+        skipped_activities_count = len(activities) - len(filtered_activities)
 
         if skipped_activities_count > 0:
             self.logger.info(
                 f"Filtered out {skipped_activities_count} existing activity from {source_repo.url}"
             )
 
-        return filtered_activities_db, filtered_activities_queue, skipped_activities_count
+        return filtered_activities, skipped_activities_count
 
-    async def process_commits_chunk(
+    def build_activities_from_chunk(
         self,
-        commit_texts_chunk: list[str | None],
-        batch_info: CloneBatchInfo,
-        repository: Repository,
-    ) -> None:
+        commit_records_chunk: list[GitLogRecord],
+        edge_commit: str | None,
+        repo_path: str,
+        remote: str,
+        segment_id: str,
+        integration_id: str,
+        re_onboarding_count: int,
+        stats_mode: CommitStatsMode = CommitStatsMode.NUMSTAT,
+        deferred_stats: dict[str, tuple[int, int]] | None = None,
+        trailer_mode: TrailerExtractionMode = TrailerExtractionMode.MESSAGE,
+        deterministic_ids: bool = False,
+    ) -> tuple[list[ActivityRecord], int, int, tuple[int, int]]:
         """
-        Process a chunk of raw commit texts into activities and write them to DB and Kafka.
+        Parse a chunk of git log commit records and build their activities.
 
-        Args:
-            commit_texts_chunk: List of commit text strings to process
-            repo_path: Path to the repository
-            edge_commit_hash: Edge commit hash for filtering
-            remote: Remote repository URL
-            segment_id: Segment identifier
-            integration_id: Integration identifier
+        CPU-bound and free of I/O, so it can run either in the event loop or in a worker
+        process (see build_activities_in_worker). In CommitStatsMode.DEFERRED, commit stats
+        are read from deferred_stats instead of the records. In TrailerExtractionMode.TRAILERS,
+        trailers are only looked for in the trailers field of the records.
+
+        Returns:
+            (activities, processed_commits, bad_commits, (member_cache_hits, member_cache_lookups))
         """
-        activities_db = []
-        activities_queue = []
+        activities = []
         bad_commits = 0
         processed_commits = 0
-        commit = None
+        cache_hits, cache_lookups = self.get_member_cache_stats()
+        # Committer datetimes past this point are replaced by the author datetime
+        future_threshold = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
+            days=self.FUTURE_DATE_THRESHOLD_DAYS
+        )
 
-        for full_commit_text in commit_texts_chunk:
-            if self.should_skip_commit(full_commit_text, batch_info.edge_commit):
-                continue
-            commit_text, numstats_text = full_commit_text.split(self.NUMSTAT_SPLITTER)
-            commit_lines = commit_text.strip().splitlines()
-            del full_commit_text
-            del commit_text
-            if not self._validate_commit_structure(commit_lines):
+        for record in commit_records_chunk:
+            if not self._validate_commit_structure(record):
                 self.logger.warning(
-                    f"Invalid commit structure in {batch_info.repo_path}: {len(commit_lines)} fields"
+                    f"Invalid commit structure in {repo_path}: {len(record)} fields"
                 )
                 bad_commits += 1
-                del commit_lines
-                del numstats_text
+                continue
+            if self.should_skip_commit(
+                decode_ascii_field(record[git_log_parser.HASH]), edge_commit
+            ):
                 continue
 
             try:
-                commit = self._construct_commit_dict(commit_lines, numstats_text)
+                commit = self._construct_commit_record(
+                    record, future_threshold, stats_mode, deferred_stats, trailer_mode
+                )
                 if self._validate_commit_data(commit):
-                    activity_db_records, activity_kafka = self.create_activities_from_commit(
-                        batch_info.remote,
-                        commit,
-                        repository.segment_id,
-                        repository.integration_id,
-                        repository.re_onboarding_count,
+                    activities.extend(
+                        self.create_activities_from_commit(
+                            remote,
+                            commit,
+                            segment_id,
+                            integration_id,
+                            re_onboarding_count,
+                            deterministic_ids,
+                        )
                     )
-                    activities_db.extend(activity_db_records)
-                    activities_queue.extend(activity_kafka)
-                    del activity_db_records
-                    del activity_kafka
                     processed_commits += 1
                 else:
                     bad_commits += 1
 
             except Exception as e:
-                self.logger.warning(f"Failed to parse commit in {batch_info.repo_path}: {e}")
+                self.logger.warning(f"Failed to parse commit in {repo_path}: {e}")
                 bad_commits += 1
                 continue
-            finally:
-                del commit
-                del commit_lines
-                del numstats_text
-
-        # Filter out activities from parent repo (for forks)
-        skipped_activities = 0
-        if repository.parent_repo:
-            (
-                activities_db,
-                activities_queue,
-                skipped_activities,
-            ) = await self._filter_existing_activities(
-                activities_db, activities_queue, repository.parent_repo
+
+        end_cache_hits, end_cache_lookups = self.get_member_cache_stats()
+        member_cache_stats = (end_cache_hits - cache_hits, end_cache_lookups - cache_lookups)
+        return activities, processed_commits, bad_commits, member_cache_stats
+
+    async def build_chunk_activities(
+        self,
+        commit_records_chunk: list[GitLogRecord],
+        batch_info: CloneBatchInfo,
+        repository: Repository,
+    ) -> list[ActivityRecord]:
+        """
+        Build the activities of a chunk of git log commit records (pipeline build stage).
+
+        When processing workers are configured, activities are built in the process pool and
+        the event loop stays free for the other pipeline stages.
+
+        Args:
+            commit_records_chunk: List of commit records to process
+            batch_info: Clone batch information with paths and commit boundaries
+            repository: Repository object containing segment and integration info
+        """
+        stats_mode = repository.commit_stats_mode
+        deferred_stats = None
+        if stats_mode == CommitStatsMode.DEFERRED:
+            commit_hashes = []
+            for record in commit_records_chunk:
+                if not self._validate_commit_structure(record):
+                    continue
+                commit_hash = decode_ascii_field(record[git_log_parser.HASH])
+                if not self.should_skip_commit(commit_hash, batch_info.edge_commit):
+                    commit_hashes.append(commit_hash)
+            deferred_stats = await self._get_deferred_commit_stats(
+                batch_info.repo_path, commit_hashes
+            )
+
+        if self.processing_workers > 0:
+            # memoryviews can't be sent to worker processes
+            commit_records_chunk = [
+                tuple(bytes(field) for field in record) for record in commit_records_chunk
+            ]
+        build_args = (
+            commit_records_chunk,
+            batch_info.edge_commit,
+            batch_info.repo_path,
+            batch_info.remote,
+            repository.segment_id,
+            repository.integration_id,
+            repository.re_onboarding_count,
+            stats_mode,
+            deferred_stats,
+            self.trailer_extraction_mode,
+            self.deterministic_result_ids,
+        )
+        if self.processing_workers > 0:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._get_process_pool(), build_activities_in_worker, *build_args
             )
+        else:
+            result = self.build_activities_from_chunk(*build_args)
+        activities, processed_commits, bad_commits, (cache_hits, cache_lookups) = result
+        del result
 
         self.logger.info(
-            f"Processed {processed_commits} commits, skipped {bad_commits} invalid commits, filtered {skipped_activities} activities from parent repo in {batch_info.repo_path}"
+            f"Processed {processed_commits} commits, skipped {bad_commits} invalid commits in {batch_info.repo_path}"
         )
-        # Update metrics context
         if self._metrics_context:
             self._metrics_context["processed_commits"] += processed_commits
             self._metrics_context["bad_commits"] += bad_commits
-            self._metrics_context["total_activities"] += len(activities_db)
-            self._metrics_context["skipped_activities"] += skipped_activities
+            self._metrics_context["member_cache_hits"] += cache_hits
+            self._metrics_context["member_cache_lookups"] += cache_lookups
+        return activities
 
-        # Write activities to database and queue
-        if activities_db:
-            await asyncio.gather(
-                batch_insert_activities(activities_db),
-                self.queue_service.send_batch_activities(activities_queue),
-            )
+    async def filter_chunk_activities(
+        self, activities: list[ActivityRecord], repository: Repository
+    ) -> list[ActivityRecord]:
+        """
+        Filter out activities from parent repo, for forks (pipeline filter stage).
 
-        del activities_db, activities_queue
+        Commits the parent repo had already processed are usually excluded from git log (see
+        _get_parent_snapshot_commit), this only catches the remaining ones.
+        """
+        activities, skipped_activities = await self._filter_existing_activities(
+            activities, repository.parent_repo
+        )
+        if self._metrics_context:
+            self._metrics_context["skipped_activities"] += skipped_activities
+        return activities
 
     async def _process_activities_from_commits(
-        self, raw_commits: str, batch_info: CloneBatchInfo, repository: Repository
+        self,
+        commit_records: AsyncIterator[GitLogRecord],
+        batch_info: CloneBatchInfo,
+        repository: Repository,
+        checkpoint: ProcessingCheckpoint | None = None,
     ):
         """
-        Parse raw git log output, process commits into activities, and save to database.
-        """
-        commit_texts = [
-            c.strip() for c in raw_commits.split(self.COMMIT_START_SPLITTER) if c.strip()
-        ]
-        del raw_commits
-        gc.collect()
+        Consume streamed commit records and run them through the processing pipeline.
 
-        logger.info(f"Actual number of commits to be processed: {len(commit_texts)}")
+        Each stage runs its own workers and hands its output to the next one through a bounded
+        queue:
 
-        # Update total_commits metric
-        if self._metrics_context:
-            self._metrics_context["total_commits"] += len(commit_texts)
+            read git log -> build activities -> [filter parent activities] -> DB -> Kafka
 
-        if len(commit_texts) == 0:
-            self.logger.info("No commits to be processed")
-            return
+        Activities are sent to Kafka only once they are saved, as the data sink worker reads
+        them from integration.results. A slow stage fills up its input queue, which blocks the
+        previous ones down to the git log reader, so memory is bounded by the queue sizes and
+        not by the repository size.
+
+        The chunk size and the number of chunks written at once are adapted by the repository
+        ChunkController from the measured build, DB and Kafka latencies.
 
-        chunk_size = self.MAX_CHUNK_SIZE
-        total_chunks = (len(commit_texts) + chunk_size - 1) // chunk_size
+        Chunks may finish out of order, the checkpoint of full clones is advanced over the
+        chunks finished so far without gaps, and saved, so that an interrupted processing
+        only redoes the chunks that were not finished.
+        """
+        controller = self._chunk_controller
+        stage_workers = {
+            # Keep every worker process busy when activities are built in the pool
+            "build": max(self.stage_concurrency["build"], self.processing_workers),
+            "filter": self.stage_concurrency["filter"],
+            "db": self.stage_concurrency["db"],
+            "kafka": self.stage_concurrency["kafka"],
+        }
+        if not repository.parent_repo:
+            del stage_workers["filter"]
+        stages = list(stage_workers)
+        queues = {stage: asyncio.Queue(maxsize=self.PIPELINE_QUEUE_SIZE) for stage in stages}
+        running_workers = dict(stage_workers)
+        max_queue_depth = dict.fromkeys(stages, 0)
+        controller.buffered_chunks = len(stages) * self.PIPELINE_QUEUE_SIZE + sum(
+            workers for stage, workers in stage_workers.items() if stage not in ("db", "kafka")
+        )
         self.logger.info(
-            f"Total commits {len(commit_texts)} - Total chunks: {total_chunks} - Chunk size: {chunk_size}"
+            f"Processing with chunk_size={controller.chunk_size}, "
+            f"in-flight chunks={controller.in_flight_limit}, stage workers={stage_workers}, "
+            f"queue size={self.PIPELINE_QUEUE_SIZE}"
         )
 
-        max_concurrent = 2
-        semaphore = asyncio.Semaphore(max_concurrent)
-        self.logger.info(f"Processing with max_concurrent={max_concurrent}")
-
+        total_commits = 0
+        total_chunks = 0
         completed_chunks = 0
+        # Commit count of each chunk, and finished chunks not yet in the checkpoint
+        chunk_commits: dict[int, int] = {}
+        finished_chunks: set[int] = set()
+        next_checkpoint_chunk = 0
+        checkpoint_lock = asyncio.Lock()
+
+        async def put(stage: str, item: tuple[int, list] | None):
+            await queues[stage].put(item)
+            max_queue_depth[stage] = max(max_queue_depth[stage], queues[stage].qsize())
+
+        async def put_chunk(chunk: list[GitLogRecord]):
+            nonlocal total_chunks
+            chunk_commits[total_chunks] = len(chunk)
+            total_chunks += 1
+            await put(stages[0], (total_chunks - 1, chunk))
+
+        async def read_commits():
+            nonlocal total_commits
+            chunk = []
+            async with aclosing(commit_records):
+                async for commit_record in commit_records:
+                    chunk.append(commit_record)
+                    total_commits += 1
+                    if len(chunk) >= controller.chunk_size:
+                        await put_chunk(chunk)
+                        chunk = []
+            if chunk:
+                await put_chunk(chunk)
+            del chunk
+            # End of input, passed along by each stage once all its workers are done
+            await put(stages[0], None)
+
+        async def build(chunk: list[GitLogRecord]) -> list[ActivityRecord]:
+            start_time = time.monotonic()
+            activities = await self.build_chunk_activities(chunk, batch_info, repository)
+            controller.record_build(
+                time.monotonic() - start_time,
+                len(chunk),
+                sum(len(activity.data) + len(activity.kafka_value) for activity in activities),
+            )
+            return activities
+
+        async def write_db(activities: list[ActivityRecord]) -> list[ActivityRecord]:
+            # Released once the chunk is sent to Kafka
+            await controller.acquire_write_slot()
+            start_time = time.monotonic()
+            # Saved activities, and already saved ones whose result is still pending
+            unsent_activities = await batch_insert_activities(
+                activities, skip_existing=self.deterministic_result_ids
+            )
+            controller.record_write("db", time.monotonic() - start_time)
+            if self._metrics_context:
+                self._metrics_context["total_activities"] += len(unsent_activities)
+                self._metrics_context["replayed_activities"] += len(activities) - len(
+                    unsent_activities
+                )
+            # Activities already processed by the data sink worker, nothing left to send
+            if not unsent_activities:
+                await controller.release_write_slot()
+            return unsent_activities
+
+        async def write_kafka(activities: list[ActivityRecord]) -> None:
+            nonlocal completed_chunks
+            start_time = time.monotonic()
+            await self.queue_service.send_batch_activities(activities)
+            controller.record_write("kafka", time.monotonic() - start_time)
+            await controller.release_write_slot()
+            completed_chunks += 1
+            self.logger.info(
+                f"Progress: {completed_chunks}/{total_chunks} chunks "
+                f"(chunk_size={controller.chunk_size}, "
+                f"in-flight chunks={controller.in_flight_limit})"
+            )
 
-        async def process_single_chunk(chunk_start_idx: int, chunk_end_idx: int):
-            nonlocal completed_chunks, total_chunks
-
-            async with semaphore:
-                chunk = commit_texts[chunk_start_idx:chunk_end_idx]  # noqa: F821
-                try:
-                    # Process chunk and write to DB/Kafka
-                    await self.process_commits_chunk(
-                        chunk,
-                        batch_info,
-                        repository,
-                    )
-                    completed_chunks += 1
-                    self.logger.info(f"Progress: {completed_chunks}/{total_chunks} chunks")
-                    del chunk
-                except Exception as e:
-                    self.logger.error(f"Error processing chunk: {repr(e)}")
-                    raise
-
-        tasks = [
-            process_single_chunk(i, min(i + chunk_size, len(commit_texts)))
-            for i in range(0, len(commit_texts), chunk_size)
-        ]
+        async def finish_chunk(chunk_index: int):
+            nonlocal next_checkpoint_chunk
+            if not checkpoint or not self.processing_checkpoints:
+                return
+            finished_chunks.add(chunk_index)
+            async with checkpoint_lock:
+                emitted_commits = checkpoint.emitted_commits
+                while next_checkpoint_chunk in finished_chunks:
+                    finished_chunks.remove(next_checkpoint_chunk)
+                    checkpoint.emitted_commits += chunk_commits.pop(next_checkpoint_chunk)
+                    next_checkpoint_chunk += 1
+                if checkpoint.emitted_commits > emitted_commits:
+                    await save_processing_checkpoint(repository.id, checkpoint)
+
+        handlers = {
+            "build": build,
+            "filter": lambda activities: self.filter_chunk_activities(activities, repository),
+            "db": write_db,
+            "kafka": write_kafka,
+        }
 
-        self.logger.info(
-            f"Created {len(tasks)} tasks. Processing with max {max_concurrent} concurrent tasks"
-        )
+        async def run_stage_worker(stage: str):
+            queue = queues[stage]
+            next_stage = stages[stages.index(stage) + 1] if stage != stages[-1] else None
+            while (item := await queue.get()) is not None:
+                chunk_index, payload = item
+                del item
+                result = await handlers[stage](payload)
+                del payload
+                # Chunks without activities have nothing left to do
+                if next_stage and result:
+                    await put(next_stage, (chunk_index, result))
+                else:
+                    await finish_chunk(chunk_index)
+                del result
+            # Let the other workers of this stage stop too
+            await queue.put(None)
+            running_workers[stage] -= 1
+            if next_stage and running_workers[stage] == 0:
+                await put(next_stage, None)
+
+        tasks = [asyncio.create_task(read_commits())]
+        for stage, workers in stage_workers.items():
+            tasks.extend(asyncio.create_task(run_stage_worker(stage)) for _ in range(workers))
 
         try:
             await asyncio.gather(*tasks)
 
-            self.logger.info(f"All {total_chunks} chunks processed successfully.")
-
         except Exception as e:
             self.logger.error(
-                f"Error during chunk processing at chunk {completed_chunks}/{total_chunks}: {e}"
+                f"Error during chunk processing at chunk {completed_chunks}/{total_chunks}: {repr(e)}"
             )
             raise
 
         finally:
-            del commit_texts
-            gc.collect()
-            self.logger.info("Memory cleanup completed")
-
-    def _construct_commit_dict(
-        self, commit_metadata_lines: list[str], numstats_text: str
-    ) -> dict[str, Any]:
-        """Create commit dictionary from parsed lines."""
-        commit_hash = commit_metadata_lines[0]
-        author_datetime = commit_metadata_lines[1]
-        author_name = commit_metadata_lines[2]
-        author_email = commit_metadata_lines[3]
-        commit_datetime = commit_metadata_lines[4]
-        committer_name = commit_metadata_lines[5]
-        committer_email = commit_metadata_lines[6]
-        parent_hashes = commit_metadata_lines[7].split()
+            # Stop the other stages when one of them failed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            # Update total_commits and pipeline metrics
+            if self._metrics_context:
+                self._metrics_context["total_commits"] += total_commits
+                stage_depths = self._metrics_context["max_queue_depth"]
+                for stage, depth in max_queue_depth.items():
+                    stage_depths[stage] = max(stage_depths.get(stage, 0), depth)
+
+        if total_commits == 0:
+            self.logger.info("No commits to be processed")
+            return
+
+        self.logger.info(
+            f"All {total_chunks} chunks processed successfully - Total commits {total_commits}"
+        )
+
+    def _construct_commit_record(
+        self,
+        record: GitLogRecord,
+        future_threshold: datetime.datetime,
+        stats_mode: CommitStatsMode = CommitStatsMode.NUMSTAT,
+        deferred_stats: dict[str, tuple[int, int]] | None = None,
+        trailer_mode: TrailerExtractionMode = TrailerExtractionMode.MESSAGE,
+    ) -> CommitRecord:
+        """
+        Create a commit record from a git log commit record.
+
+        Timestamps are parsed once here, raises ValueError if the author datetime is invalid.
+        """
+        commit_hash = decode_ascii_field(record[git_log_parser.HASH])
+        author_datetime = decode_ascii_field(record[git_log_parser.AUTHOR_DATETIME])
+        author_name = decode_field(record[git_log_parser.AUTHOR_NAME])
+        author_email = decode_field(record[git_log_parser.AUTHOR_EMAIL])
+        commit_datetime = decode_ascii_field(record[git_log_parser.COMMITTER_DATETIME])
+        committer_name = decode_field(record[git_log_parser.COMMITTER_NAME])
+        committer_email = decode_field(record[git_log_parser.COMMITTER_EMAIL])
 
         # Use name as email if email is empty and name is a valid email
         author_email = (
@@ -877,56 +1459,81 @@ class CommitService(BaseService):
             else committer_email
         )
 
-        # Handle optional fields safely
-        commit_message = commit_metadata_lines[9:] if len(commit_metadata_lines) > 9 else []
+        author_datetime_obj = self._parse_datetime(author_datetime)
+        if author_datetime_obj is None:
+            raise ValueError(f"Invalid author datetime: {author_datetime}")
 
-        # Validate and adjust commit datetime if it's in the future
-        adjusted_commit_datetime = self._validate_and_adjust_datetime(
-            commit_datetime, author_datetime
-        )
+        # Validate commit datetime and use the author datetime if it's invalid or in the future
+        commit_datetime_obj = self._parse_datetime(commit_datetime)
+        if commit_datetime_obj is None:
+            self.logger.warning(
+                f"Invalid commit datetime format: {commit_datetime}, using author datetime"
+            )
+            commit_datetime, commit_datetime_obj = author_datetime, author_datetime_obj
+        elif commit_datetime_obj > future_threshold:
+            self.logger.warning(
+                f"Commit datetime in future, using author datetime instead: {commit_datetime}"
+            )
+            commit_datetime, commit_datetime_obj = author_datetime, author_datetime_obj
 
-        # Parse numstats to get insertions/deletions
-        insertions, deletions = self._parse_numstats(numstats_text)
-        # release memory
-        del numstats_text
-        del commit_metadata_lines
+        insertions, deletions = self._get_commit_stats(
+            record, commit_hash, stats_mode, deferred_stats
+        )
 
-        return {
-            "hash": commit_hash,
-            "author_datetime": author_datetime,
-            "author_name": author_name,
-            "author_email": author_email,
-            "committer_datetime": adjusted_commit_datetime,
-            "committer_name": committer_name,
-            "committer_email": committer_email,
-            "is_main_branch": True,
-            "is_merge_commit": len(parent_hashes) > 1,
-            "message": commit_message,
-            "insertions": insertions,
-            "deletions": deletions,
-        }
+        trailers = None
+        if trailer_mode == TrailerExtractionMode.TRAILERS:
+            trailers_field = record[git_log_parser.TRAILERS]
+            trailers = (
+                decode_field(trailers_field).split(TRAILER_SEPARATOR) if trailers_field else []
+            )
 
-    def _validate_commit_structure(self, commit_lines: list[str]) -> bool:
-        """Validate that commit has minimum required fields."""
-        return len(commit_lines) >= self.MIN_COMMIT_FIELDS
+        return CommitRecord(
+            hash=commit_hash,
+            author_name=author_name,
+            author_email=author_email,
+            author_datetime=author_datetime,
+            author_timezone=author_datetime_obj.tzname(),
+            committer_name=committer_name,
+            committer_email=committer_email,
+            committer_datetime=commit_datetime,
+            committer_timezone=commit_datetime_obj.tzname(),
+            is_merge_commit=is_merge_commit(record),
+            body="\n".join(decode_field(record[git_log_parser.BODY]).rstrip().splitlines()),
+            insertions=insertions,
+            deletions=deletions,
+            trailers=trailers,
+        )
 
-    def _validate_commit_data(self, commit_dict: dict[str, Any]) -> bool:
+    def _get_commit_stats(
+        self,
+        record: GitLogRecord,
+        commit_hash: str,
+        stats_mode: CommitStatsMode,
+        deferred_stats: dict[str, tuple[int, int]] | None,
+    ) -> tuple[int, int]:
+        """Get commit (insertions, deletions) as computed by the stats mode."""
+        if stats_mode == CommitStatsMode.DEFERRED:
+            return (deferred_stats or {}).get(commit_hash, (0, 0))
+        if stats_mode == CommitStatsMode.NONE:
+            return 0, 0
+        if stats_mode == CommitStatsMode.SHORTSTAT:
+            return parse_shortstat(record[git_log_parser.NUMSTATS])
+        return parse_numstats(record[git_log_parser.NUMSTATS])
+
+    def _validate_commit_structure(self, record: GitLogRecord) -> bool:
+        """Validate that commit record has all the git log fields."""
+        return len(record) == git_log_parser.RECORD_FIELDS
+
+    def _validate_commit_data(self, commit: CommitRecord) -> bool:
         """Validate commit data content."""
         # Check required fields
-        if not commit_dict.get("author_email", "").strip():
-            self.logger.info(f"Commit without author_email: {commit_dict.get('hash', 'unknown')}")
+        if not commit.author_email.strip():
+            self.logger.info(f"Commit without author_email: {commit.hash or 'unknown'}")
             return False
 
         # Validate commit hash format
-        if not self.is_valid_commit_hash(commit_dict.get("hash", "")):
-            self.logger.error(f"Invalid commit hash: {commit_dict.get('hash', 'unknown')}")
-            return False
-
-        # Validate datetime format
-        if not self.is_valid_datetime(commit_dict.get("committer_datetime", "")):
-            self.logger.error(
-                f"Invalid commit datetime: {commit_dict.get('committer_datetime', 'unknown')}"
-            )
+        if not self.is_valid_commit_hash(commit.hash):
+            self.logger.error(f"Invalid commit hash: {commit.hash or 'unknown'}")
             return False
 
         return True
@@ -939,24 +1546,21 @@ class CommitService(BaseService):
         except Exception:
             return False
 
-    def _validate_and_adjust_datetime(self, commit_datetime: str, author_datetime: str) -> str:
-        """Validate commit datetime and adjust if it's in the future."""
-        try:
-            commit_datetime_obj = datetime.datetime.strptime(commit_datetime, self.DATETIME_FORMAT)
-            future_threshold = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
-                days=self.FUTURE_DATE_THRESHOLD_DAYS
-            )
 
-            if commit_datetime_obj > future_threshold:
-                self.logger.warning(
-                    f"Commit datetime in future, using author datetime instead: {commit_datetime}"
-                )
-                return author_datetime
+# CommitService used by build_activities_in_worker, created once per worker process
+_worker_commit_service: CommitService | None = None
 
-            return commit_datetime
 
-        except ValueError:
-            self.logger.warning(
-                f"Invalid commit datetime format: {commit_datetime}, using author datetime"
-            )
-            return author_datetime
+def build_activities_in_worker(
+    *build_args,
+) -> tuple[list[ActivityRecord], int, int, tuple[int, int]]:
+    """
+    Process pool entrypoint for CommitService.build_activities_from_chunk
+
+    Member caches of worker processes are kept between repositories, members only depend on
+    their (name, email).
+    """
+    global _worker_commit_service
+    if _worker_commit_service is None:
+        _worker_commit_service = CommitService(queue_service=None, processing_workers=0)
+    return _worker_commit_service.build_activities_from_chunk(*build_args)
@@ -0,0 +1,218 @@
+"""
+Zero-copy parser for NUL-separated git log output.
+
+Every commit field is terminated by a NUL byte (%x00), which can't be part of any commit field,
+so the output can be split without text markers. git separates commits with a newline and
+prints the numstat lines between the last field of a commit and the hash of the next one:
+
+    <hash>\\0<author date>\\0 ... <body>\\0<trailers>\\0[\\n<numstat lines>\\n]\\n<next hash>\\0 ...
+
+The bytes between the last field of a commit and the next NUL are therefore the commit
+numstats followed by the next commit hash, split at the last newline.
+
+Records are returned as tuples of memoryviews over the raw output, so nothing is copied or
+decoded until the consumer asks for it.
+"""
+
+import re
+
+from crowdgit.services.utils import _safe_decode
+
+# Fields in GIT_LOG_FORMAT order
+HASH = 0
+AUTHOR_DATETIME = 1
+AUTHOR_NAME = 2
+AUTHOR_EMAIL = 3
+COMMITTER_DATETIME = 4
+COMMITTER_NAME = 5
+COMMITTER_EMAIL = 6
+PARENTS = 7
+BODY = 8
+TRAILERS = 9
+NUMSTATS = 10
+
+COMMIT_FIELDS = 10
+RECORD_FIELDS = COMMIT_FIELDS + 1
+
+_COMMIT_FORMAT = "%H%x00%aI%x00%an%x00%ae%x00%cI%x00%cn%x00%ce%x00%P%x00%B%x00"
+# The trailers field is left empty when trailers are read from the message
+GIT_LOG_FORMAT = _COMMIT_FORMAT + "%x00"
+# Trailers parsed by git, one per line (continuation lines unfolded), separated by
+# TRAILER_SEPARATOR as message lines can't contain it
+TRAILER_SEPARATOR = "\x1f"
+GIT_LOG_TRAILERS_FORMAT = _COMMIT_FORMAT + "%(trailers:unfold,separator=%x1f)%x00"
+
+_NUL = b"\0"
+_NEWLINE = b"\n"
+_NUMSTAT_PATTERN = re.compile(rb"^(\d+)\s+(\d+)", re.MULTILINE)
+_INSERTIONS_PATTERN = re.compile(rb"(\d+) insertions?\(\+\)")
+_DELETIONS_PATTERN = re.compile(rb"(\d+) deletions?\(-\)")
+
+GitLogRecord = tuple[memoryview | bytes, ...]
+
+
+def decode_field(field: memoryview | bytes) -> str:
+    """Decode a commit field, falling back to legacy encodings for non-UTF-8 content"""
+    try:
+        return str(field, "utf-8")
+    except UnicodeDecodeError:
+        return _safe_decode(bytes(field))
+
+
+def decode_ascii_field(field: memoryview | bytes) -> str:
+    """Decode a field that git always prints as ASCII (hashes, ISO dates)"""
+    return str(field, "ascii", "replace")
+
+
+def parse_numstats(numstats: memoryview | bytes) -> tuple[int, int]:
+    """
+    Sum numstat lines into -> (insertions, deletions) without decoding them.
+
+    Binary files ("-\\t-\\tpath") don't count.
+
+    >>> parse_numstats(b"\\n1\\t2\\ta.py\\n-\\t-\\tb.bin\\n10\\t0\\tc.py\\n")
+    (11, 2)
+    """
+    insertions = 0
+    deletions = 0
+    for match in _NUMSTAT_PATTERN.finditer(numstats):
+        insertions += int(match.group(1))
+        deletions += int(match.group(2))
+    return insertions, deletions
+
+
+def parse_shortstat(shortstat: memoryview | bytes) -> tuple[int, int]:
+    """
+    Parse a --shortstat summary line into -> (insertions, deletions).
+
+    >>> parse_shortstat(b"\\n 3 files changed, 10 insertions(+), 1 deletion(-)\\n")
+    (10, 1)
+    >>> parse_shortstat(b" 1 file changed, 2 deletions(-)"), parse_shortstat(b"")
+    ((0, 2), (0, 0))
+    """
+    insertions = _INSERTIONS_PATTERN.search(shortstat)
+    deletions = _DELETIONS_PATTERN.search(shortstat)
+    return (
+        int(insertions.group(1)) if insertions else 0,
+        int(deletions.group(1)) if deletions else 0,
+    )
+
+
+def parse_shortstat_log(output: bytes) -> dict[str, tuple[int, int]]:
+    """
+    Parse `git log --shortstat --format=%H%x00` output into -> {hash: (insertions, deletions)}.
+
+    Commits without changes have no summary line and map to (0, 0).
+
+    >>> parse_shortstat_log(
+    ...     b"a1\\0\\n 1 file changed, 2 insertions(+)\\n\\nb2\\0\\nc3\\0\\n 1 file changed, 1 deletion(-)"
+    ... )
+    {'a1': (2, 0), 'b2': (0, 0), 'c3': (0, 1)}
+    """
+    stats = {}
+    segments = output.split(_NUL)
+    commit_hash = segments[0].strip()
+    for segment in segments[1:-1]:
+        # The summary of a commit is followed by the next commit hash on its own line
+        summary, _, next_hash = segment.rpartition(_NEWLINE)
+        stats[commit_hash.decode("ascii")] = parse_shortstat(summary)
+        commit_hash = next_hash
+    if commit_hash:
+        stats[commit_hash.decode("ascii")] = parse_shortstat(segments[-1])
+    return stats
+
+
+def is_merge_commit(record: GitLogRecord) -> bool:
+    """A merge commit lists more than one parent hash, each as long as its own hash"""
+    return len(record[PARENTS]) > len(record[HASH])
+
+
+class GitLogParser:
+    """
+    Incrementally split streamed git log output (GIT_LOG_FORMAT or GIT_LOG_TRAILERS_FORMAT)
+    into commit records.
+
+    >>> parser = GitLogParser()
+    >>> output = b"a1\\0d1\\0n1\\0e1\\0d1\\0n1\\0e1\\0\\0body\\n\\0\\0\\n1\\t2\\tf\\n\\nb2\\0" + (
+    ...     b"d2\\0n2\\0e2\\0d2\\0n2\\0e2\\0a1\\0\\0\\0"
+    ... )
+    >>> records = parser.feed(output[:20]) + parser.feed(output[20:]) + parser.close()
+    >>> [bytes(records[0][field]) for field in (HASH, BODY, NUMSTATS)]
+    [b'a1', b'body\\n', b'\\n1\\t2\\tf\\n']
+    >>> bytes(records[1][PARENTS]), bytes(records[1][NUMSTATS])
+    (b'a1', b'')
+    """
+
+    def __init__(self):
+        # Blocks received since the last complete record, joined only once a record can end
+        self._pending: list[bytes] = []
+
+    def feed(self, data: bytes) -> list[GitLogRecord]:
+        """Add a block of output and return the records completed by it"""
+        if not data:
+            return []
+        self._pending.append(data)
+        # A record is only complete once the NUL ending the next commit hash arrives
+        if _NUL not in data:
+            return []
+        buffer = b"".join(self._pending) if len(self._pending) > 1 else data
+        records, consumed = self._split_records(buffer, final=False)
+        self._pending = [buffer[consumed:]] if consumed < len(buffer) else []
+        return records
+
+    def close(self) -> list[GitLogRecord]:
+        """
+        Return the records left once the output ended.
+
+        Truncated output is returned as a record with less than RECORD_FIELDS fields.
+        """
+        buffer = b"".join(self._pending)
+        self._pending = []
+        if not buffer.strip():
+            return []
+        records, consumed = self._split_records(buffer, final=True)
+        if consumed < len(buffer):
+            view = memoryview(buffer)
+            records.append(tuple(view[consumed:].tobytes().split(_NUL)))
+        return records
+
+    def _split_records(self, buffer: bytes, final: bool) -> tuple[list[GitLogRecord], int]:
+        view = memoryview(buffer)
+        find = buffer.find
+        records = []
+        start = 0
+        length = len(buffer)
+
+        while True:
+            field_ends = []
+            position = start
+            for _ in range(COMMIT_FIELDS):
+                position = find(_NUL, position)
+                if position == -1:
+                    return records, start
+                field_ends.append(position)
+                position += 1
+
+            next_hash_end = find(_NUL, position)
+            if next_hash_end == -1:
+                if not final:
+                    return records, start
+                numstats_end = next_start = length
+            else:
+                # Numstats end at the newline preceding the next commit hash
+                numstats_end = buffer.rfind(_NEWLINE, position, next_hash_end)
+                if numstats_end == -1:
+                    numstats_end = position
+                next_start = numstats_end + 1
+
+            fields = []
+            field_start = start
+            for field_end in field_ends:
+                fields.append(view[field_start:field_end])
+                field_start = field_end + 1
+            fields.append(view[position:numstats_end])
+            records.append(tuple(fields))
+
+            start = next_start
+            if start >= length:
+                return records, length
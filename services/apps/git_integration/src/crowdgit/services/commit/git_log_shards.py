@@ -0,0 +1,91 @@
+"""
+Sharded git log: the history is split into disjoint commit ranges read by concurrent git logs.
+
+A single git log computes the diff stats of every commit on one core. The commits listed by
+git rev-list are split into contiguous shards, and each shard is read by its own
+`git log --no-walk=unsorted --stdin` process, which prints the given commits in the given
+order. Shards are consumed in order, so records come out in the same order as a single
+git log, while the following shards run ahead and spool their output to a temporary file.
+"""
+
+import asyncio
+import os
+import tempfile
+from collections.abc import AsyncIterator
+
+from crowdgit.services.utils import STREAM_READ_SIZE
+
+
+def split_shards(commit_hashes: list[str], shards: int) -> list[list[str]]:
+    """
+    Split commits into at most `shards` contiguous shards of (nearly) equal size.
+
+    >>> split_shards(["a", "b", "c", "d", "e"], 2)
+    [['a', 'b', 'c'], ['d', 'e']]
+    >>> split_shards(["a"], 3)
+    [['a']]
+    """
+    shards = max(min(shards, len(commit_hashes)), 1)
+    shard_size, larger_shards = divmod(len(commit_hashes), shards)
+    result = []
+    start = 0
+    for index in range(shards):
+        end = start + shard_size + (1 if index < larger_shards else 0)
+        result.append(commit_hashes[start:end])
+        start = end
+    return result
+
+
+class SpooledOutput:
+    """
+    Output of a streamed command, read ahead into a temporary file until it is consumed.
+
+    The command runs at full speed whatever the consumer does, its output only takes disk
+    space, and the file is removed once closed.
+    """
+
+    def __init__(self, stream: AsyncIterator[bytes], directory: str | None = None):
+        self._file = tempfile.TemporaryFile(dir=directory)
+        self._written = 0
+        self._done = False
+        self._changed = asyncio.Event()
+        self._task = asyncio.create_task(self._spool(stream))
+
+    async def _spool(self, stream: AsyncIterator[bytes]) -> None:
+        try:
+            async for block in stream:
+                os.pwrite(self._file.fileno(), block, self._written)
+                self._written += len(block)
+                self._changed.set()
+        finally:
+            self._done = True
+            self._changed.set()
+
+    async def read(self, read_size: int = STREAM_READ_SIZE) -> AsyncIterator[bytes]:
+        """Yield the command output from the start, waiting for it while the command runs"""
+        offset = 0
+        while True:
+            if offset < self._written:
+                block = os.pread(
+                    self._file.fileno(), min(read_size, self._written - offset), offset
+                )
+                offset += len(block)
+                yield block
+            elif self._done:
+                break
+            else:
+                self._changed.clear()
+                await self._changed.wait()
+        # Raise the command failure, if any
+        await self._task
+
+    async def close(self) -> None:
+        """Stop the command if it is still running, and remove the spooled output"""
+        if not self._task.done():
+            self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, Exception):
+            # Failures are raised to the reader, nothing is left to read here
+            pass
+        self._file.close()
@@ -1,12 +1,9 @@
 import asyncio
 import base64
-import os
 import time as time_module
 from datetime import datetime, time, timezone
 from decimal import Decimal
 
-import aiofiles
-import aiofiles.os
 from slugify import slugify
 
 from crowdgit.database.crud import (
@@ -37,6 +34,7 @@ from crowdgit.models.maintainer_info import (
 from crowdgit.models.service_execution import ServiceExecution
 from crowdgit.services.base.base_service import BaseService
 from crowdgit.services.maintainer.bedrock import invoke_bedrock
+from crowdgit.services.repository_files import RepositoryFiles
 from crowdgit.services.utils import parse_repo_url
 from crowdgit.settings import MAINTAINER_RETRY_INTERVAL_DAYS, MAINTAINER_UPDATE_INTERVAL_HOURS
 
@@ -359,16 +357,22 @@ class MaintainerService(BaseService):
             return None, result.cost
 
     async def find_maintainer_file(self, repo_path: str, owner: str, repo: str):
+        """
+        Find and read the maintainer file of the repository HEAD. Files are read from the
+        object database, the repository doesn't need to be checked out.
+        """
         self.logger.info(f"Looking for maintainer files in {owner}/{repo}...")
 
-        file_names = await aiofiles.os.listdir(repo_path)
-
-        for file in self.MAINTAINER_FILES:
-            file_path = os.path.join(repo_path, file)
-            if await aiofiles.os.path.isfile(file_path):
-                self.logger.info(f"maintainer file: {file_path} found in repo")
-                async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
-                    content = await f.read()
+        async with RepositoryFiles(repo_path) as repository_files:
+            file_names = await repository_files.list_dir() or []
+            candidates = await asyncio.gather(
+                *(repository_files.read(file) for file in self.MAINTAINER_FILES)
+            )
+            for file, raw_content in zip(self.MAINTAINER_FILES, candidates, strict=True):
+                if raw_content is None:
+                    continue
+                self.logger.info(f"maintainer file: {file} found in repo")
+                content = raw_content.decode("utf-8")
 
                 if file.lower() == "readme.md" and "maintainer" not in content.lower():
                     self.logger.info(f"Skipping {file}: no maintainer-related content found")
@@ -376,24 +380,21 @@ class MaintainerService(BaseService):
 
                 return file, base64.b64encode(content.encode()).decode(), 0
 
-        self.logger.warning("No maintainer files found using the known file names.")
+            self.logger.warning("No maintainer files found using the known file names.")
 
-        file_name, ai_cost = await self.find_maintainer_file_with_ai(file_names)
+            file_name, ai_cost = await self.find_maintainer_file_with_ai(file_names)
+            raw_content = await repository_files.read(file_name) if file_name else None
 
-        if file_name:
-            file_path = os.path.join(repo_path, file_name)
-            if await aiofiles.os.path.isfile(file_path):
-                async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
-                    content = await f.read()
-
-                if file_name.lower() == "readme.md" and "maintainer" not in content.lower():
-                    self.logger.info(
-                        f"AI suggested {file_name}, but it has no maintainer-related content. Skipping."
-                    )
-                    return None, None, ai_cost
+        if raw_content is not None:
+            content = raw_content.decode("utf-8")
+            if file_name.lower() == "readme.md" and "maintainer" not in content.lower():
+                self.logger.info(
+                    f"AI suggested {file_name}, but it has no maintainer-related content. Skipping."
+                )
+                return None, None, ai_cost
 
-                self.logger.info(f"\nMaintainer file found: {file_name}")
-                return file_name, base64.b64encode(content.encode()).decode(), ai_cost
+            self.logger.info(f"\nMaintainer file found: {file_name}")
+            return file_name, base64.b64encode(content.encode()).decode(), ai_cost
 
         return None, None, ai_cost
 
@@ -11,6 +11,7 @@ from tenacity import (
 )
 
 from crowdgit.errors import QueueConnectionError, QueueMessageProduceError
+from crowdgit.models import ActivityRecord
 from crowdgit.services.base.base_service import BaseService
 from crowdgit.settings import (
     CROWD_KAFKA_BROKERS,
@@ -135,35 +136,35 @@ class QueueService(BaseService):
             self.logger.error(f"Failed to shutdown queue service: {repr(e)}")
             # Don't raise - allow application to continue shutdown
 
-    async def send_batch_activities(self, activities_kafka: list[dict[str, str]]):
+    async def send_batch_activities(self, activities: list[ActivityRecord]):
         """
         Send multiple pre-prepared activities to Kafka in a non-blocking way.
         Args:
-            activities_kafka: List of dicts with 'message_id' and 'payload' keys
-                             (prepared by CommitService.prepare_activity_for_db_and_queue)
+            activities: Activity records carrying serialized Kafka keys and values
+                        (prepared by CommitService.prepare_activity_for_db_and_queue)
         """
-        if not activities_kafka:
+        if not activities:
             return
 
         await self.ensure_connected()
 
-        self.logger.info(f"Emitting {len(activities_kafka)} activities to kafka queue...")
+        self.logger.info(f"Emitting {len(activities)} activities to kafka queue...")
 
         try:
             futures = [
                 self.kafka_producer.send(
                     topic=self.kafka_topic,
-                    key=activity["message_id"].encode("utf-8", errors="replace"),
-                    value=activity["payload"].encode("utf-8", errors="replace"),
+                    key=activity.kafka_key,
+                    value=activity.kafka_value,
                 )
-                for activity in activities_kafka
+                for activity in activities
             ]
             # Wait for all messages to be sent
             await asyncio.gather(*futures, return_exceptions=False)
 
-            self.logger.info(f"Successfully emitted {len(activities_kafka)} activities to queue")
+            self.logger.info(f"Successfully emitted {len(activities)} activities to queue")
         except Exception as e:
             self.logger.error(f"Failed to emit batch to queue with error: {repr(e)}")
             raise QueueMessageProduceError(
-                f"Failed to send {len(activities_kafka)} messages to Kafka"
+                f"Failed to send {len(activities)} messages to Kafka"
             ) from e
@@ -0,0 +1,136 @@
+"""
+Repository file access through the object database: files are read at a revision, so readers
+don't need a checked-out worktree.
+"""
+
+import asyncio
+import contextlib
+from collections import deque
+
+from crowdgit.errors import CommandExecutionError
+
+
+class RepositoryFiles:
+    """
+    Read the files of a repository at a revision with one long-lived `git cat-file --batch`.
+
+    Requests are "<revision>:<path>" lines written to the process stdin, answered in the same
+    order on its stdout. Concurrent readers are multiplexed over the single process: each
+    request queues a future in write order, and a reader task resolves them one response at
+    a time. In partial clones, missing blobs are fetched by git when they are read.
+
+    Use as an async context manager, the process is stopped on exit.
+    """
+
+    def __init__(self, repo_path: str, revision: str = "HEAD"):
+        self.repo_path = repo_path
+        self.revision = revision
+        self._process: asyncio.subprocess.Process | None = None
+        self._reader_task: asyncio.Task | None = None
+        self._pending: deque[asyncio.Future] = deque()
+
+    async def __aenter__(self) -> "RepositoryFiles":
+        self._process = await asyncio.create_subprocess_exec(
+            "git",
+            "cat-file",
+            "--batch",
+            cwd=self.repo_path,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        self._reader_task = asyncio.create_task(self._read_responses())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._process and self._process.returncode is None:
+            self._process.stdin.close()
+            await self._process.wait()
+        if self._reader_task:
+            await self._reader_task
+
+    async def _read_responses(self) -> None:
+        stdout = self._process.stdout
+        try:
+            while header := await stdout.readline():
+                future = self._pending.popleft()
+                try:
+                    response = await self._read_response(header.rstrip(b"\n"))
+                except (asyncio.IncompleteReadError, ValueError):
+                    # The output can't be followed anymore, later requests fail below
+                    if not future.done():
+                        future.set_exception(
+                            CommandExecutionError(
+                                f"Unexpected git cat-file --batch output in {self.repo_path}: "
+                                f"{header!r}"
+                            )
+                        )
+                    raise
+                if not future.done():
+                    future.set_result(response)
+        except (asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            if self._process.returncode is None:
+                # Stopped reading on unexpected output, the process can't be used anymore
+                with contextlib.suppress(ProcessLookupError):
+                    self._process.kill()
+            returncode = await self._process.wait()
+            while self._pending:
+                future = self._pending.popleft()
+                if not future.done():
+                    future.set_exception(
+                        CommandExecutionError(
+                            f"git cat-file --batch exited (exit {returncode}) in {self.repo_path}",
+                            returncode=returncode,
+                        )
+                    )
+
+    async def _read_response(self, header: bytes) -> tuple[str, int, bytes] | None:
+        """Parse a response header and read its content, None for missing objects"""
+        if header.endswith((b" missing", b" ambiguous")):
+            # "<object> missing", the requested path may contain spaces
+            return None
+        object_id, object_type, size = header.rsplit(b" ", 2)
+        content = (await self._process.stdout.readexactly(int(size) + 1))[:-1]
+        return object_type.decode(), len(object_id) // 2, content
+
+    async def _request(self, path: str) -> tuple[str, int, bytes] | None:
+        """Object at path -> (type, object id size in bytes, content), None if missing"""
+        if not self._process:
+            raise RuntimeError("RepositoryFiles must be used as an async context manager")
+        if "\n" in path:
+            # Requests are newline-delimited
+            raise ValueError(f"Path contains a newline: {path!r}")
+        future = asyncio.get_running_loop().create_future()
+        # Queued and written without awaiting in between, so futures stay in request order
+        self._pending.append(future)
+        self._process.stdin.write(f"{self.revision}:{path}\n".encode())
+        await self._process.stdin.drain()
+        return await future
+
+    async def read(self, path: str) -> bytes | None:
+        """Content of the file at path, None if there is no such file"""
+        response = await self._request(path)
+        if not response or response[0] != "blob":
+            return None
+        return response[2]
+
+    async def list_dir(self, path: str = "") -> list[str] | None:
+        """Names of the entries of the directory at path, None if there is no such directory"""
+        response = await self._request(path)
+        if not response or response[0] != "tree":
+            return None
+        _, object_id_size, tree = response
+        # Tree entries: "<mode> <name>\0<binary object id>"
+        names = []
+        offset = 0
+        while offset < len(tree):
+            name_end = tree.index(b"\0", offset)
+            _, name = tree[offset:name_end].split(b" ", 1)
+            names.append(name.decode("utf-8", errors="replace"))
+            offset = name_end + 1 + object_id_size
+        return names
@@ -1,12 +1,15 @@
 import json
 import time
+from datetime import datetime, timezone
 from decimal import Decimal
 
-from crowdgit.database.crud import save_service_execution
+from crowdgit.database.crud import get_last_successful_execution_at, save_service_execution
 from crowdgit.enums import ErrorCode, ExecutionStatus, OperationType
+from crowdgit.models import Repository
 from crowdgit.models.service_execution import ServiceExecution
 from crowdgit.services.base.base_service import BaseService
 from crowdgit.services.utils import run_shell_command
+from crowdgit.settings import SOFTWARE_VALUE_INTERVAL_HOURS
 
 
 class SoftwareValueService(BaseService):
@@ -17,6 +20,23 @@ class SoftwareValueService(BaseService):
         # software-value binary path was defined during Docker build
         self.software_value_executable = "/usr/local/bin/software-value"
 
+    async def check_if_interval_elapsed(self, repository: Repository) -> tuple[bool, float]:
+        """
+        Check if software value last succeeded on the repository more than
+        {SOFTWARE_VALUE_INTERVAL_HOURS} hours ago.
+
+        Returns:
+            tuple[bool, float]: (has_elapsed, remaining_hours)
+        """
+        last_run_at = await get_last_successful_execution_at(
+            repository.id, OperationType.SOFTWARE_VALUE
+        )
+        if not last_run_at:
+            return True, 0.0
+        hours_since_last_run = (datetime.now(timezone.utc) - last_run_at).total_seconds() / 3600
+        remaining_hours = max(0, SOFTWARE_VALUE_INTERVAL_HOURS - hours_since_last_run)
+        return hours_since_last_run >= SOFTWARE_VALUE_INTERVAL_HOURS, remaining_hours
+
     async def run(self, repo_id: str, repo_path: str) -> None:
         """
         Triggers software value binary for given repo.
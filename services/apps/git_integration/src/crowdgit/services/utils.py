@@ -1,6 +1,7 @@
 import asyncio
 import logging
 import re
+from collections.abc import AsyncIterator
 from urllib.parse import urlparse
 
 from crowdgit.errors import (
@@ -12,6 +13,12 @@ from crowdgit.errors import (
     ValidationError,
 )
 from crowdgit.logger import logger
+from crowdgit.models.remote_probe import RemoteProbe
+
+# Size of each read from a streamed process stdout
+STREAM_READ_SIZE = 1024 * 1024
+# Amount of stderr kept from a streamed process, used to classify failures
+STREAM_STDERR_TAIL_SIZE = 64 * 1024
 
 
 def _safe_decode(data: bytes) -> str:
@@ -90,40 +97,44 @@ def get_repo_name(remote: str) -> str:
     return "-".join(parts)
 
 
-async def get_remote_default_branch(remote_url: str) -> str | None:
-    """Get the default branch of a remote repository without cloning
+async def probe_remote(remote_url: str, branch: str | None = None) -> RemoteProbe | None:
+    """Get the default branch and its head commit of a remote repository in a single
+    request, without cloning
 
     Args:
         remote_url: The URL of the remote repository.
+        branch: The saved default branch, listed along with HEAD.
 
     Returns:
-        The default branch name, or None if unable to determine.
+        The remote probe, or None if the remote couldn't be listed.
     """
     try:
-        # Use git ls-remote to get the symbolic reference for HEAD
-        output = await run_shell_command(["git", "ls-remote", "--symref", remote_url, "HEAD"])
-
-        # Parse the output to find the symbolic reference
-        # Output format: "ref: refs/heads/main\tHEAD\n<commit_hash>\tHEAD"
-        lines = output.strip().split("\n")
-        for line in lines:
-            if line.startswith("ref: refs/heads/"):
-                # Extract branch name from "ref: refs/heads/main"
-                return line.split("refs/heads/")[-1].split("\t")[0]
-
-        # Fallback: if symbolic ref not available, try common branches
-        for branch in ["main", "master"]:
-            try:
-                await run_shell_command(["git", "ls-remote", "--heads", remote_url, branch])
-                return branch
-            except CommandExecutionError:
-                continue
-
-        return None
-
+        output = await run_shell_command(
+            [
+                "git",
+                "ls-remote",
+                "--symref",
+                remote_url,
+                *RemoteProbe.ls_remote_patterns(branch),
+            ]
+        )
     except CommandExecutionError as e:
-        logger.warning(f"Failed to get remote default branch for {remote_url}: {e}")
+        logger.warning(f"Failed to probe remote {remote_url}: {e}")
         return None
+    return RemoteProbe.from_ls_remote(output)
+
+
+async def get_remote_default_branch(remote_url: str) -> str | None:
+    """Get the default branch of a remote repository without cloning
+
+    Args:
+        remote_url: The URL of the remote repository.
+
+    Returns:
+        The default branch name, or None if unable to determine.
+    """
+    remote_probe = await probe_remote(remote_url)
+    return remote_probe.default_branch if remote_probe else None
 
 
 async def get_default_branch(repo_path: str) -> str:
@@ -258,24 +269,7 @@ async def run_shell_command(
         if process.returncode == 0:
             return stdout_text
 
-        if "No space left on device" in stderr_text:
-            logger.error(f"Disk space error: {stderr_text}")
-            raise DiskSpaceError(f"Disk space error while running: {command_str}")
-        elif any(
-            pattern in stderr_text
-            for pattern in ["Network is unreachable", "Connection refused", "Connection timed out"]
-        ):
-            logger.warning(f"Network error: {stderr_text}")
-            raise NetworkError(f"Network error while running: {command_str}")
-        elif "Permission denied" in stderr_text:
-            logger.error(f"Permission error: {stderr_text}")
-            raise PermissionError(f"Permission denied while running: {command_str}")
-        else:
-            logger.error(f"Command failed (exit {process.returncode}): {stderr_text}")
-            raise CommandExecutionError(
-                f"Command failed (exit {process.returncode}): {command_str} - {stderr_text}",
-                returncode=process.returncode,
-            )
+        _raise_command_error(process.returncode, stderr_text, command_str)
 
     except asyncio.TimeoutError:
         logger.error(f"Command timed out after {timeout}s: {command_str}")
@@ -284,3 +278,129 @@ async def run_shell_command(
             process.kill()
             await process.wait()
         raise CommandTimeoutError(f"Command timed out after {timeout}s: {command_str}") from None
+
+
+def _raise_command_error(returncode: int, stderr_text: str, command_str: str) -> None:
+    """Raise the error matching a failed command's stderr output."""
+    if "No space left on device" in stderr_text:
+        logger.error(f"Disk space error: {stderr_text}")
+        raise DiskSpaceError(f"Disk space error while running: {command_str}")
+    elif any(
+        pattern in stderr_text
+        for pattern in ["Network is unreachable", "Connection refused", "Connection timed out"]
+    ):
+        logger.warning(f"Network error: {stderr_text}")
+        raise NetworkError(f"Network error while running: {command_str}")
+    elif "Permission denied" in stderr_text:
+        logger.error(f"Permission error: {stderr_text}")
+        raise PermissionError(f"Permission denied while running: {command_str}")
+    else:
+        logger.error(f"Command failed (exit {returncode}): {stderr_text}")
+        raise CommandExecutionError(
+            f"Command failed (exit {returncode}): {command_str} - {stderr_text}",
+            returncode=returncode,
+        )
+
+
+async def stream_shell_command(
+    cmd: list[str],
+    cwd: str = None,
+    delimiter: bytes | None = None,
+    read_size: int = STREAM_READ_SIZE,
+    input_data: bytes | None = None,
+) -> AsyncIterator[bytes]:
+    """
+    Run shell command asynchronously and yield its stdout while the process is still running.
+
+    Unlike run_shell_command, the output is never buffered as a whole: memory usage is bounded
+    by read_size (plus the largest record when splitting), not by the total output size.
+    If the consumer stops iterating early, the process is killed.
+
+    Args:
+        cmd: Command and arguments
+        cwd: Working directory
+        delimiter: If provided, stdout is split on it and each non-empty record is yielded
+                   without the delimiter. Otherwise raw stdout blocks are yielded as read.
+        read_size: Maximum number of bytes read from stdout at once
+        input_data: If provided, written to the process stdin, which is then closed
+
+    Yields:
+        bytes: stdout records (or raw blocks when no delimiter is given)
+
+    Raises:
+        DiskSpaceError: When disk space is insufficient
+        NetworkError: When network connectivity issues occur
+        PermissionError: When permission is denied
+        CommandExecutionError: For other command failures
+    """
+    command_str = " ".join(cmd)
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=cwd,
+        stdin=asyncio.subprocess.PIPE if input_data is not None else None,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stderr_tail = bytearray()
+
+    async def _write_stdin() -> None:
+        try:
+            process.stdin.write(input_data)
+            await process.stdin.drain()
+            process.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            # The process exited without reading its whole input, its exit code tells why
+            pass
+
+    async def _drain_stderr() -> None:
+        # stderr must be consumed concurrently, otherwise a full pipe blocks the process
+        while chunk := await process.stderr.read(read_size):
+            stderr_tail.extend(chunk)
+            if len(stderr_tail) > STREAM_STDERR_TAIL_SIZE:
+                del stderr_tail[:-STREAM_STDERR_TAIL_SIZE]
+
+    stderr_task = asyncio.create_task(_drain_stderr())
+    stdin_task = asyncio.create_task(_write_stdin()) if input_data is not None else None
+    try:
+        buffer = bytearray()
+        while block := await process.stdout.read(read_size):
+            if delimiter is None:
+                yield block
+                continue
+
+            # Only the bytes that were not searched yet (plus a possible partial delimiter)
+            search_from = max(0, len(buffer) - len(delimiter) + 1)
+            buffer.extend(block)
+            start = 0
+            index = buffer.find(delimiter, search_from)
+            while index != -1:
+                if index > start:
+                    yield bytes(buffer[start:index])
+                start = index + len(delimiter)
+                index = buffer.find(delimiter, start)
+            del buffer[:start]
+
+        if buffer:
+            yield bytes(buffer)
+        del buffer
+
+        await stderr_task
+        if stdin_task:
+            await stdin_task
+        await process.wait()
+        if process.returncode != 0:
+            _raise_command_error(
+                process.returncode, _safe_decode(bytes(stderr_tail)).strip(), command_str
+            )
+    finally:
+        if process.returncode is None:
+            logger.info(f"Stopping streamed command before completion: {command_str}")
+            process.kill()
+            await process.wait()
+        for task in (stderr_task, stdin_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
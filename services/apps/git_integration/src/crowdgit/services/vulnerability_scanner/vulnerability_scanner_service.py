@@ -1,16 +1,19 @@
 import json
 import os
 import time
+from datetime import datetime, timezone
 from decimal import Decimal
 
 import asyncpg
 
-from crowdgit.database.crud import save_service_execution
+from crowdgit.database.crud import get_last_successful_execution_at, save_service_execution
 from crowdgit.enums import ErrorCode, ExecutionStatus, OperationType
 from crowdgit.errors import CommandExecutionError
+from crowdgit.models import Repository
 from crowdgit.models.service_execution import ServiceExecution
 from crowdgit.services.base.base_service import BaseService
 from crowdgit.services.utils import run_shell_command
+from crowdgit.settings import VULNERABILITY_SCAN_INTERVAL_HOURS
 
 
 class VulnerabilityScannerService(BaseService):
@@ -21,6 +24,23 @@ class VulnerabilityScannerService(BaseService):
         # vulnerability-scanner binary path defined during Docker build
         self.vulnerability_scanner_executable = "/usr/local/bin/vulnerability-scanner"
 
+    async def check_if_interval_elapsed(self, repository: Repository) -> tuple[bool, float]:
+        """
+        Check if the vulnerability scan last succeeded on the repository more than
+        {VULNERABILITY_SCAN_INTERVAL_HOURS} hours ago.
+
+        Returns:
+            tuple[bool, float]: (has_elapsed, remaining_hours)
+        """
+        last_run_at = await get_last_successful_execution_at(
+            repository.id, OperationType.VULNERABILITY_SCAN
+        )
+        if not last_run_at:
+            return True, 0.0
+        hours_since_last_run = (datetime.now(timezone.utc) - last_run_at).total_seconds() / 3600
+        remaining_hours = max(0, VULNERABILITY_SCAN_INTERVAL_HOURS - hours_since_last_run)
+        return hours_since_last_run >= VULNERABILITY_SCAN_INTERVAL_HOURS, remaining_hours
+
     async def run(self, repo_id: str, repo_path: str, repo_url: str) -> None:
         """
         Triggers vulnerability scanner binary for given repo.
@@ -35,6 +35,11 @@ MAINTAINER_RETRY_INTERVAL_DAYS = int(load_env_var("MAINTAINER_RETRY_INTERVAL_DAY
 MAINTAINER_UPDATE_INTERVAL_HOURS = int(
     load_env_var("MAINTAINER_UPDATE_INTERVAL_HOURS", default="24")
 )
+# Repositories without new commits are cloned again only once one of these intervals elapsed
+SOFTWARE_VALUE_INTERVAL_HOURS = int(load_env_var("SOFTWARE_VALUE_INTERVAL_HOURS", default="24"))
+VULNERABILITY_SCAN_INTERVAL_HOURS = int(
+    load_env_var("VULNERABILITY_SCAN_INTERVAL_HOURS", default="24")
+)
 WORKER_SHUTDOWN_TIMEOUT_SEC = int(load_env_var("WORKER_SHUTDOWN_TIMEOUT_SEC", default="3600"))
 MAX_CONCURRENT_ONBOARDINGS = int(load_env_var("MAX_CONCURRENT_ONBOARDINGS", default="3"))
 MAX_INTEGRATION_RESULTS = int(load_env_var("MAX_INTEGRATION_RESULTS", default="5000000"))
@@ -44,3 +49,85 @@ STUCK_ONBOARDING_REPO_TIMEOUT_HOURS = int(
 STUCK_RECURRENT_REPO_TIMEOUT_HOURS = int(
     load_env_var("STUCK_RECURRENT_REPO_TIMEOUT_HOURS", default="4")
 )
+# Worker processes used to build activities from commits (0 builds them in the event loop)
+COMMIT_PROCESSING_WORKERS = int(load_env_var("COMMIT_PROCESSING_WORKERS", default="0"))
+# Write integration.results with binary COPY (one transaction per chunk) instead of INSERT batches
+ACTIVITIES_COPY_INSERT = load_env_var("ACTIVITIES_COPY_INSERT", default="false").lower() == "true"
+# Max serialized activity data size of a single COPY
+ACTIVITIES_COPY_BATCH_BYTES = int(
+    load_env_var("ACTIVITIES_COPY_BATCH_BYTES", default=str(8 * 1024 * 1024))
+)
+# Send json/jsonb values in binary format, activity data goes as its serialized bytes
+DB_BINARY_JSON_CODEC = load_env_var("DB_BINARY_JSON_CODEC", default="false").lower() == "true"
+# Workers of each commit processing pipeline stage, and the size of the queues between them
+COMMIT_BUILD_CONCURRENCY = int(load_env_var("COMMIT_BUILD_CONCURRENCY", default="2"))
+COMMIT_FILTER_CONCURRENCY = int(load_env_var("COMMIT_FILTER_CONCURRENCY", default="2"))
+COMMIT_DB_SINK_CONCURRENCY = int(load_env_var("COMMIT_DB_SINK_CONCURRENCY", default="4"))
+COMMIT_KAFKA_SINK_CONCURRENCY = int(load_env_var("COMMIT_KAFKA_SINK_CONCURRENCY", default="4"))
+COMMIT_PIPELINE_QUEUE_SIZE = int(load_env_var("COMMIT_PIPELINE_QUEUE_SIZE", default="2"))
+# Bounds of the adaptive commit chunk size and number of chunks written at once
+COMMIT_MIN_CHUNK_SIZE = int(load_env_var("COMMIT_MIN_CHUNK_SIZE", default="50"))
+COMMIT_MAX_CHUNK_SIZE = int(load_env_var("COMMIT_MAX_CHUNK_SIZE", default="5000"))
+COMMIT_MAX_IN_FLIGHT_CHUNKS = int(load_env_var("COMMIT_MAX_IN_FLIGHT_CHUNKS", default="8"))
+# Chunks shrink once building or writing one takes longer than this
+COMMIT_CHUNK_LATENCY_TARGET_SEC = float(
+    load_env_var("COMMIT_CHUNK_LATENCY_TARGET_SEC", default="2.0")
+)
+# Max serialized activities size buffered by the commit processing pipeline
+COMMIT_PIPELINE_MEMORY_LIMIT_MB = int(
+    load_env_var("COMMIT_PIPELINE_MEMORY_LIMIT_MB", default="256")
+)
+# Commit message lines matched against trailers: "message" (every line) or "trailers" (git parsed)
+COMMIT_TRAILER_EXTRACTION_MODE = load_env_var("COMMIT_TRAILER_EXTRACTION_MODE", default="message")
+# Max (name, email) pairs whose activity member is cached during commit processing
+COMMIT_MEMBER_CACHE_SIZE = int(load_env_var("COMMIT_MEMBER_CACHE_SIZE", default="50000"))
+# Derive integration result ids from the activities, so replayed activities are skipped
+DETERMINISTIC_RESULT_IDS = (
+    load_env_var("DETERMINISTIC_RESULT_IDS", default="false").lower() == "true"
+)
+# Concurrent git log processes reading disjoint parts of the history, capped by available CPUs
+COMMIT_GIT_LOG_SHARDS = int(load_env_var("COMMIT_GIT_LOG_SHARDS", default="1"))
+# Write a commit-graph and multi-pack-index and tune git config after cloning/fetching
+# repositories of at least CLONE_READ_ACCELERATION_MIN_SIZE_MB
+CLONE_READ_ACCELERATION = (
+    load_env_var("CLONE_READ_ACCELERATION", default="false").lower() == "true"
+)
+CLONE_READ_ACCELERATION_MIN_SIZE_MB = int(
+    load_env_var("CLONE_READ_ACCELERATION_MIN_SIZE_MB", default="500")
+)
+# Directory of the node repository mirrors, repositories are cloned from them when set
+CLONE_MIRROR_CACHE_DIR = load_env_var("CLONE_MIRROR_CACHE_DIR", default="")
+# Disk budget of the mirrors, least recently used ones are evicted above it
+CLONE_MIRROR_CACHE_BUDGET_MB = int(load_env_var("CLONE_MIRROR_CACHE_BUDGET_MB", default="100000"))
+# Repositories cloned without blobs: "off", "no-stats" (commit stats mode "none") or "always"
+CLONE_BLOBLESS_MODE = load_env_var("CLONE_BLOBLESS_MODE", default="off")
+# Bounds of the adaptive number of commits fetched per batch of existing repositories
+CLONE_BATCH_INITIAL_DEPTH = int(load_env_var("CLONE_BATCH_INITIAL_DEPTH", default="100"))
+CLONE_BATCH_MIN_DEPTH = int(load_env_var("CLONE_BATCH_MIN_DEPTH", default="5"))
+CLONE_BATCH_MAX_DEPTH = int(load_env_var("CLONE_BATCH_MAX_DEPTH", default="10000"))
+# Batches shrink once fetching one takes longer than this, or fetches more than the budget
+CLONE_BATCH_FETCH_TARGET_SEC = float(load_env_var("CLONE_BATCH_FETCH_TARGET_SEC", default="30.0"))
+CLONE_BATCH_FETCH_BUDGET_MB = int(load_env_var("CLONE_BATCH_FETCH_BUDGET_MB", default="1024"))
+# Incremental clones get a multi-pack-index from this many packs, and are repacked
+# geometrically from this many packs or loose objects
+CLONE_PACK_MAINTENANCE_MIDX_PACKS = int(
+    load_env_var("CLONE_PACK_MAINTENANCE_MIDX_PACKS", default="4")
+)
+CLONE_PACK_MAINTENANCE_GEOMETRIC_PACKS = int(
+    load_env_var("CLONE_PACK_MAINTENANCE_GEOMETRIC_PACKS", default="16")
+)
+CLONE_PACK_MAINTENANCE_LOOSE_OBJECTS = int(
+    load_env_var("CLONE_PACK_MAINTENANCE_LOOSE_OBJECTS", default="2000")
+)
+# Fetch the commits since the last processing (minus the margin) of existing repositories in
+# one fetch, instead of deepening their clone batch after batch
+CLONE_SHALLOW_SINCE_FETCH = (
+    load_env_var("CLONE_SHALLOW_SINCE_FETCH", default="false").lower() == "true"
+)
+CLONE_SHALLOW_SINCE_MARGIN_HOURS = int(
+    load_env_var("CLONE_SHALLOW_SINCE_MARGIN_HOURS", default="168")
+)
+# Save full clone processing progress after each chunk, so interrupted onboardings resume
+COMMIT_PROCESSING_CHECKPOINTS = (
+    load_env_var("COMMIT_PROCESSING_CHECKPOINTS", default="true").lower() == "true"
+)
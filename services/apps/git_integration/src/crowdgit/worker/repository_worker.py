@@ -8,7 +8,7 @@ from crowdgit.database.crud import (
     release_repo,
     update_last_processed_commit,
 )
-from crowdgit.enums import RepositoryState
+from crowdgit.enums import OperationType, RepositoryState
 from crowdgit.errors import (
     InternalError,
     ParentRepoInvalidError,
@@ -27,7 +27,7 @@ from crowdgit.services import (
     SoftwareValueService,
     VulnerabilityScannerService,
 )
-from crowdgit.services.utils import get_default_branch, get_repo_name
+from crowdgit.services.utils import get_default_branch, get_repo_name, probe_remote
 from crowdgit.settings import (
     STUCK_ONBOARDING_REPO_TIMEOUT_HOURS,
     STUCK_RECURRENT_REPO_TIMEOUT_HOURS,
@@ -83,6 +83,7 @@ class RepositoryWorker:
             logger.info("Worker loop completed")
         finally:
             await self.queue_service.shutdown()
+            self.commit_service.shutdown()
             logger.info("Worker processing loop completed")
 
     async def shutdown(self):
@@ -133,7 +134,10 @@ class RepositoryWorker:
         """
         available_repo_to_process = None
         try:
-            available_repo_to_process = await acquire_repo_for_processing()
+            mirror_cache = self.clone_service.mirror_cache
+            available_repo_to_process = await acquire_repo_for_processing(
+                mirror_cache.repo_ids() if mirror_cache else None
+            )
 
             if not available_repo_to_process:
                 logger.debug("No repositories to process")
@@ -218,6 +222,20 @@ class RepositoryWorker:
         )
         return parent_repo
 
+    async def _get_due_repository_services(self, repository: Repository) -> set[OperationType]:
+        """Services run on the repository HEAD files whose interval elapsed since their last run"""
+        services = {
+            OperationType.SOFTWARE_VALUE: self.software_value_service,
+            OperationType.VULNERABILITY_SCAN: self.vulnerability_scanner_service,
+            OperationType.MAINTAINER: self.maintainer_service,
+        }
+        due_services = set()
+        for operation_type, service in services.items():
+            has_interval_elapsed, _ = await service.check_if_interval_elapsed(repository)
+            if has_interval_elapsed:
+                due_services.add(operation_type)
+        return due_services
+
     async def _process_single_repository(self, repository: Repository):
         """Process a single repository through services with full clone for new repos, incremental for existing"""
         logger.info("Processing repository: {}", repository.url)
@@ -230,17 +248,45 @@ class RepositoryWorker:
             # Validate and get parent repo if this is a fork
             repository.parent_repo = await self._validate_and_get_parent_repo(repository)
 
+            remote_probe = await probe_remote(
+                repository.url.removesuffix(".git"), repository.branch
+            )
+            # Inactive repositories cost a single ls-remote, unless a repository service is due
+            # and needs the HEAD files
+            remote_unchanged = self.clone_service.is_remote_unchanged(repository, remote_probe)
+            due_services = None
+            if remote_unchanged:
+                due_services = await self._get_due_repository_services(repository)
+                if not due_services:
+                    logger.info(
+                        f"Remote head of {repository.url} is still "
+                        f"{repository.last_processed_commit} and no service is due, skipping clone"
+                    )
+                    processing_state = RepositoryState.COMPLETED
+                    return
+                logger.info(
+                    f"Remote head of {repository.url} is still {repository.last_processed_commit}, "
+                    f"cloning HEAD for {', '.join(sorted(due_services))} only"
+                )
+
             async for batch_info in self.clone_service.clone_batches_generator(
                 repository,
                 working_dir_cleanup=True,
+                remote_probe=remote_probe,
             ):
                 logger.info(f"Clone batch info: {batch_info}")
                 if batch_info.is_first_batch:
-                    await self.software_value_service.run(repository.id, batch_info.repo_path)
-                    await self.vulnerability_scanner_service.run(
-                        repository.id, batch_info.repo_path, repository.url
-                    )
-                    await self.maintainer_service.process_maintainers(repository, batch_info)
+                    if due_services is None or OperationType.SOFTWARE_VALUE in due_services:
+                        await self.software_value_service.run(repository.id, batch_info.repo_path)
+                    if due_services is None or OperationType.VULNERABILITY_SCAN in due_services:
+                        await self.vulnerability_scanner_service.run(
+                            repository.id, batch_info.repo_path, repository.url
+                        )
+                    if due_services is None or OperationType.MAINTAINER in due_services:
+                        await self.maintainer_service.process_maintainers(repository, batch_info)
+                if remote_unchanged:
+                    # The HEAD clone is the last processed commit and the final batch
+                    continue
                 await self.commit_service.process_single_batch_commits(
                     repository,
                     batch_info,
@@ -27,6 +27,8 @@ def pytest_configure(config):
         "MAINTAINER_RETRY_INTERVAL_DAYS": "30",
         "MAINTAINER_UPDATE_INTERVAL_HOURS": "24",
         "WORKER_SHUTDOWN_TIMEOUT_SEC": "3600",
+        # Checkpoints are saved in the database, tests enable them with the database mocked
+        "COMMIT_PROCESSING_CHECKPOINTS": "false",
     }
 
     # Set environment variables (only if not already set)
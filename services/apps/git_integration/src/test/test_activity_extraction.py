@@ -15,6 +15,7 @@ from unittest.mock import AsyncMock, Mock, patch
 import pytest
 
 # Import crowdgit modules (environment variables are set in conftest.py)
+from crowdgit.enums import CommitStatsMode, TrailerExtractionMode
 from crowdgit.models import CloneBatchInfo, Repository
 from crowdgit.services.commit.commit_service import CommitService
 from crowdgit.services.queue.queue_service import QueueService
@@ -114,6 +115,34 @@ def batch_info():
     )
 
 
+async def capture_activities(
+    service: CommitService, repository: Repository, batch_info: CloneBatchInfo
+) -> list[str]:
+    """Process the test repository and return the sorted serialized activities."""
+    captured_activities_db = []
+
+    async def mock_batch_insert(activities, skip_existing=False):
+        captured_activities_db.extend(activities)
+        return activities
+
+    async def mock_save_execution(execution):
+        pass
+
+    with patch(
+        "crowdgit.services.commit.commit_service.batch_insert_activities",
+        mock_batch_insert,
+    ):
+        with patch(
+            "crowdgit.services.commit.commit_service.save_service_execution",
+            mock_save_execution,
+        ):
+            await service.process_single_batch_commits(
+                repository=repository, batch_info=batch_info
+            )
+    # result_id is a fresh uuid per activity, the serialized data must be identical
+    return sorted(activity.data for activity in captured_activities_db)
+
+
 @pytest.mark.asyncio
 class TestCommitExtraction:
     """Test suite for commit and activity extraction."""
@@ -136,9 +165,10 @@ class TestCommitExtraction:
         # Mock database operations to capture activities
         captured_activities_db = []
 
-        async def mock_batch_insert(activities):
+        async def mock_batch_insert(activities, skip_existing=False):
             """Capture activities that would be inserted to DB."""
             captured_activities_db.extend(activities)
+            return activities
 
         async def mock_save_execution(execution):
             """Mock service execution save."""
@@ -163,11 +193,9 @@ class TestCommitExtraction:
         print(f"   DB Activities extracted: {len(captured_activities_db)}")
 
         # Parse DB activities to readable format
-        # DB format: (result_id, state, json_data, tenant_id, integration_id)
         parsed_activities = []
-        for activity_tuple in captured_activities_db:
-            result_id, state, json_data, tenant_id, integration_id = activity_tuple
-            data = json.loads(json_data)
+        for activity_record in captured_activities_db:
+            data = json.loads(activity_record.data)
             parsed_activities.append(data["data"])  # Extract the actual activity from data wrapper
 
         # Sort activities for consistent comparison
@@ -263,8 +291,9 @@ class TestCommitExtraction:
         # Capture DB activities
         captured_activities_db = []
 
-        async def mock_batch_insert(activities):
+        async def mock_batch_insert(activities, skip_existing=False):
             captured_activities_db.extend(activities)
+            return activities
 
         async def mock_save_execution(execution):
             pass
@@ -281,12 +310,16 @@ class TestCommitExtraction:
                 )
 
         # Extract activity types from DB records
-        # DB format: (result_id, state, json_data, tenant_id, integration_id)
         activity_types = set()
-        for activity_tuple in captured_activities_db:
-            result_id, state, json_data, tenant_id, integration_id = activity_tuple
-            data = json.loads(json_data)
+        for activity_record in captured_activities_db:
+            data = json.loads(activity_record.data)
             activity = data["data"]
+            assert activity_record.type == activity["type"]
+            assert activity_record.dedup_key == (
+                activity["timestamp"],
+                activity["type"],
+                activity["sourceId"],
+            )
             activity_types.add(activity["type"])
 
         print(f"\n📋 Activity types found: {sorted(activity_types)}")
@@ -308,6 +341,175 @@ class TestCommitExtraction:
 
         print("✅ All expected activity types found")
 
+    async def test_process_pool_output_matches_event_loop_output(
+        self, mock_queue_service, test_repository, batch_info
+    ):
+        """
+        Test that building activities in worker processes produces the same output as
+        building them in the event loop.
+        """
+        ensure_test_repo_exists()
+
+        event_loop_output = await capture_activities(
+            CommitService(queue_service=mock_queue_service, processing_workers=0),
+            test_repository,
+            batch_info,
+        )
+        pool_service = CommitService(queue_service=mock_queue_service, processing_workers=2)
+        try:
+            pool_output = await capture_activities(pool_service, test_repository, batch_info)
+        finally:
+            pool_service.shutdown()
+
+        assert len(event_loop_output) > 0, "No activities were extracted"
+        assert pool_output == event_loop_output
+
+        print(f"✅ Process pool output matches event loop output ({len(pool_output)} activities)")
+
+    @pytest.mark.parametrize(
+        "stats_mode",
+        [CommitStatsMode.SHORTSTAT, CommitStatsMode.FIRST_PARENT, CommitStatsMode.DEFERRED],
+    )
+    async def test_stats_modes_match_numstat_output(
+        self, commit_service, test_repository, batch_info, stats_mode
+    ):
+        """
+        Test that the cheaper commit stats modes produce the same activities as numstat.
+        """
+        ensure_test_repo_exists()
+
+        numstat_output = await capture_activities(commit_service, test_repository, batch_info)
+        stats_mode_output = await capture_activities(
+            commit_service,
+            test_repository.model_copy(update={"commit_stats_mode": stats_mode}),
+            batch_info,
+        )
+
+        assert len(numstat_output) > 0, "No activities were extracted"
+        assert stats_mode_output == numstat_output
+
+        print(f"✅ {stats_mode.value} output matches numstat output")
+
+    async def test_trailers_mode_matches_message_scan_output(
+        self, mock_queue_service, test_repository, batch_info
+    ):
+        """
+        Test that reading trailers parsed by git produces the same activities as matching every
+        line of the commit messages.
+        """
+        ensure_test_repo_exists()
+
+        message_service = CommitService(queue_service=mock_queue_service, processing_workers=0)
+        message_output = await capture_activities(message_service, test_repository, batch_info)
+        trailers_service = CommitService(queue_service=mock_queue_service, processing_workers=0)
+        trailers_service.trailer_extraction_mode = TrailerExtractionMode.TRAILERS
+        trailers_output = await capture_activities(trailers_service, test_repository, batch_info)
+
+        assert len(message_output) > 0, "No activities were extracted"
+        assert trailers_output == message_output
+
+        print("✅ Trailers mode output matches message scan output")
+
+    async def test_sharded_git_log_matches_single_git_log(self, mock_queue_service, batch_info):
+        """
+        Test that git logs over disjoint shards of the history yield the same records, in the
+        same order, as a single git log.
+        """
+        ensure_test_repo_exists()
+
+        async def read_records(service: CommitService) -> list[tuple[bytes, ...]]:
+            return [
+                tuple(bytes(field) for field in record)
+                async for record in service._execute_git_log(
+                    batch_info.repo_path, clone_with_batches=False
+                )
+            ]
+
+        single_service = CommitService(queue_service=mock_queue_service, processing_workers=0)
+        single_records = await read_records(single_service)
+        sharded_service = CommitService(queue_service=mock_queue_service, processing_workers=0)
+        sharded_service.git_log_shards = 3
+        sharded_service.MIN_SHARD_COMMITS = 2
+        sharded_records = await read_records(sharded_service)
+
+        assert len(single_records) >= 3 * sharded_service.MIN_SHARD_COMMITS
+        assert sharded_records == single_records
+
+        print("✅ Sharded git log output matches single git log output")
+
+    async def test_failed_db_sink_stops_pipeline(
+        self, mock_queue_service, commit_service, test_repository, batch_info
+    ):
+        """
+        Test that a DB sink failure stops every pipeline stage and fails the batch, and that
+        only activities saved to the database are sent to the queue.
+        """
+        ensure_test_repo_exists()
+
+        commit_service.INITIAL_CHUNK_SIZE = commit_service.MIN_CHUNK_SIZE = 5
+        inserted_activities = []
+
+        async def mock_batch_insert(activities, skip_existing=False):
+            if inserted_activities:
+                raise RuntimeError("database unavailable")
+            inserted_activities.extend(activities)
+            return activities
+
+        with (
+            patch(
+                "crowdgit.services.commit.commit_service.batch_insert_activities",
+                mock_batch_insert,
+            ),
+            patch("crowdgit.services.commit.commit_service.save_service_execution", AsyncMock()),
+            pytest.raises(RuntimeError, match="database unavailable"),
+        ):
+            await commit_service.process_single_batch_commits(
+                repository=test_repository, batch_info=batch_info
+            )
+
+        sent_activities = [
+            activity
+            for call in mock_queue_service.send_batch_activities.await_args_list
+            for activity in call.args[0]
+        ]
+        assert len(inserted_activities) > 0, "No activities were inserted"
+        # Chunks are sent once inserted, the pipeline may stop before sending the inserted ones
+        inserted_ids = {activity.result_id for activity in inserted_activities}
+        assert all(activity.result_id in inserted_ids for activity in sent_activities)
+
+    async def test_deterministic_result_ids_skip_replayed_activities(
+        self, mock_queue_service, commit_service, test_repository, batch_info
+    ):
+        """
+        Test that processing a repository again with deterministic result ids neither saves nor
+        sends its activities a second time.
+        """
+        ensure_test_repo_exists()
+
+        commit_service.deterministic_result_ids = True
+        saved_result_ids = set()
+
+        async def mock_batch_insert(activities, skip_existing=False):
+            assert skip_existing
+            new_activities = [a for a in activities if a.result_id not in saved_result_ids]
+            saved_result_ids.update(activity.result_id for activity in new_activities)
+            return new_activities
+
+        with (
+            patch(
+                "crowdgit.services.commit.commit_service.batch_insert_activities",
+                mock_batch_insert,
+            ),
+            patch("crowdgit.services.commit.commit_service.save_service_execution", AsyncMock()),
+        ):
+            await commit_service.process_single_batch_commits(test_repository, batch_info)
+            sent_batches = mock_queue_service.send_batch_activities.await_count
+            await commit_service.process_single_batch_commits(test_repository, batch_info)
+
+        assert len(saved_result_ids) > 0, "No activities were saved"
+        assert sent_batches > 0
+        assert mock_queue_service.send_batch_activities.await_count == sent_batches
+
 
 def test_seed_file_exists():
     """Test that seed file exists and is valid JSON."""
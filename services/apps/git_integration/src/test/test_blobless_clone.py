@@ -0,0 +1,81 @@
+"""
+Test blobless clones, whose blobs are only fetched once git reads them.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from crowdgit.enums import BloblessCloneMode, CommitStatsMode
+from crowdgit.models import Repository
+from crowdgit.services.clone.clone_service import CloneService
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Alice Developer",
+    "GIT_AUTHOR_EMAIL": "alice@example.com",
+    "GIT_COMMITTER_NAME": "Alice Developer",
+    "GIT_COMMITTER_EMAIL": "alice@example.com",
+}
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        env=GIT_ENV | {"PATH": os.environ.get("PATH", "/usr/bin:/bin")},
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+@pytest.fixture
+def remote(tmp_path: Path) -> Path:
+    """A repo with a file changed by each commit, serving blobless clones"""
+    remote = tmp_path / "remote"
+    remote.mkdir()
+    git(remote, "init", "-q", "-b", "main")
+    git(remote, "config", "uploadpack.allowFilter", "true")
+    for index in range(1, 4):
+        (remote / "file.txt").write_text("line\n" * index)
+        git(remote, "add", "file.txt")
+        git(remote, "commit", "-q", "-m", f"Commit {index}")
+    return remote
+
+
+@pytest.mark.parametrize(
+    "mode, stats_mode, expected",
+    [
+        (BloblessCloneMode.OFF, CommitStatsMode.NONE, False),
+        (BloblessCloneMode.NO_STATS, CommitStatsMode.NUMSTAT, False),
+        (BloblessCloneMode.NO_STATS, CommitStatsMode.NONE, True),
+        (BloblessCloneMode.ALWAYS, CommitStatsMode.NUMSTAT, True),
+    ],
+)
+def test_blobless_clone_mode(mode, stats_mode, expected):
+    """Blobless clones follow the mode, and whether the stats mode reads blobs"""
+    clone_service = CloneService()
+    clone_service.blobless_clone_mode = mode
+    repository = Repository(id="repo-id", url="repo-url", commit_stats_mode=stats_mode)
+
+    assert clone_service._use_blobless_clone(repository, clone_source=None) == expected
+    assert clone_service._use_blobless_clone(repository, clone_source="/mirror") is False
+
+
+@pytest.mark.asyncio
+async def test_blobless_clone_fetches_blobs_lazily(tmp_path, remote):
+    """Only commits and trees are cloned, diff stats still read the blobs they need"""
+    clone = tmp_path / "clone"
+    clone.mkdir()
+
+    await CloneService().determine_clone_strategy(
+        str(clone), f"file://{remote}", None, None, blobless=True
+    )
+
+    missing_objects = git(clone, "rev-list", "--objects", "--missing=print", "origin/main")
+    assert sum(line.startswith("?") for line in missing_objects.splitlines()) == 3
+    assert not (clone / "file.txt").exists()
+    numstats = git(clone, "log", "--pretty=format:", "--numstat", "origin/main").split()
+    assert numstats == ["1", "0", "file.txt"] * 3
@@ -0,0 +1,89 @@
+"""
+Test the adaptive chunk size and in-flight chunk count of commit processing.
+"""
+
+import asyncio
+
+import pytest
+
+from crowdgit.services.commit.chunk_controller import ChunkController
+
+
+def make_controller(**kwargs) -> ChunkController:
+    return ChunkController(
+        **{
+            "initial_chunk_size": 250,
+            "min_chunk_size": 50,
+            "max_chunk_size": 1000,
+            "initial_in_flight": 2,
+            "max_in_flight": 4,
+            "latency_target_sec": 2.0,
+            "memory_limit_bytes": 256 * 1024 * 1024,
+        }
+        | kwargs
+    )
+
+
+async def write_chunk(controller: ChunkController, build: float, db: float, kafka: float):
+    controller.record_build(build, controller.chunk_size, controller.chunk_size * 1000)
+    await controller.acquire_write_slot()
+    controller.record_write("db", db)
+    controller.record_write("kafka", kafka)
+    await controller.release_write_slot()
+
+
+@pytest.mark.asyncio
+async def test_fast_writes_grow_chunks_up_to_max():
+    """Chunks grow additively while writes are fast, more of them are written when writes lag"""
+    controller = make_controller()
+
+    await write_chunk(controller, build=0.1, db=0.2, kafka=0.1)
+    assert (controller.chunk_size, controller.in_flight_limit) == (500, 3)
+
+    for _ in range(5):
+        await write_chunk(controller, build=0.5, db=0.2, kafka=0.1)
+    assert (controller.chunk_size, controller.in_flight_limit) == (1000, 3)
+
+
+@pytest.mark.asyncio
+async def test_slow_writes_halve_chunks_and_in_flight():
+    """Chunks and in-flight chunks are halved once writes exceed the latency target"""
+    controller = make_controller(initial_in_flight=4)
+
+    await write_chunk(controller, build=0.1, db=2.5, kafka=0.1)
+    assert (controller.chunk_size, controller.in_flight_limit) == (125, 2)
+
+    for _ in range(3):
+        await write_chunk(controller, build=0.1, db=2.5, kafka=0.1)
+    assert (controller.chunk_size, controller.in_flight_limit) == (50, 1)
+
+    # Slow builds only shrink chunks
+    controller = make_controller()
+    await write_chunk(controller, build=3.0, db=0.1, kafka=0.1)
+    assert (controller.chunk_size, controller.in_flight_limit) == (125, 2)
+
+
+@pytest.mark.asyncio
+async def test_chunks_fit_in_memory_limit():
+    """Every buffered and in-flight chunk must fit in the memory limit"""
+    controller = make_controller(memory_limit_bytes=1_000_000)
+    controller.buffered_chunks = 2
+
+    await write_chunk(controller, build=0.1, db=0.1, kafka=0.1)
+
+    chunks = controller.in_flight_limit + controller.buffered_chunks
+    assert controller.chunk_size == 1_000_000 // (chunks * 1000)
+
+
+@pytest.mark.asyncio
+async def test_write_slots_limit_in_flight_chunks():
+    """Writes wait for a free slot once in_flight_limit chunks are being written"""
+    controller = make_controller(initial_in_flight=1)
+    await controller.acquire_write_slot()
+
+    second_write = asyncio.create_task(controller.acquire_write_slot())
+    await asyncio.sleep(0)
+    assert not second_write.done()
+
+    await controller.release_write_slot()
+    await asyncio.wait_for(second_write, timeout=1)
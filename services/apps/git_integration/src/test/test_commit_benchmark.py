@@ -0,0 +1,254 @@
+"""
+Micro-benchmarks for commit processing.
+
+They run on synthetic git log records and repositories shaped like a large onboarding (a small
+set of people authoring many commits with trailers, a huge import commit), print the measured
+throughput, and check the output stays consistent. Set BENCHMARK_COMMITS,
+BENCHMARK_REPO_COMMITS and BENCHMARK_MESSAGES to run them at a larger scale.
+"""
+
+import hashlib
+import os
+import subprocess
+import time
+import tracemalloc
+from pathlib import Path
+from unittest.mock import Mock
+
+import orjson
+import pytest
+
+from crowdgit.enums import CommitStatsMode
+from crowdgit.services.commit.commit_service import CommitService
+from crowdgit.services.commit.git_log_parser import HASH, decode_ascii_field
+from crowdgit.services.queue.queue_service import QueueService
+
+BENCHMARK_COMMITS = int(os.environ.get("BENCHMARK_COMMITS", "5000"))
+BENCHMARK_REPO_COMMITS = int(os.environ.get("BENCHMARK_REPO_COMMITS", "500"))
+BENCHMARK_MESSAGES = int(os.environ.get("BENCHMARK_MESSAGES", "20000"))
+PEOPLE = [(f"Developer {i}", f"developer{i}@example.com") for i in range(50)]
+
+
+def make_git_log_records(count: int) -> list[tuple[bytes, ...]]:
+    """Build records as returned by GitLogParser, one commit per record"""
+    records = []
+    for i in range(count):
+        author_name, author_email = PEOPLE[i % len(PEOPLE)]
+        committer_name, committer_email = PEOPLE[(i + 1) % len(PEOPLE)]
+        reviewer_name, reviewer_email = PEOPLE[(i * 3) % len(PEOPLE)]
+        commit_hash = hashlib.sha1(str(i).encode()).hexdigest()
+        parent_hash = hashlib.sha1(str(i + 1).encode()).hexdigest()
+        body = (
+            f"subsystem: change number {i}\n\n"
+            "Longer explanation of the change, wrapped at a reasonable width so that\n"
+            "the message looks like a real one and has a few lines to scan.\n\n"
+            f"Signed-off-by: {author_name} <{author_email}>\n"
+            f"Reviewed-by: {reviewer_name} <{reviewer_email}>\n"
+        )
+        records.append(
+            (
+                commit_hash.encode(),
+                b"2025-01-01T10:00:00+01:00",
+                author_name.encode(),
+                author_email.encode(),
+                b"2025-01-02T11:30:00-05:00",
+                committer_name.encode(),
+                committer_email.encode(),
+                parent_hash.encode(),
+                body.encode(),
+                b"",
+                b"\n12\t3\tsrc/file.c\n1\t1\tsrc/file.h\n-\t-\tlogo.png\n",
+            )
+        )
+    return records
+
+
+@pytest.fixture
+def commit_service():
+    return CommitService(queue_service=Mock(spec=QueueService), processing_workers=0)
+
+
+def test_build_activities_benchmark(commit_service):
+    """Time and memory spent turning git log records into activities."""
+    records = make_git_log_records(BENCHMARK_COMMITS)
+    build_args = (
+        "https://github.com/test/repo",
+        "test-segment-id",
+        "test-integration-id",
+        0,
+    )
+
+    start = time.perf_counter()
+    activities, processed, bad, (cache_hits, cache_lookups) = (
+        commit_service.build_activities_from_chunk(records, None, "/tmp/repo", *build_args)
+    )
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    commit_service.build_activities_from_chunk(records[:1000], None, "/tmp/repo", *build_args)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"\n⏱️  {BENCHMARK_COMMITS} commits -> {len(activities)} activities in {elapsed:.3f}s "
+        f"({BENCHMARK_COMMITS / elapsed:,.0f} commits/s, {elapsed / BENCHMARK_COMMITS * 1e6:.1f}µs/commit)"
+        f"\n💾 peak traced memory per 1000 commits: {peak_memory / 1024:,.0f}KiB"
+        f"\n👥 member cache hit rate: {cache_hits / cache_lookups:.1%}"
+    )
+
+    assert processed == BENCHMARK_COMMITS
+    assert bad == 0
+    # authored + committed + signed-off + reviewed activities per commit
+    assert len(activities) == BENCHMARK_COMMITS * 4
+
+
+def make_git_repo(path: Path, count: int) -> None:
+    """Create a repository with `count` commits and a large import commit using fast-import"""
+    stream = []
+    for i in range(count):
+        author_name, author_email = PEOPLE[i % len(PEOPLE)]
+        message = f"change number {i}\n\nSigned-off-by: {author_name} <{author_email}>\n"
+        # The first commit imports many files at once, like a vendored dependency
+        files = range(2000) if i == 0 else range(i % 7, i % 7 + 5)
+        stream.append(
+            f"commit refs/heads/main\n"
+            f"author {author_name} <{author_email}> {1700000000 + i * 60} +0100\n"
+            f"committer {author_name} <{author_email}> {1700000000 + i * 60} +0100\n"
+            f"data {len(message.encode())}\n{message}"
+        )
+        for file_number in files:
+            content = "".join(f"line {line} of revision {i}\n" for line in range(20))
+            stream.append(
+                f"M 644 inline src/file{file_number}.txt\ndata {len(content)}\n{content}"
+            )
+        stream.append("\n")
+    subprocess.run(["git", "init", "-q", "-b", "main", str(path)], check=True)
+    subprocess.run(
+        ["git", "fast-import", "--quiet"], cwd=path, input="".join(stream).encode(), check=True
+    )
+    # Commits are read from the remote default branch, like in a clone
+    subprocess.run(["git", "update-ref", "refs/remotes/origin/main", "main"], cwd=path, check=True)
+    subprocess.run(
+        ["git", "symbolic-ref", "refs/remotes/origin/HEAD", "refs/remotes/origin/main"],
+        cwd=path,
+        check=True,
+    )
+
+
+@pytest.fixture(scope="module")
+def benchmark_repo(tmp_path_factory) -> str:
+    path = tmp_path_factory.mktemp("benchmark-repo")
+    make_git_repo(path, BENCHMARK_REPO_COMMITS)
+    return str(path)
+
+
+async def process_repo_commits(
+    commit_service: CommitService, repo_path: str, stats_mode: CommitStatsMode
+) -> tuple[int, int]:
+    """Run git log with the stats mode and build activities -> (commits, total insertions)"""
+    records = [
+        record
+        async for record in commit_service._execute_git_log(
+            repo_path, clone_with_batches=False, stats_mode=stats_mode
+        )
+    ]
+    insertions = 0
+    chunk_size = commit_service.INITIAL_CHUNK_SIZE
+    for start in range(0, len(records), chunk_size):
+        chunk = records[start : start + chunk_size]
+        deferred_stats = None
+        if stats_mode == CommitStatsMode.DEFERRED:
+            deferred_stats = await commit_service._get_deferred_commit_stats(
+                repo_path, [decode_ascii_field(record[HASH]) for record in chunk]
+            )
+        activities, _, _, _ = commit_service.build_activities_from_chunk(
+            chunk,
+            None,
+            repo_path,
+            "https://github.com/test/repo",
+            "test-segment-id",
+            "test-integration-id",
+            0,
+            stats_mode,
+            deferred_stats,
+        )
+        # Authored activities carry the commit stats once per commit
+        insertions += sum(
+            orjson.loads(activity.data)["data"]["attributes"]["insertions"]
+            for activity in activities
+            if activity.type == "authored-commit"
+        )
+    return len(records), insertions
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stats_mode", list(CommitStatsMode))
+async def test_commit_stats_mode_benchmark(commit_service, benchmark_repo, stats_mode):
+    """Time git log and activity building with each commit stats mode."""
+    start = time.perf_counter()
+    commits, insertions = await process_repo_commits(commit_service, benchmark_repo, stats_mode)
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"\n⏱️  {stats_mode.value}: {commits} commits in {elapsed:.3f}s "
+        f"({elapsed / commits * 1e6:.1f}µs/commit), {insertions} insertions"
+    )
+
+    assert commits == BENCHMARK_REPO_COMMITS
+    if stats_mode == CommitStatsMode.NONE:
+        assert insertions == 0
+    elif stats_mode != CommitStatsMode.NO_RENAMES:
+        _, numstat_insertions = await process_repo_commits(
+            commit_service, benchmark_repo, CommitStatsMode.NUMSTAT
+        )
+        assert insertions == numstat_insertions
+
+
+def make_kernel_message(i: int) -> list[str]:
+    """Commit message lines shaped like a Linux kernel commit: prose, links and trailers"""
+    author_name, author_email = PEOPLE[i % len(PEOPLE)]
+    maintainer_name, maintainer_email = PEOPLE[(i + 7) % len(PEOPLE)]
+    reviewer_name, reviewer_email = PEOPLE[(i * 3) % len(PEOPLE)]
+    return [
+        f"net: subsystem: fix reference leak in error path number {i}",
+        "",
+        *[
+            f"The error path of the probe function doesn't release reference {j}, which"
+            for j in range(8)
+        ],
+        "leaks it on every failed probe. Note: this was found with a static checker.",
+        "",
+        "  BUG: KASAN: slab-use-after-free in subsystem_probe+0x1a4/0x2c0",
+        "  Call Trace: <TASK> dump_stack_lvl+0x48/0x70 </TASK>",
+        "",
+        f'Fixes: {hashlib.sha1(str(i).encode()).hexdigest()[:12]} ("subsystem: add probe")',
+        "Cc: stable@vger.kernel.org",
+        f"Reported-by: {reviewer_name} <{reviewer_email}>",
+        f"Closes: https://lore.kernel.org/r/{i}@example.com/",
+        f"Signed-off-by: {author_name} <{author_email}>",
+        f"Reviewed-by: {reviewer_name} <{reviewer_email}>",
+        f"Acked-and-tested-by: {maintainer_name} <{maintainer_email}>",
+        f"Link: https://lore.kernel.org/r/{i}-v2@example.com",
+        f"Signed-off-by: {maintainer_name} <{maintainer_email}>",
+    ]
+
+
+def test_trailer_matching_benchmark(commit_service):
+    """Time matching commit message lines against ActivityMap trailers."""
+    messages = [make_kernel_message(i) for i in range(BENCHMARK_MESSAGES)]
+    lines = sum(len(message) for message in messages)
+
+    start = time.perf_counter()
+    activities = 0
+    for message in messages:
+        activities += len(commit_service.extract_activities(message))
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"\n⏱️  {BENCHMARK_MESSAGES} messages ({lines} lines) -> {activities} activities in "
+        f"{elapsed:.3f}s ({lines / elapsed:,.0f} lines/s, "
+        f"{elapsed / BENCHMARK_MESSAGES * 1e6:.1f}µs/message)"
+    )
+
+    # reported + 2 signed-off + reviewed + reviewed and tested activities per message
+    assert activities == BENCHMARK_MESSAGES * 6
@@ -0,0 +1,95 @@
+"""
+Test the adaptive number of commits fetched per batch of incremental clones.
+"""
+
+import os
+import subprocess
+
+import pytest
+
+from crowdgit.models import Repository
+from crowdgit.services.clone.clone_service import CloneService
+from crowdgit.services.clone.depth_controller import DepthController
+
+
+def make_controller(**kwargs) -> DepthController:
+    return DepthController(
+        **{
+            "initial_depth": 100,
+            "min_depth": 5,
+            "max_depth": 1000,
+            "fetch_target_sec": 10.0,
+            "fetch_budget_bytes": 100 * 1024 * 1024,
+        }
+        | kwargs
+    )
+
+
+def test_cheap_fetches_grow_depth_up_to_max():
+    """Depth at most doubles per fetch while fetches are well under the target"""
+    controller = make_controller()
+
+    controller.record_fetch(seconds=1.0, commits=100, fetched_bytes=100 * 1024)
+    assert controller.depth == 200
+
+    for _ in range(5):
+        controller.record_fetch(seconds=1.0, commits=controller.depth, fetched_bytes=1024)
+    assert controller.depth == 1000
+
+
+def test_slow_or_large_fetches_shrink_depth():
+    """Depth at most halves per fetch, toward the target time and within the size budget"""
+    controller = make_controller()
+
+    controller.record_fetch(seconds=100.0, commits=100, fetched_bytes=0)
+    assert controller.depth == 50
+
+    controller = make_controller()
+    controller.record_fetch(seconds=1.0, commits=100, fetched_bytes=140 * 1024 * 1024)
+    # 1.4MB per commit, 100MB budget
+    assert controller.depth == 71
+
+
+def test_empty_fetch_keeps_depth():
+    controller = make_controller()
+
+    controller.record_fetch(seconds=5.0, commits=0, fetched_bytes=0)
+
+    assert controller.depth == 100
+    assert controller.get_metrics()["fetches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_deepen_starts_from_persisted_depth(tmp_path):
+    """The repository last depth is the first fetch depth, and fetched commits are measured"""
+    remote = tmp_path / "remote"
+    remote.mkdir()
+    env = {
+        "GIT_AUTHOR_NAME": "Alice Developer",
+        "GIT_AUTHOR_EMAIL": "alice@example.com",
+        "GIT_COMMITTER_NAME": "Alice Developer",
+        "GIT_COMMITTER_EMAIL": "alice@example.com",
+        "PATH": os.environ.get("PATH", "/usr/bin:/bin"),
+    }
+    subprocess.run(["git", "init", "-q", "-b", "main"], cwd=remote, env=env, check=True)
+    for index in range(20):
+        subprocess.run(
+            ["git", "commit", "-q", "--allow-empty", "-m", f"Commit {index}"],
+            cwd=remote,
+            env=env,
+            check=True,
+        )
+    clone = tmp_path / "clone"
+    clone.mkdir()
+    clone_service = CloneService()
+    await clone_service.determine_clone_strategy(str(clone), f"file://{remote}", None, "processed")
+    repository = Repository(id="repo-id", url=str(remote), clone_batch_depth=7)
+    depth_controller = clone_service._create_depth_controller(repository)
+
+    await clone_service._deepen_next_batch(str(clone), depth_controller)
+
+    commits = subprocess.run(
+        ["git", "rev-list", "--count", "HEAD"], cwd=clone, check=True, capture_output=True
+    )
+    assert int(commits.stdout) == 8
+    assert depth_controller.get_metrics()["fetched_commits"] == 7
@@ -0,0 +1,110 @@
+"""
+Test fork processing skips the history already processed in the parent repository.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from crowdgit.models import CloneBatchInfo, Repository
+from crowdgit.services.commit.commit_service import CommitService
+from crowdgit.services.queue.queue_service import QueueService
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Alice Developer",
+    "GIT_AUTHOR_EMAIL": "alice@example.com",
+    "GIT_COMMITTER_NAME": "Alice Developer",
+    "GIT_COMMITTER_EMAIL": "alice@example.com",
+    "GIT_AUTHOR_DATE": "2025-01-01T10:00:00+01:00",
+    "GIT_COMMITTER_DATE": "2025-01-01T10:00:00+01:00",
+}
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        env=GIT_ENV | {"PATH": os.environ.get("PATH", "/usr/bin:/bin")},
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+def commit(repo: Path, message: str) -> str:
+    git(repo, "commit", "-q", "--allow-empty", "-m", message)
+    return git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def parent_and_fork(tmp_path: Path) -> tuple[Path, Path, list[str], list[str]]:
+    """
+    A parent repo with three commits and a fork of its first commit with two commits of its own.
+    The last parent commit was made after the fork was cloned, so the fork clone lacks it.
+    """
+    parent = tmp_path / "parent"
+    parent.mkdir()
+    git(parent, "init", "-q", "-b", "main")
+    parent_commits = [commit(parent, "Parent commit 1"), commit(parent, "Parent commit 2")]
+
+    fork = tmp_path / "fork"
+    git(tmp_path, "clone", "-q", "--no-tags", "--single-branch", str(parent), str(fork))
+    git(fork, "reset", "-q", "--hard", parent_commits[0])
+    fork_commits = [commit(fork, "Fork commit 1"), commit(fork, "Fork commit 2")]
+    git(fork, "update-ref", "refs/remotes/origin/main", "main")
+
+    parent_commits.append(commit(parent, "Parent commit 3"))
+    return parent, fork, parent_commits, fork_commits
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("parent_processed", [True, False])
+async def test_fork_commits_exclude_parent_history(parent_and_fork, parent_processed):
+    """Only commits not reachable from the parent last processed commit are processed."""
+    parent, fork, parent_commits, fork_commits = parent_and_fork
+    parent_repo = Repository(
+        id="parent-repo-id",
+        url=str(parent),
+        last_processed_commit=parent_commits[-1] if parent_processed else None,
+    )
+    repository = Repository(
+        id="fork-repo-id",
+        url=str(fork),
+        segment_id="test-segment-id",
+        integration_id="test-integration-id",
+        parent_repo=parent_repo,
+    )
+    batch_info = CloneBatchInfo(
+        repo_path=str(fork),
+        remote=str(fork),
+        is_final_batch=True,
+        clone_with_batches=False,
+    )
+    captured_activities = []
+
+    async def mock_batch_insert(activities, skip_existing=False):
+        captured_activities.extend(activities)
+        return activities
+
+    commit_service = CommitService(queue_service=Mock(spec=QueueService), processing_workers=0)
+    with (
+        patch(
+            "crowdgit.services.commit.commit_service.batch_insert_activities", mock_batch_insert
+        ),
+        patch(
+            "crowdgit.services.commit.commit_service.batch_check_parent_activities",
+            AsyncMock(return_value=set()),
+        ),
+        patch("crowdgit.services.commit.commit_service.save_service_execution", AsyncMock()),
+    ):
+        await commit_service.process_single_batch_commits(repository, batch_info)
+
+    processed_commits = {activity.source_id for activity in captured_activities}
+    if parent_processed:
+        # The shared root commit is skipped, the database check is left for the fork commits
+        assert processed_commits == set(fork_commits)
+    else:
+        assert processed_commits == {parent_commits[0], *fork_commits}
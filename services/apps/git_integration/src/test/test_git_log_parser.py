@@ -0,0 +1,131 @@
+"""
+Test parsing of NUL-separated git log output.
+
+Builds a small repository with the commit shapes that are hard to split (root, merge, rename,
+binary, empty and marker-like messages) and checks the parser against git itself.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from crowdgit.services.commit import git_log_parser
+from crowdgit.services.commit.git_log_parser import (
+    GIT_LOG_FORMAT,
+    GIT_LOG_TRAILERS_FORMAT,
+    TRAILER_SEPARATOR,
+    GitLogParser,
+    decode_ascii_field,
+    decode_field,
+    is_merge_commit,
+    parse_numstats,
+)
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Alice Developer",
+    "GIT_AUTHOR_EMAIL": "alice@example.com",
+    "GIT_COMMITTER_NAME": "Bob Maintainer",
+    "GIT_COMMITTER_EMAIL": "bob@example.com",
+    "GIT_AUTHOR_DATE": "2025-01-01T10:00:00+01:00",
+    "GIT_COMMITTER_DATE": "2025-01-01T10:00:00+01:00",
+}
+
+
+def git(repo: Path, *args: str) -> bytes:
+    return subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        env=GIT_ENV | {"PATH": os.environ.get("PATH", "/usr/bin:/bin")},
+        check=True,
+        capture_output=True,
+    ).stdout
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    git(tmp_path, "init", "-q", "-b", "main")
+    (tmp_path / "a.txt").write_text("one\ntwo\n")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "Root commit\n\nSigned-off-by: Alice <alice@example.com>")
+
+    git(tmp_path, "checkout", "-q", "-b", "feature")
+    git(tmp_path, "mv", "a.txt", "b.txt")
+    (tmp_path / "b.txt").write_text("one\ntwo\nthree\n")
+    git(tmp_path, "commit", "-q", "-am", "Rename with ---CROWD_COMMIT_START--- in message")
+
+    git(tmp_path, "checkout", "-q", "main")
+    (tmp_path / "image.bin").write_bytes(b"\0\1\2binary")
+    (tmp_path / "c.txt").write_text("x\n" * 10)
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "Add binary and text files")
+    git(tmp_path, "merge", "-q", "--no-ff", "-m", "Merge feature", "feature")
+    git(tmp_path, "commit", "-q", "--allow-empty", "-m", "Empty commit\n\n\n")
+    return tmp_path
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 64, 1 << 20])
+def test_parser_matches_git_for_every_commit(repo: Path, block_size: int):
+    """Every commit is split into the same fields git reports, whatever the read size."""
+    output = git(repo, "log", "--cc", "--numstat", f"--pretty=format:{GIT_LOG_FORMAT}")
+
+    parser = GitLogParser()
+    records = []
+    for i in range(0, len(output), block_size):
+        records.extend(parser.feed(output[i : i + block_size]))
+    records.extend(parser.close())
+
+    expected_hashes = git(repo, "rev-list", "HEAD").decode().split()
+    assert [decode_ascii_field(r[git_log_parser.HASH]) for r in records] == expected_hashes
+
+    for record in records:
+        assert len(record) == git_log_parser.RECORD_FIELDS
+        commit_hash = decode_ascii_field(record[git_log_parser.HASH])
+        body = git(repo, "show", "-s", "--format=%B", commit_hash).decode()
+        parents = git(repo, "show", "-s", "--format=%P", commit_hash).decode().split()
+
+        assert decode_field(record[git_log_parser.BODY]).rstrip() == body.rstrip()
+        assert decode_field(record[git_log_parser.AUTHOR_NAME]) == "Alice Developer"
+        assert decode_field(record[git_log_parser.COMMITTER_EMAIL]) == "bob@example.com"
+        assert is_merge_commit(record) == (len(parents) > 1)
+
+    stats = {
+        decode_field(r[git_log_parser.BODY]).splitlines()[0]: parse_numstats(
+            r[git_log_parser.NUMSTATS]
+        )
+        for r in records
+    }
+    assert stats["Root commit"] == (2, 0)
+    assert stats["Rename with ---CROWD_COMMIT_START--- in message"] == (1, 0)
+    assert stats["Add binary and text files"] == (10, 0)
+    assert stats["Empty commit"] == (0, 0)
+
+
+def test_parser_splits_trailers_field(repo: Path):
+    """Trailers parsed by git are a separate field, empty for commits without trailers."""
+    output = git(repo, "log", "--numstat", f"--pretty=format:{GIT_LOG_TRAILERS_FORMAT}")
+
+    parser = GitLogParser()
+    records = parser.feed(output) + parser.close()
+
+    trailers = {
+        decode_field(r[git_log_parser.BODY]).splitlines()[0]: decode_field(
+            r[git_log_parser.TRAILERS]
+        ).split(TRAILER_SEPARATOR)
+        for r in records
+    }
+    assert trailers["Root commit"] == ["Signed-off-by: Alice <alice@example.com>"]
+    assert trailers["Add binary and text files"] == [""]
+    assert parse_numstats(records[-1][git_log_parser.NUMSTATS]) == (2, 0)
+
+
+def test_parser_returns_truncated_output_as_incomplete_record():
+    """Output cut in the middle of a commit is not mistaken for a complete record."""
+    parser = GitLogParser()
+    assert parser.feed(b"abc\x002025-01-01T10:00:00+01:00\x00Alice") == []
+
+    records = parser.close()
+
+    assert len(records) == 1
+    assert len(records[0]) < git_log_parser.RECORD_FIELDS
@@ -0,0 +1,121 @@
+"""
+Test the node repository mirror cache, and cloning repositories from their mirror.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from crowdgit.services.clone.clone_service import CloneService
+from crowdgit.services.clone.mirror_cache import MirrorCache
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Alice Developer",
+    "GIT_AUTHOR_EMAIL": "alice@example.com",
+    "GIT_COMMITTER_NAME": "Alice Developer",
+    "GIT_COMMITTER_EMAIL": "alice@example.com",
+}
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        env=GIT_ENV | {"PATH": os.environ.get("PATH", "/usr/bin:/bin")},
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+def commit(repo: Path, message: str) -> str:
+    git(repo, "commit", "-q", "--allow-empty", "-m", message)
+    return git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def remote(tmp_path: Path) -> Path:
+    remote = tmp_path / "remote"
+    remote.mkdir()
+    git(remote, "init", "-q", "-b", "main")
+    for index in range(3):
+        commit(remote, f"Commit {index}")
+    return remote
+
+
+@pytest.mark.asyncio
+async def test_mirror_is_created_then_fetched(tmp_path, remote):
+    """The first sync is a miss creating the mirror, the following ones fetch new commits"""
+    cache = MirrorCache(str(tmp_path / "cache"), budget_mb=1000)
+
+    assert await cache.sync("repo-id", str(remote), "main") is False
+    new_commit = commit(remote, "New commit")
+    assert await cache.sync("repo-id", str(remote), "main") is True
+
+    mirror = Path(cache.mirror_path("repo-id"))
+    assert git(mirror, "rev-parse", "HEAD") == new_commit
+    assert cache.repo_ids() == ["repo-id"]
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_unlocked_mirrors_are_evicted(tmp_path, remote):
+    """Mirrors are evicted oldest first over the budget, except the kept and locked ones"""
+    cache = MirrorCache(str(tmp_path / "cache"), budget_mb=25)
+    for index, repo_id in enumerate(["locked", "old", "kept"]):
+        await cache.sync(repo_id, str(remote), "main")
+        os.utime(cache.mirror_path(repo_id), (index, index))
+        # Sizes recorded by the syncs are read instead of measuring the mirrors
+        Path(cache.mirror_path(repo_id) + ".size").write_text("10.0")
+    lock = cache.lock("locked")
+
+    evicted, evicted_mb, cache_size_mb = await cache.evict("kept")
+    lock.release()
+
+    assert (evicted, evicted_mb, cache_size_mb) == (1, 10.0, 20.0)
+    assert sorted(cache.repo_ids()) == ["kept", "locked"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("last_processed_commit", [None, "processed"])
+async def test_repository_is_cloned_from_its_mirror(tmp_path, remote, last_processed_commit):
+    """Full and minimal clones are made from the mirror, tracking the remote default branch"""
+    cache = MirrorCache(str(tmp_path / "cache"), budget_mb=1000)
+    await cache.sync("repo-id", str(remote), "main")
+    clone = tmp_path / "clone"
+    clone.mkdir()
+
+    clone_with_batches = await CloneService().determine_clone_strategy(
+        str(clone), str(remote), None, last_processed_commit, cache.mirror_path("repo-id")
+    )
+
+    assert clone_with_batches == bool(last_processed_commit)
+    assert git(clone, "rev-parse", "origin/main") == git(remote, "rev-parse", "HEAD")
+    assert git(clone, "remote", "get-url", "origin") == str(remote)
+    expected_commits = "1" if last_processed_commit else "3"
+    assert git(clone, "rev-list", "--count", "HEAD") == expected_commits
+
+    if clone_with_batches:
+        await CloneService()._clone_next_batch(str(clone), 1, cache.mirror_path("repo-id"))
+        assert git(clone, "rev-list", "--count", "origin/main") == "2"
+
+
+@pytest.mark.asyncio
+async def test_missing_mirror_only_seeded_by_full_clones(tmp_path, remote):
+    """Incremental runs without a mirror clone shallow from the remote, onboardings seed one"""
+    clone_service = CloneService()
+    clone_service.mirror_cache = MirrorCache(str(tmp_path / "cache"), budget_mb=1000)
+
+    mirror_path, lock, _ = await clone_service._sync_mirror(
+        "repo-id", str(remote), "main", seed=False
+    )
+    assert (mirror_path, lock) == (None, None)
+    assert clone_service.mirror_cache.repo_ids() == []
+
+    mirror_path, lock, _ = await clone_service._sync_mirror(
+        "repo-id", str(remote), "main", seed=True
+    )
+    lock.release()
+    assert mirror_path == clone_service.mirror_cache.mirror_path("repo-id")
+    assert clone_service.mirror_cache.repo_ids() == ["repo-id"]
@@ -0,0 +1,82 @@
+"""
+Test the pack maintenance of clones deepened batch after batch.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from crowdgit.services.clone.pack_maintenance import (
+    GEOMETRIC_REPACK,
+    MULTI_PACK_INDEX,
+    PackMaintenance,
+)
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Alice Developer",
+    "GIT_AUTHOR_EMAIL": "alice@example.com",
+    "GIT_COMMITTER_NAME": "Alice Developer",
+    "GIT_COMMITTER_EMAIL": "alice@example.com",
+}
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        env=GIT_ENV | {"PATH": os.environ.get("PATH", "/usr/bin:/bin")},
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+def make_maintenance(partial_clone: bool = False) -> PackMaintenance:
+    return PackMaintenance(
+        geometric_min_packs=4,
+        geometric_min_loose_objects=10,
+        midx_min_packs=2,
+        partial_clone=partial_clone,
+    )
+
+
+@pytest.mark.parametrize(
+    "stats, partial_clone, expected",
+    [
+        ({"packs": 1, "count": 5}, False, None),
+        ({"packs": 2, "count": 5}, False, MULTI_PACK_INDEX),
+        ({"packs": 4, "count": 5}, False, GEOMETRIC_REPACK),
+        ({"packs": 1, "count": 10}, False, GEOMETRIC_REPACK),
+        ({"packs": 4, "count": 10}, True, MULTI_PACK_INDEX),
+    ],
+)
+def test_maintenance_chosen_from_pack_stats(stats, partial_clone, expected):
+    assert make_maintenance(partial_clone).choose_maintenance(stats) == expected
+
+
+@pytest.mark.asyncio
+async def test_deepened_clone_packs_are_repacked_in_background(tmp_path):
+    """The packs and loose objects of each deepen fetch are repacked geometrically"""
+    remote = tmp_path / "remote"
+    remote.mkdir()
+    git(remote, "init", "-q", "-b", "main")
+    for index in range(6):
+        (remote / "file.txt").write_text(f"version {index}\n")
+        git(remote, "add", "file.txt")
+        git(remote, "commit", "-q", "-m", f"Commit {index}")
+    clone = tmp_path / "clone"
+    git(tmp_path, "clone", "-q", "--depth=1", f"file://{remote}", str(clone))
+    for _ in range(5):
+        git(clone, "fetch", "-q", "--deepen=1", "origin", "main")
+    maintenance = make_maintenance()
+
+    maintenance.start(str(clone))
+    await maintenance.wait()
+
+    stats = await maintenance.get_pack_stats(str(clone))
+    assert stats["count"] == 0
+    assert (clone / ".git" / "objects" / "pack" / "multi-pack-index").exists()
+    assert git(clone, "rev-list", "--count", "HEAD") == "6"
+    assert maintenance.get_metrics()["pack_maintenance"]["geometric_repacks"] == 1
@@ -0,0 +1,165 @@
+"""
+Test full clone processing checkpoints, and resuming an interrupted processing from them.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from crowdgit.database.crud import batch_insert_activities
+from crowdgit.models import CloneBatchInfo, ProcessingCheckpoint, Repository
+from crowdgit.models.activity_record import ActivityRecord
+from crowdgit.services.clone.clone_service import CloneService
+from crowdgit.services.commit.commit_service import CommitService
+from crowdgit.services.queue.queue_service import QueueService
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Alice Developer",
+    "GIT_AUTHOR_EMAIL": "alice@example.com",
+    "GIT_COMMITTER_NAME": "Alice Developer",
+    "GIT_COMMITTER_EMAIL": "alice@example.com",
+    "GIT_AUTHOR_DATE": "2025-01-01T10:00:00+01:00",
+    "GIT_COMMITTER_DATE": "2025-01-01T10:00:00+01:00",
+}
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        env=GIT_ENV | {"PATH": os.environ.get("PATH", "/usr/bin:/bin")},
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo_commits(tmp_path: Path) -> tuple[Path, list[str]]:
+    """A repo with ten commits, oldest first"""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    git(repo, "init", "-q", "-b", "main")
+    commits = []
+    for index in range(10):
+        git(repo, "commit", "-q", "--allow-empty", "-m", f"Commit {index}")
+        commits.append(git(repo, "rev-parse", "HEAD"))
+    git(repo, "update-ref", "refs/remotes/origin/main", "main")
+    return repo, commits
+
+
+async def process_repo(
+    repo: Path, checkpoint: ProcessingCheckpoint | None
+) -> tuple[set[str], list[int]]:
+    """Process the repo in chunks of 3 commits -> (processed commits, saved checkpoints)"""
+    repository = Repository(
+        id="repo-id",
+        url=str(repo),
+        segment_id="test-segment-id",
+        integration_id="test-integration-id",
+    )
+    batch_info = CloneBatchInfo(
+        repo_path=str(repo),
+        remote=str(repo),
+        is_final_batch=True,
+        clone_with_batches=False,
+        checkpoint=checkpoint,
+    )
+    processed_commits = set()
+    saved_checkpoints = []
+
+    async def mock_batch_insert(activities, skip_existing=False):
+        processed_commits.update(activity.source_id for activity in activities)
+        return activities
+
+    async def mock_save_checkpoint(repo_id, checkpoint):
+        assert checkpoint.head_commit == git(repo, "rev-parse", "HEAD")
+        saved_checkpoints.append(checkpoint.emitted_commits)
+
+    commit_service = CommitService(queue_service=Mock(spec=QueueService), processing_workers=0)
+    commit_service.INITIAL_CHUNK_SIZE = commit_service.MIN_CHUNK_SIZE = 3
+    commit_service.processing_checkpoints = True
+    with (
+        patch(
+            "crowdgit.services.commit.commit_service.batch_insert_activities", mock_batch_insert
+        ),
+        patch(
+            "crowdgit.services.commit.commit_service.save_processing_checkpoint",
+            mock_save_checkpoint,
+        ),
+        patch("crowdgit.services.commit.commit_service.save_service_execution", AsyncMock()),
+    ):
+        await commit_service.process_single_batch_commits(repository, batch_info)
+    return processed_commits, saved_checkpoints
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_saved_after_each_chunk(repo_commits):
+    """The checkpoint counts the commits of every chunk sent to Kafka"""
+    repo, commits = repo_commits
+
+    processed_commits, saved_checkpoints = await process_repo(repo, checkpoint=None)
+
+    assert processed_commits == set(commits)
+    # Chunks may finish out of order, the checkpoint only counts the ones finished without gaps
+    assert saved_checkpoints == sorted(saved_checkpoints)
+    assert saved_checkpoints[-1] == len(commits)
+
+
+@pytest.mark.asyncio
+async def test_resumed_processing_skips_emitted_commits(repo_commits):
+    """Only the commits older than the checkpoint emitted commits are processed again"""
+    repo, commits = repo_commits
+    checkpoint = ProcessingCheckpoint(head_commit=commits[-1], emitted_commits=4)
+
+    processed_commits, saved_checkpoints = await process_repo(repo, checkpoint)
+
+    # git log lists the newest commits first
+    assert processed_commits == set(commits[:-4])
+    assert saved_checkpoints[-1] == len(commits)
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_not_in_cloned_history_is_not_resumed(repo_commits):
+    """A checkpoint whose head commit was force pushed away starts over"""
+    repo, commits = repo_commits
+    clone_service = CloneService()
+    checkpoint = ProcessingCheckpoint(head_commit=commits[-1], emitted_commits=4)
+
+    assert await clone_service._get_resumable_checkpoint(str(repo), checkpoint) == checkpoint
+
+    git(repo, "reset", "-q", "--hard", commits[5])
+    git(repo, "commit", "-q", "--allow-empty", "-m", "Rewritten commit")
+    assert await clone_service._get_resumable_checkpoint(str(repo), checkpoint) is None
+
+
+@pytest.mark.asyncio
+async def test_replayed_activities_still_pending_are_sent_again():
+    """Results saved by an interrupted run are sent to Kafka again until processed"""
+    records = [
+        ActivityRecord(
+            result_id=result_id,
+            integration_id="test-integration-id",
+            data=b"{}",
+            kafka_key=b"",
+            kafka_value=b"",
+            timestamp="2025-01-01T09:00:00+00:00",
+            type="authored-commit",
+            source_id=result_id,
+        )
+        for result_id in ("new", "pending", "processed", "pending")
+    ]
+    # RETURNING id of the insert, then the pending ones among the existing results
+    mock_query = AsyncMock(side_effect=[[{"id": "new"}], [{"id": "pending"}]])
+
+    with (
+        patch("crowdgit.database.crud.ACTIVITIES_COPY_INSERT", False),
+        patch("crowdgit.database.crud.query", mock_query),
+    ):
+        unsent_records = await batch_insert_activities(records, skip_existing=True)
+
+    assert [record.result_id for record in unsent_records] == ["new", "pending"]
+    assert set(mock_query.call_args.args[1][0]) == {"pending", "processed"}
@@ -0,0 +1,96 @@
+"""
+Test the read acceleration step run after cloning and fetching repositories.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from crowdgit.services.clone.clone_service import CloneService
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Alice Developer",
+    "GIT_AUTHOR_EMAIL": "alice@example.com",
+    "GIT_COMMITTER_NAME": "Alice Developer",
+    "GIT_COMMITTER_EMAIL": "alice@example.com",
+}
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        env=GIT_ENV | {"PATH": os.environ.get("PATH", "/usr/bin:/bin")},
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+@pytest.fixture
+def remote(tmp_path: Path) -> Path:
+    """A repo with a few commits, cloned by the tests"""
+    remote = tmp_path / "remote"
+    remote.mkdir()
+    git(remote, "init", "-q", "-b", "main")
+    for index in range(5):
+        (remote / "file.txt").write_text(f"version {index}\n")
+        git(remote, "add", "file.txt")
+        git(remote, "commit", "-q", "-m", f"Commit {index}")
+    return remote
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("shallow", [False, True])
+async def test_read_acceleration_writes_indexes(tmp_path, remote, shallow):
+    """A multi-pack-index is always written, a commit-graph only for complete histories"""
+    clone = tmp_path / "clone"
+    depth = ["--depth=2"] if shallow else []
+    git(tmp_path, "clone", "-q", *depth, f"file://{remote}", str(clone))
+    clone_service = CloneService()
+    clone_service.read_acceleration = True
+    clone_service.read_acceleration_min_size_mb = 0
+
+    read_acceleration = await clone_service._accelerate_reads(str(clone), time_walks=True)
+
+    objects_dir = clone / ".git" / "objects"
+    assert (objects_dir / "pack" / "multi-pack-index").exists()
+    assert (objects_dir / "info" / "commit-graph").exists() != shallow
+    assert git(clone, "config", "core.deltaBaseCacheLimit") == "512m"
+    assert set(
+        clone_service._get_read_acceleration_metrics([read_acceleration])["read_acceleration"]
+    ) >= {"total_sec", "repo_size_mb", "history_walk_speedup"}
+
+
+@pytest.mark.asyncio
+async def test_read_acceleration_skips_small_repositories(tmp_path, remote):
+    """Repositories below the size threshold are left untouched"""
+    clone_service = CloneService()
+    clone_service.read_acceleration = True
+    clone_service.read_acceleration_min_size_mb = 1000
+
+    assert await clone_service._accelerate_reads(str(remote)) is None
+    assert not (remote / ".git" / "objects" / "info" / "commit-graph").exists()
+    assert clone_service._get_read_acceleration_metrics([]) == {}
+
+
+@pytest.mark.asyncio
+async def test_history_walks_timed_only_when_requested(tmp_path, remote):
+    """Intermediate batches are accelerated without walking the cloned history"""
+    clone = tmp_path / "clone"
+    git(tmp_path, "clone", "-q", f"file://{remote}", str(clone))
+    clone_service = CloneService()
+    clone_service.read_acceleration = True
+    clone_service.read_acceleration_min_size_mb = 0
+
+    intermediate = await clone_service._accelerate_reads(str(clone))
+    final = await clone_service._accelerate_reads(str(clone), time_walks=True)
+
+    assert "history_walk_sec_before" not in intermediate
+    metrics = clone_service._get_read_acceleration_metrics([intermediate, final])
+    assert metrics["read_acceleration"]["runs"] == 2
+    assert "history_walk_speedup" in metrics["read_acceleration"]
+    intermediate_metrics = clone_service._get_read_acceleration_metrics([intermediate])
+    assert "history_walk_speedup" not in intermediate_metrics["read_acceleration"]
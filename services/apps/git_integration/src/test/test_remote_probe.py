@@ -0,0 +1,85 @@
+"""
+Test the single ls-remote probe of a repository remote, and skipping unchanged repositories.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from crowdgit.models import RemoteProbe, Repository
+from crowdgit.services.clone.clone_service import CloneService
+from crowdgit.services.utils import probe_remote
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Alice Developer",
+    "GIT_AUTHOR_EMAIL": "alice@example.com",
+    "GIT_COMMITTER_NAME": "Alice Developer",
+    "GIT_COMMITTER_EMAIL": "alice@example.com",
+}
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        env=GIT_ENV | {"PATH": os.environ.get("PATH", "/usr/bin:/bin")},
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+@pytest.mark.asyncio
+async def test_probe_lists_default_branch_and_head(tmp_path):
+    """A single ls-remote gives the default branch and its head commit"""
+    git(tmp_path, "init", "-q", "-b", "develop")
+    git(tmp_path, "commit", "-q", "--allow-empty", "-m", "First commit")
+    git(tmp_path, "branch", "feature")
+    git(tmp_path, "commit", "-q", "--allow-empty", "-m", "Second commit")
+
+    remote_probe = await probe_remote(str(tmp_path), "develop")
+
+    assert remote_probe == RemoteProbe(
+        default_branch="develop", head_commit=git(tmp_path, "rev-parse", "HEAD")
+    )
+
+
+def test_probe_lists_only_head_and_default_branches():
+    assert RemoteProbe.ls_remote_patterns("develop") == [
+        "HEAD",
+        "refs/heads/develop",
+        "refs/heads/main",
+        "refs/heads/master",
+    ]
+
+
+def test_probe_without_symref_falls_back_to_common_branches():
+    remote_probe = RemoteProbe.from_ls_remote("aaa\trefs/heads/feature\nbbb\trefs/heads/master\n")
+
+    assert (remote_probe.default_branch, remote_probe.head_commit) == ("master", "bbb")
+
+
+@pytest.mark.parametrize(
+    "branch, last_processed_commit, default_branch, head_commit, expected",
+    [
+        ("main", "processed", "main", "processed", True),
+        ("main", "processed", "main", "new", False),
+        ("main", "processed", "develop", "processed", False),
+        (None, "processed", "main", "processed", False),
+        ("main", None, "main", "processed", False),
+    ],
+)
+def test_repository_skipped_only_when_head_and_branch_unchanged(
+    branch, last_processed_commit, default_branch, head_commit, expected
+):
+    repository = Repository(
+        id="repo-id",
+        url="https://github.com/org/repo",
+        branch=branch,
+        last_processed_commit=last_processed_commit,
+    )
+    remote_probe = RemoteProbe(default_branch=default_branch, head_commit=head_commit)
+
+    assert CloneService().is_remote_unchanged(repository, remote_probe) is expected
@@ -0,0 +1,95 @@
+"""
+Test reading repository files through `git cat-file --batch`, without a worktree.
+"""
+
+import asyncio
+import base64
+import os
+import subprocess
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from crowdgit.services.maintainer.maintainer_service import MaintainerService
+from crowdgit.services.repository_files import RepositoryFiles
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Alice Developer",
+    "GIT_AUTHOR_EMAIL": "alice@example.com",
+    "GIT_COMMITTER_NAME": "Alice Developer",
+    "GIT_COMMITTER_EMAIL": "alice@example.com",
+}
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        env=GIT_ENV | {"PATH": os.environ.get("PATH", "/usr/bin:/bin")},
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+@pytest.fixture
+def clone(tmp_path: Path) -> Path:
+    """A --no-checkout clone of a repo with a few files"""
+    remote = tmp_path / "remote"
+    (remote / "docs").mkdir(parents=True)
+    (remote / "README.md").write_text("# Project\n")
+    (remote / "docs" / "MAINTAINERS.md").write_text("- Alice Developer (@alice)\n")
+    git(remote, "init", "-q", "-b", "main")
+    git(remote, "add", ".")
+    git(remote, "commit", "-q", "-m", "Initial commit")
+    clone = tmp_path / "clone"
+    git(tmp_path, "clone", "-q", "--no-checkout", str(remote), str(clone))
+    return clone
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_are_multiplexed(clone):
+    """Concurrent reads over the single process get their own responses"""
+    async with RepositoryFiles(str(clone)) as repository_files:
+        readme, maintainers, missing, directory, listing = await asyncio.gather(
+            repository_files.read("README.md"),
+            repository_files.read("docs/MAINTAINERS.md"),
+            repository_files.read("MAINTAINERS"),
+            repository_files.read("docs"),
+            repository_files.list_dir(),
+        )
+
+    assert readme == b"# Project\n"
+    assert maintainers == b"- Alice Developer (@alice)\n"
+    assert missing is None
+    assert directory is None
+    assert listing == ["README.md", "docs"]
+
+
+@pytest.mark.asyncio
+async def test_maintainer_file_found_without_checkout(clone):
+    """Maintainer discovery reads the known maintainer files of HEAD from a bare history"""
+    find_with_ai = AsyncMock()
+    with patch.object(MaintainerService, "find_maintainer_file_with_ai", find_with_ai):
+        file_name, content, cost = await MaintainerService().find_maintainer_file(
+            str(clone), "org", "repo"
+        )
+
+    assert file_name == "docs/MAINTAINERS.md"
+    assert base64.b64decode(content) == b"- Alice Developer (@alice)\n"
+    assert cost == 0
+    find_with_ai.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_missing_path_with_spaces_does_not_block_later_reads(clone):
+    """A missing path containing spaces is answered, and the process keeps serving reads"""
+    async with RepositoryFiles(str(clone)) as repository_files:
+        missing = await asyncio.wait_for(repository_files.read("NOT THERE.md"), timeout=5)
+        readme = await asyncio.wait_for(repository_files.read("README.md"), timeout=5)
+        with pytest.raises(ValueError):
+            await repository_files.read("README.md\nHEAD:docs")
+
+    assert missing is None
+    assert readme == b"# Project\n"
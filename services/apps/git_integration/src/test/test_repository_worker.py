@@ -0,0 +1,101 @@
+"""
+Test the repository worker processing of repositories whose remote is unchanged.
+"""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from crowdgit.enums import RepositoryState
+from crowdgit.models import CloneBatchInfo, Repository
+from crowdgit.models.remote_probe import RemoteProbe
+from crowdgit.services import (
+    CloneService,
+    CommitService,
+    MaintainerService,
+    QueueService,
+    SoftwareValueService,
+    VulnerabilityScannerService,
+)
+from crowdgit.worker.repository_worker import RepositoryWorker
+
+
+def create_worker(due: set[str]) -> RepositoryWorker:
+    """A worker for an unchanged remote, with the given repository services due"""
+    clone_service = Mock(spec=CloneService)
+    clone_service.is_remote_unchanged.return_value = True
+
+    async def clone_batches_generator(repository, **kwargs):
+        yield CloneBatchInfo(
+            repo_path="/tmp/repo",
+            remote=repository.url,
+            is_first_batch=True,
+            is_final_batch=True,
+        )
+
+    clone_service.clone_batches_generator = Mock(side_effect=clone_batches_generator)
+    services = {
+        "software_value": Mock(spec=SoftwareValueService),
+        "vulnerability_scanner": Mock(spec=VulnerabilityScannerService),
+        "maintainer": Mock(spec=MaintainerService),
+    }
+    for name, service in services.items():
+        service.check_if_interval_elapsed = AsyncMock(return_value=(name in due, 1.0))
+    return RepositoryWorker(
+        clone_service=clone_service,
+        commit_service=Mock(spec=CommitService),
+        software_value_service=services["software_value"],
+        vulnerability_scanner_service=services["vulnerability_scanner"],
+        maintainer_service=services["maintainer"],
+        queue_service=Mock(spec=QueueService),
+    )
+
+
+async def process(worker: RepositoryWorker) -> AsyncMock:
+    """Process an unchanged repository, returns the mark_repo_as_processed mock"""
+    repository = Repository(
+        id="repo-id",
+        url="https://github.com/org/repo",
+        branch="main",
+        last_processed_commit="processed",
+    )
+    mark_repo_as_processed = AsyncMock()
+    with (
+        patch(
+            "crowdgit.worker.repository_worker.probe_remote",
+            AsyncMock(return_value=RemoteProbe(default_branch="main", head_commit="processed")),
+        ),
+        patch("crowdgit.worker.repository_worker.mark_repo_as_processed", mark_repo_as_processed),
+        patch("crowdgit.worker.repository_worker.update_last_processed_commit", AsyncMock()),
+    ):
+        await worker._process_single_repository(repository)
+    return mark_repo_as_processed
+
+
+@pytest.mark.asyncio
+async def test_unchanged_remote_without_due_service_is_not_cloned():
+    """An inactive repository only costs the remote probe"""
+    worker = create_worker(due=set())
+
+    mark_repo_as_processed = await process(worker)
+
+    worker.clone_service.clone_batches_generator.assert_not_called()
+    worker.software_value_service.run.assert_not_called()
+    worker.vulnerability_scanner_service.run.assert_not_called()
+    worker.maintainer_service.process_maintainers.assert_not_called()
+    mark_repo_as_processed.assert_awaited_once_with("repo-id", RepositoryState.COMPLETED)
+
+
+@pytest.mark.asyncio
+async def test_unchanged_remote_runs_only_due_services():
+    """The HEAD clone only runs the due services, commits aren't processed again"""
+    worker = create_worker(due={"vulnerability_scanner"})
+
+    mark_repo_as_processed = await process(worker)
+
+    worker.clone_service.clone_batches_generator.assert_called_once()
+    worker.vulnerability_scanner_service.run.assert_awaited_once()
+    worker.software_value_service.run.assert_not_called()
+    worker.maintainer_service.process_maintainers.assert_not_called()
+    worker.commit_service.process_single_batch_commits.assert_not_called()
+    mark_repo_as_processed.assert_awaited_once_with("repo-id", RepositoryState.COMPLETED)
@@ -0,0 +1,98 @@
+"""
+Test fetching the commits new since the last processing of a repository in a single fetch.
+"""
+
+import os
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from crowdgit.models import Repository
+from crowdgit.services.clone.clone_service import CloneService
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Alice Developer",
+    "GIT_AUTHOR_EMAIL": "alice@example.com",
+    "GIT_COMMITTER_NAME": "Alice Developer",
+    "GIT_COMMITTER_EMAIL": "alice@example.com",
+}
+
+
+def git(repo: Path, *args: str, date: str | None = None) -> str:
+    dates = {"GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date} if date else {}
+    return subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        env=GIT_ENV | dates | {"PATH": os.environ.get("PATH", "/usr/bin:/bin")},
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+@pytest.fixture
+def remote_commits(tmp_path: Path) -> tuple[Path, list[str]]:
+    """A repo with a commit per day of January 2025, oldest first"""
+    remote = tmp_path / "remote"
+    remote.mkdir()
+    git(remote, "init", "-q", "-b", "main")
+    commits = []
+    for day in range(1, 32):
+        git(
+            remote,
+            "commit",
+            "-q",
+            "--allow-empty",
+            "-m",
+            f"Commit {day}",
+            date=f"2025-01-{day:02d}T10:00:00+00:00",
+        )
+        commits.append(git(remote, "rev-parse", "HEAD"))
+    return remote, commits
+
+
+async def minimal_clone(tmp_path: Path, remote: Path, last_processed_commit: str) -> Path:
+    clone = tmp_path / "clone"
+    clone.mkdir()
+    await CloneService().determine_clone_strategy(
+        str(clone), f"file://{remote}", None, last_processed_commit
+    )
+    return clone
+
+
+@pytest.mark.asyncio
+async def test_new_commits_are_fetched_at_once(tmp_path, remote_commits):
+    """A single fetch reaches the last processed commit, with a margin before its processing"""
+    remote, commits = remote_commits
+    clone = await minimal_clone(tmp_path, remote, commits[19])
+    clone_service = CloneService()
+    clone_service.shallow_since_fetch = True
+    clone_service.shallow_since_margin_hours = 48
+    repository = Repository(
+        id="repo-id",
+        url=str(remote),
+        segment_id="test-segment-id",
+        integration_id="test-integration-id",
+        last_processed_commit=commits[19],
+        last_processed_at=datetime(2025, 1, 20, 12, tzinfo=timezone.utc),
+    )
+
+    since = clone_service._get_shallow_since(repository)
+    assert await clone_service._fetch_since(str(clone), since) is True
+
+    assert await clone_service._check_if_final_batch(str(clone), commits[19])
+    # Commits after January 18th noon
+    assert git(clone, "rev-list", "--count", "origin/main") == "13"
+
+
+@pytest.mark.asyncio
+async def test_fetch_without_recent_commits_falls_back(tmp_path, remote_commits):
+    """Nothing is fetched when no commit is recent enough, the clone is deepened in batches"""
+    remote, commits = remote_commits
+    clone = await minimal_clone(tmp_path, remote, commits[19])
+    since = datetime(2025, 2, 1, tzinfo=timezone.utc)
+
+    assert await CloneService()._fetch_since(str(clone), since) is False
+    assert git(clone, "rev-list", "--count", "origin/main") == "1"
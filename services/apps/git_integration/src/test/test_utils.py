@@ -0,0 +1,56 @@
+"""
+Test shell command helpers used to run git commands.
+"""
+
+import pytest
+
+from crowdgit.errors import CommandExecutionError
+from crowdgit.services.utils import stream_shell_command
+
+
+async def collect(stream) -> list[bytes]:
+    return [record async for record in stream]
+
+
+@pytest.mark.asyncio
+async def test_stream_shell_command_splits_records_across_reads():
+    """Records split by small reads are reassembled before being yielded."""
+    output = "".join(f"--SPLIT--record {i}\n" for i in range(50))
+    records = await collect(
+        stream_shell_command(["printf", "%s", output], delimiter=b"--SPLIT--", read_size=7)
+    )
+
+    assert records == [f"record {i}\n".encode() for i in range(50)]
+
+
+@pytest.mark.asyncio
+async def test_stream_shell_command_yields_raw_blocks_without_delimiter():
+    """Without a delimiter the complete stdout is yielded in blocks."""
+    blocks = await collect(stream_shell_command(["printf", "%s", "a" * 100], read_size=16))
+
+    assert b"".join(blocks) == b"a" * 100
+
+
+@pytest.mark.asyncio
+async def test_stream_shell_command_writes_input_data():
+    """Input data is written to the process stdin."""
+    records = await collect(
+        stream_shell_command(["cat"], delimiter=b"\n", input_data=b"a\nb\n" * 100_000)
+    )
+
+    assert records == [b"a", b"b"] * 100_000
+
+
+@pytest.mark.asyncio
+async def test_stream_shell_command_raises_on_failure():
+    """A non-zero exit code is raised once the output is consumed."""
+    with pytest.raises(CommandExecutionError):
+        await collect(stream_shell_command(["git", "log", "--not-an-option"]))
+
+
+@pytest.mark.asyncio
+async def test_stream_shell_command_stops_process_when_closed():
+    """Closing the stream early kills the process instead of waiting for it."""
+    stream = stream_shell_command(["yes"], delimiter=b"\n")
+    assert await anext(stream) == b"y"
+    await stream.aclose()